@@ -0,0 +1,212 @@
+/*
+ * _xoodyak_native.c
+ * Optional native backend for xoodyak_core: Xoodoo[12] permutation and
+ * Cyclist absorb/squeeze loops. Bit-exact with xoodyak_core.Xoodoo.
+ *
+ * Build: python build_native.py
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+
+#define RATE 16
+#define ROTL(x, n) ((uint32_t)(((x) << (n)) | ((x) >> (32 - (n)))))
+
+static const uint32_t RC[12] = {
+    0x00000058, 0x00000038, 0x000003C0, 0x000000D0,
+    0x00000120, 0x00000014, 0x00000060, 0x0000002C,
+    0x00000380, 0x000000F0, 0x000001A0, 0x00000012
+};
+
+static void xoodoo_permute(uint32_t *a)
+{
+    uint32_t p[4], e[4], t0, t1, b0, b1, b2;
+    int r, x, i;
+
+    for (r = 0; r < 12; r++) {
+        /* Theta */
+        for (x = 0; x < 4; x++)
+            p[x] = a[x] ^ a[4 + x] ^ a[8 + x];
+        for (x = 0; x < 4; x++) {
+            uint32_t q = p[(x + 3) & 3];
+            e[x] = ROTL(q, 5) ^ ROTL(q, 14);
+        }
+        for (i = 0; i < 12; i++)
+            a[i] ^= e[i & 3];
+
+        /* Rho-west */
+        t0 = a[7]; a[7] = a[6]; a[6] = a[5]; a[5] = a[4]; a[4] = t0;
+        for (x = 0; x < 4; x++)
+            a[8 + x] = ROTL(a[8 + x], 11);
+
+        /* Iota */
+        a[0] ^= RC[r];
+
+        /* Chi (same non-linear layer as Xoodoo.chi) */
+        for (x = 0; x < 4; x++) {
+            b0 = a[4 + x] & a[8 + x];
+            b1 = a[8 + x] & a[x];
+            b2 = a[x] & a[4 + x];
+            a[x] ^= b0;
+            a[4 + x] ^= b1;
+            a[8 + x] ^= b2;
+        }
+
+        /* Rho-east */
+        for (x = 0; x < 4; x++)
+            a[4 + x] = ROTL(a[4 + x], 1);
+        t0 = a[8]; t1 = a[9];
+        a[8] = ROTL(a[10], 8);
+        a[9] = ROTL(a[11], 8);
+        a[10] = ROTL(t0, 8);
+        a[11] = ROTL(t1, 8);
+    }
+}
+
+static int load_state(PyObject *list, uint32_t *a)
+{
+    Py_ssize_t i;
+
+    if (PyList_GET_SIZE(list) != 12) {
+        PyErr_SetString(PyExc_ValueError, "state must contain 12 words");
+        return -1;
+    }
+    for (i = 0; i < 12; i++) {
+        unsigned long word = PyLong_AsUnsignedLongMask(PyList_GET_ITEM(list, i));
+        if (word == (unsigned long)-1 && PyErr_Occurred())
+            return -1;
+        a[i] = (uint32_t)word;
+    }
+    return 0;
+}
+
+static int store_state(PyObject *list, const uint32_t *a)
+{
+    Py_ssize_t i;
+
+    for (i = 0; i < 12; i++) {
+        PyObject *word = PyLong_FromUnsignedLong(a[i]);
+        if (word == NULL)
+            return -1;
+        PyList_SetItem(list, i, word);
+    }
+    return 0;
+}
+
+static PyObject *native_permute(PyObject *self, PyObject *args)
+{
+    PyObject *list;
+    uint32_t a[12];
+
+    if (!PyArg_ParseTuple(args, "O!:permute", &PyList_Type, &list))
+        return NULL;
+    if (load_state(list, a) < 0)
+        return NULL;
+    xoodoo_permute(a);
+    if (store_state(list, a) < 0)
+        return NULL;
+    Py_RETURN_NONE;
+}
+
+static PyObject *native_absorb(PyObject *self, PyObject *args)
+{
+    PyObject *list;
+    Py_buffer data;
+    unsigned int domain = 0x03;
+    uint32_t a[12];
+    const uint8_t *buf;
+    Py_ssize_t i, j, block_size;
+
+    if (!PyArg_ParseTuple(args, "O!y*|I:absorb", &PyList_Type, &list, &data, &domain))
+        return NULL;
+    if (load_state(list, a) < 0) {
+        PyBuffer_Release(&data);
+        return NULL;
+    }
+
+    buf = (const uint8_t *)data.buf;
+    Py_BEGIN_ALLOW_THREADS
+    if (data.len == 0) {
+        a[3] ^= (uint32_t)domain << 24;
+        xoodoo_permute(a);
+    }
+    for (i = 0; i < data.len; i += RATE) {
+        block_size = data.len - i < RATE ? data.len - i : RATE;
+        for (j = 0; j < block_size; j++)
+            a[j >> 2] ^= (uint32_t)buf[i + j] << (8 * (j & 3));
+        if (block_size < RATE)
+            a[block_size >> 2] ^= (uint32_t)0x01 << (8 * (block_size & 3));
+        a[3] ^= (uint32_t)domain << 24;
+        xoodoo_permute(a);
+    }
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&data);
+    if (store_state(list, a) < 0)
+        return NULL;
+    Py_RETURN_NONE;
+}
+
+static PyObject *native_squeeze(PyObject *self, PyObject *args)
+{
+    PyObject *list, *output;
+    Py_ssize_t length, offset = 0, j, take;
+    unsigned int domain = 0x01;
+    uint32_t a[12];
+    uint8_t *out;
+
+    if (!PyArg_ParseTuple(args, "O!n|I:squeeze", &PyList_Type, &list, &length, &domain))
+        return NULL;
+    if (length < 0) {
+        PyErr_SetString(PyExc_ValueError, "length must be non-negative");
+        return NULL;
+    }
+    if (load_state(list, a) < 0)
+        return NULL;
+
+    output = PyBytes_FromStringAndSize(NULL, length);
+    if (output == NULL)
+        return NULL;
+    out = (uint8_t *)PyBytes_AS_STRING(output);
+
+    while (offset < length) {
+        take = length - offset < RATE ? length - offset : RATE;
+        for (j = 0; j < take; j++)
+            out[offset + j] = (uint8_t)(a[j >> 2] >> (8 * (j & 3)));
+        offset += take;
+        if (offset < length) {
+            a[3] ^= (uint32_t)domain << 24;
+            xoodoo_permute(a);
+        }
+    }
+
+    if (store_state(list, a) < 0) {
+        Py_DECREF(output);
+        return NULL;
+    }
+    return output;
+}
+
+static PyMethodDef native_methods[] = {
+    {"permute", native_permute, METH_VARARGS,
+     "permute(state) -- apply Xoodoo[12] in place to a list of 12 words"},
+    {"absorb", native_absorb, METH_VARARGS,
+     "absorb(state, data, domain=0x03) -- Cyclist absorb into a list of 12 words"},
+    {"squeeze", native_squeeze, METH_VARARGS,
+     "squeeze(state, length, domain=0x01) -- Cyclist squeeze from a list of 12 words"},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef native_module = {
+    PyModuleDef_HEAD_INIT,
+    "_xoodyak_native",
+    "Native Xoodoo[12] / Cyclist backend for xoodyak_core",
+    -1,
+    native_methods
+};
+
+PyMODINIT_FUNC PyInit__xoodyak_native(void)
+{
+    return PyModule_Create(&native_module);
+}
@@ -6,18 +6,23 @@ Updated untuk menggunakan enhanced_encoder.pth dan enhanced_decoder.pth
 import streamlit as st
 from pages import home, encrypt, decrypt
 from styles import apply_custom_styles
-from stego_models_pytorch import SteganographyEngine
+from stego_engine import STEGO_BACKEND, create_engine, model_files
+from xoodyak_utils import enable_key_cache
 import os
 
 
+# Cache key hasil KDF: dekripsi/retry dengan password yang sama tidak mengulang PBKDF2
+enable_key_cache()
+
+
 # Global model loader with caching
 @st.cache_resource(show_spinner=False)
 def load_stego_models():
     """
-    Load dan cache PyTorch steganography models at startup.
+    Load dan cache steganography models at startup (backend dari STEGO_BACKEND).
     Models akan di-load sekali dan reused across all sessions.
     """
-    engine = SteganographyEngine()
+    engine = create_engine()
     success = engine.load_models()
     
     if not success:
@@ -27,9 +32,9 @@ def load_stego_models():
 
 
 def check_model_files():
-    """Check if PyTorch model files exist before loading"""
+    """Check if model files for the configured backend exist before loading"""
     model_dir = "models"
-    required_files = ['enhanced_encoder.pth', 'enhanced_decoder.pth']
+    required_files = model_files()
     
     # Check if models directory exists
     if not os.path.exists(model_dir):
@@ -111,7 +116,7 @@ def main():
             st.stop()
         
         # Load models with progress indicator
-        with st.spinner("🧠 Loading PyTorch Steganography Models..."):
+        with st.spinner(f"🧠 Loading Steganography Models ({STEGO_BACKEND})..."):
             engine, success = load_stego_models()
             
             if success:
@@ -121,7 +126,7 @@ def main():
                 
                 # Show success message briefly
                 success_placeholder = st.empty()
-                success_placeholder.success("✅ PyTorch Models loaded successfully!")
+                success_placeholder.success(f"✅ Models loaded successfully ({STEGO_BACKEND})!")
                 
                 # Auto-hide success message after 2 seconds
                 import time
@@ -195,7 +200,7 @@ def main():
                     border: 1px solid rgba(76, 175, 80, 0.5);
                     font-size: 0.85rem; color: #81c784;
                     z-index: 9999;">
-            🟢 PyTorch Ready ({device_info})
+            🟢 {'ONNX Runtime' if STEGO_BACKEND == 'onnxruntime' else 'PyTorch'} Ready ({device_info})
         </div>
         """, unsafe_allow_html=True)
     
@@ -0,0 +1,197 @@
+"""
+bench_core.py
+Benchmark suite for xoodyak_core with JSON output and regression check
+Contains: permutations/sec, Cyclist absorb/squeeze, AEAD encrypt/decrypt bytes/sec
+          (16 B - 10 MB), tracemalloc allocation counts, for every registered backend
+
+Usage:
+    python benchmarks/bench_core.py --output results.json
+    python benchmarks/bench_core.py --output new.json --compare results.json --threshold 0.2
+
+With --compare the exit code is 1 if any throughput dropped by more than threshold.
+tests/test_bench_core.py runs the same measurements under pytest-benchmark when the
+plugin is installed (otherwise only a smoke test of the JSON output and --compare).
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_permutation import permutations_per_second
+from xoodyak_core import BACKENDS, XoodyakAEAD
+
+
+PAYLOAD_SIZES = [16, 256, 4 * 1024, 64 * 1024, 1024 * 1024, 10 * 1024 * 1024]
+KEY = bytes(range(16))
+NONCE = bytes(range(16, 32))
+
+
+def timed(fn, seconds):
+    """Run fn repeatedly for about seconds (at least once), return (runs, elapsed)"""
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return runs, elapsed
+
+
+def allocations(fn):
+    """Number of memory blocks and peak bytes allocated by one call of fn"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        fn()
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename') if stat.count_diff > 0)
+    return {'blocks': blocks, 'peak_bytes': peak}
+
+
+def bench_cyclist(cyclist_class, seconds):
+    """Absorb and squeeze throughput on 4 KB"""
+    message = bytes(4096)
+    
+    def absorb():
+        cyclist_class().absorb(message)
+    
+    def squeeze():
+        cyclist_class().squeeze(len(message))
+    
+    result = {}
+    for name, fn in (('absorb', absorb), ('squeeze', squeeze)):
+        runs, elapsed = timed(fn, seconds)
+        result[f"{name}_bytes_per_sec"] = runs * len(message) / elapsed
+    return result
+
+
+def bench_aead(backend, size, seconds):
+    """Encrypt/decrypt throughput and allocations for one payload size"""
+    plaintext = os.urandom(size)
+    ciphertext, tag = XoodyakAEAD(KEY, NONCE, backend=backend).encrypt(plaintext)
+    
+    def encrypt():
+        XoodyakAEAD(KEY, NONCE, backend=backend).encrypt(plaintext)
+    
+    def decrypt():
+        _, is_verified = XoodyakAEAD(KEY, NONCE, backend=backend).decrypt(ciphertext, tag)
+        assert is_verified
+    
+    result = {'size': size}
+    for name, fn in (('encrypt', encrypt), ('decrypt', decrypt)):
+        runs, elapsed = timed(fn, seconds)
+        result[f"{name}_bytes_per_sec"] = runs * size / elapsed
+    result['encrypt_allocations'] = allocations(encrypt)
+    return result
+
+
+def run_suite(backends, sizes, seconds, max_seconds):
+    """Run every benchmark for the given backends, return JSON-serializable results"""
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'seconds': seconds,
+        },
+        'backends': {},
+    }
+    
+    for name in backends:
+        cyclist_class = BACKENDS[name]
+        entry = {'permutations_per_sec': permutations_per_second(cyclist_class().xoodoo, seconds)}
+        entry.update(bench_cyclist(cyclist_class, seconds))
+        
+        # Payload besar pada backend lambat bisa memakan menit - lewati jika estimasi > max_seconds
+        entry['aead'] = []
+        rate = None
+        for size in sizes:
+            if rate and size / rate > max_seconds:
+                entry['aead'].append({'size': size, 'skipped': True})
+                continue
+            measurement = bench_aead(name, size, seconds)
+            rate = measurement['encrypt_bytes_per_sec']
+            entry['aead'].append(measurement)
+        
+        results['backends'][name] = entry
+        print(f"{name:<10} {entry['permutations_per_sec']:>12,.0f} perm/s  "
+              f"{rate / 1e6 if rate else 0:>8.3f} MB/s encrypt (largest size run)", file=sys.stderr)
+    
+    return results
+
+
+def throughputs(results):
+    """Flatten results to {metric path: value} for every *_per_sec value"""
+    flat = {}
+    for backend, entry in results['backends'].items():
+        for key, value in entry.items():
+            if key.endswith('_per_sec'):
+                flat[f"{backend}.{key}"] = value
+        for measurement in entry['aead']:
+            for key, value in measurement.items():
+                if key.endswith('_per_sec'):
+                    flat[f"{backend}.aead[{measurement['size']}].{key}"] = value
+    return flat
+
+
+def find_regressions(baseline, current, threshold):
+    """Metrics whose throughput dropped by more than threshold (fraction) vs baseline"""
+    old = throughputs(baseline)
+    new = throughputs(current)
+    regressions = []
+    for metric, old_value in old.items():
+        new_value = new.get(metric)
+        if new_value is not None and old_value > 0 and new_value < old_value * (1 - threshold):
+            regressions.append({'metric': metric, 'baseline': old_value, 'current': new_value,
+                                'change': new_value / old_value - 1})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark suite for xoodyak_core')
+    parser.add_argument('--output', default='-', help='File JSON hasil (default: stdout)')
+    parser.add_argument('--backend', action='append', choices=sorted(BACKENDS),
+                        help='Backend yang diukur (bisa berulang, default: semua)')
+    parser.add_argument('--sizes', type=int, nargs='+', default=PAYLOAD_SIZES, help='Ukuran payload (bytes)')
+    parser.add_argument('--seconds', type=float, default=0.5, help='Durasi minimal per pengukuran')
+    parser.add_argument('--max-seconds', type=float, default=5.0,
+                        help='Lewati payload yang estimasi satu kali enkripsinya lebih lama dari ini')
+    parser.add_argument('--compare', help='File JSON baseline untuk cek regresi')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Toleransi penurunan throughput (0.2 = 20%%)')
+    args = parser.parse_args()
+    
+    results = run_suite(args.backend or list(BACKENDS), sorted(args.sizes), args.seconds, args.max_seconds)
+    
+    exit_code = 0
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        results['regressions'] = find_regressions(baseline, results, args.threshold)
+        for regression in results['regressions']:
+            print(f"REGRESSION {regression['metric']}: {regression['change']:+.1%}", file=sys.stderr)
+        exit_code = 1 if results['regressions'] else 0
+    
+    output = json.dumps(results, indent=2)
+    if args.output == '-':
+        print(output)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
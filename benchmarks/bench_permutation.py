@@ -0,0 +1,52 @@
+"""
+bench_permutation.py
+Benchmark Xoodoo[12] permutation implementations and Cyclist backends
+Contains: permutation classes (Xoodoo / FastXoodoo / PlaneXoodoo) and every registered backend
+
+Usage: python benchmarks/bench_permutation.py [--seconds 1.0]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from xoodyak_core import BACKENDS, FastXoodoo, PlaneXoodoo, Xoodoo
+
+
+def permutations_per_second(permutation, seconds):
+    """Run permutation.permute on one state for about seconds, return rate"""
+    state = [0x01234567 * (i + 1) & 0xFFFFFFFF for i in range(12)]
+    permute = permutation.permute
+    count = 0
+    batch = 100
+    start = time.perf_counter()
+    while True:
+        for _ in range(batch):
+            permute(state)
+        count += batch
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--seconds', type=float, default=1.0, help='Durasi per implementasi')
+    args = parser.parse_args()
+    
+    candidates = [(cls.__name__, cls()) for cls in (Xoodoo, FastXoodoo, PlaneXoodoo)]
+    candidates += [(f"backend:{name}", cyclist_class().xoodoo) for name, cyclist_class in BACKENDS.items()]
+    
+    baseline = None
+    print(f"{'implementation':<20} {'perm/s':>12} {'vs Xoodoo':>10}")
+    for name, permutation in candidates:
+        rate = permutations_per_second(permutation, args.seconds)
+        baseline = baseline or rate
+        print(f"{name:<20} {rate:>12,.0f} {rate / baseline:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+bench_stego.py
+Benchmark eager vs compiled (BatchNorm folded + TorchScript) DenseEncoder / DenseDecoder
+Contains: per-resolution latency, speedup vs eager and max abs difference, JSON output
+
+Usage: python benchmarks/bench_stego.py [--sizes 256 512 1024] [--repeat 5] [--output result.json]
+
+Uses models/enhanced_*.pth if present, otherwise random weights with random
+BatchNorm statistics (same architecture, same work per pixel).
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch
+
+from stego_models_pytorch import DenseDecoder, DenseEncoder, fold_batchnorm
+
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models')
+
+
+def load_model(model_class, filename):
+    """Model eval dari models/filename, atau bobot acak dengan statistik BN acak"""
+    model = model_class(data_depth=1, hidden_size=32)
+    path = os.path.join(MODEL_DIR, filename)
+    if os.path.exists(path):
+        model.load_state_dict(torch.load(path, map_location='cpu'))
+    else:
+        for module in model.modules():
+            if isinstance(module, torch.nn.BatchNorm2d):
+                module.running_mean.uniform_(-0.5, 0.5)
+                module.running_var.uniform_(0.5, 2.0)
+                module.weight.data.uniform_(-1.5, 1.5)
+                module.bias.data.uniform_(-0.5, 0.5)
+    return model.eval()
+
+
+def latency(fn, repeat):
+    """Median detik per panggilan (setelah satu warm-up)"""
+    fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Eager vs compiled stego model benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[256, 512, 1024], help='Resolusi (persegi)')
+    parser.add_argument('--repeat', type=int, default=5, help='Jumlah pengukuran per konfigurasi')
+    parser.add_argument('--output', help='File JSON hasil (opsional)')
+    args = parser.parse_args()
+    
+    torch.manual_seed(0)
+    results = {'torch': torch.__version__, 'threads': torch.get_num_threads(), 'models': {}}
+    
+    for name, model_class, filename in (('encoder', DenseEncoder, 'enhanced_encoder.pth'),
+                                        ('decoder', DenseDecoder, 'enhanced_decoder.pth')):
+        eager = load_model(model_class, filename)
+        folded = fold_batchnorm(eager)
+        compiled = torch.jit.freeze(torch.jit.script(folded))
+        
+        rows = []
+        for size in args.sizes:
+            image = torch.rand(1, 3, size, size)
+            inputs = (image, torch.randint(0, 2, (1, 1, size, size)).float()) if name == 'encoder' else (image,)
+            
+            with torch.no_grad():
+                reference = eager(*inputs)
+                row = {'size': size}
+                for label, model in (('eager', eager), ('folded', folded), ('compiled', compiled)):
+                    row[f"{label}_ms"] = latency(lambda: model(*inputs), args.repeat) * 1000
+                    row[f"{label}_max_abs_diff"] = (model(*inputs) - reference).abs().max().item()
+                row['speedup'] = row['eager_ms'] / row['compiled_ms']
+            rows.append(row)
+            print(f"{name:<8} {size:>5}px  eager {row['eager_ms']:8.1f} ms  "
+                  f"folded {row['folded_ms']:8.1f} ms  compiled {row['compiled_ms']:8.1f} ms  "
+                  f"x{row['speedup']:.2f}  diff {row['compiled_max_abs_diff']:.2e}")
+        results['models'][name] = rows
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -11,7 +11,7 @@ from typing import Tuple, Optional
 # Import dari aplikasi Anda
 try:
     from xoodyak_core import XoodyakAEAD
-    from xoodyak_utils import derive_key
+    from xoodyak_utils import derive_key, check_package, STREAM_VERSIONS
     MODULES_AVAILABLE = True
 except ImportError:
     MODULES_AVAILABLE = False
@@ -32,21 +32,19 @@ def try_decrypt(encrypted_data: bytes, password: str) -> Tuple[bool, Optional[by
         if len(encrypted_data) < 33:
             return (False, None, f"Data terlalu pendek: {len(encrypted_data)} bytes")
         
-        version = encrypted_data[0:1]
-        nonce = encrypted_data[1:17]
-        tag = encrypted_data[17:33]
-        ciphertext = encrypted_data[33:]
+        package = check_package(encrypted_data)
+        if package['version'] in STREAM_VERSIONS:
+            return (False, None, "Package streaming (version 2/4) tidak didukung")
         
-        key = derive_key(password.strip())
-        aead = XoodyakAEAD(key, nonce, b'')
-        plaintext, is_verified = aead.decrypt(ciphertext, tag)
+        key = derive_key(password.strip(), package['kdf'])
         
-        if is_verified:
-            return (True, plaintext, "✓ Verified")
-        elif len(plaintext) > 0:
-            return (True, plaintext, "⚠ Not verified but decoded")
-        else:
-            return (False, None, "Decryption failed")
+        # Cek tag dulu tanpa membuat plaintext - dekripsi hanya untuk password yang benar
+        if not XoodyakAEAD(key, package['nonce'], b'').verify_only(package['ciphertext'], package['tag']):
+            return (False, None, "✗ Not verified")
+        
+        aead = XoodyakAEAD(key, package['nonce'], b'')
+        plaintext, is_verified = aead.decrypt(package['ciphertext'], package['tag'])
+        return (True, plaintext, "✓ Verified")
             
     except Exception as e:
         return (False, None, f"Error: {str(e)[:50]}")
@@ -198,6 +196,13 @@ if start_button:
             st.error(f"❌ Data terlalu pendek: {len(encrypted_data)} bytes (minimum 33)")
             st.stop()
         
+        # Fast reject: format/version salah tidak perlu dicoba dengan wordlist
+        try:
+            check_package(encrypted_data)
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            st.stop()
+        
         st.session_state.attack_running = True
         
         # Create containers for progress and results
@@ -0,0 +1,19 @@
+"""
+build_native.py
+Build optional native backend (_xoodyak_native) di directory ini
+
+Usage: python build_native.py
+Jika build gagal, xoodyak_core otomatis memakai backend Python.
+"""
+
+import sys
+from setuptools import setup, Extension
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:] or ['build_ext', '--inplace']
+    setup(
+        name='xoodyak-native',
+        ext_modules=[Extension('_xoodyak_native', ['_xoodyak_native.c'], extra_compile_args=['-O3'])],
+        script_args=args,
+    )
@@ -0,0 +1,86 @@
+"""
+export_onnx.py
+Export DenseEncoder / DenseDecoder (models/*.pth) ke ONNX dengan dynamic batch/H/W
+
+Usage: python export_onnx.py [--model-dir models] [--opset 17]
+Hasil: models/enhanced_encoder.onnx dan models/enhanced_decoder.onnx untuk
+backend onnxruntime (STEGO_BACKEND=onnxruntime). BatchNorm di-fold sebelum export.
+Jika onnxruntime terinstall, output ONNX dibandingkan dengan model PyTorch.
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import torch
+
+from stego_models_pytorch import DenseDecoder, DenseEncoder, fold_batchnorm
+
+
+DYNAMIC_AXES = {0: 'batch', 2: 'height', 3: 'width'}
+
+
+def export(model, inputs, input_names, output_name, path, opset):
+    """Export satu model ke ONNX dengan axis batch/height/width dinamis"""
+    names = list(input_names) + [output_name]
+    torch.onnx.export(
+        model, inputs, path,
+        input_names=list(input_names),
+        output_names=[output_name],
+        dynamic_axes={name: DYNAMIC_AXES for name in names},
+        opset_version=opset,
+    )
+    print(f"✅ {path}")
+
+
+def check(model, inputs, input_names, path):
+    """Max abs diff antara ONNX Runtime dan PyTorch pada resolusi lain dari resolusi export"""
+    try:
+        import onnxruntime as ort
+    except ImportError:
+        print("⚠️ onnxruntime tidak terinstall, verifikasi dilewati")
+        return None
+    
+    session = ort.InferenceSession(path, providers=['CPUExecutionProvider'])
+    with torch.no_grad():
+        expected = model(*inputs).numpy()
+    actual = session.run(None, {name: tensor.numpy() for name, tensor in zip(input_names, inputs)})[0]
+    diff = float(np.abs(actual - expected).max())
+    print(f"   max abs diff vs PyTorch ({inputs[0].shape[2]}x{inputs[0].shape[3]}): {diff:.2e}")
+    return diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export stego models ke ONNX')
+    parser.add_argument('--model-dir', default='models', help='Folder berisi enhanced_*.pth')
+    parser.add_argument('--opset', type=int, default=17, help='ONNX opset version')
+    args = parser.parse_args()
+    
+    specs = (
+        (DenseEncoder, 'enhanced_encoder', ('image', 'payload'), 'stego'),
+        (DenseDecoder, 'enhanced_decoder', ('stego',), 'payload'),
+    )
+    for model_class, name, input_names, output_name in specs:
+        source_path = os.path.join(args.model_dir, f"{name}.pth")
+        if not os.path.exists(source_path):
+            print(f"❌ Model tidak ditemukan: {source_path}")
+            return 1
+        
+        model = model_class(data_depth=1, hidden_size=32)
+        model.load_state_dict(torch.load(source_path, map_location='cpu'))
+        model = fold_batchnorm(model.eval())
+        
+        def example(height, width):
+            image = torch.rand(1, 3, height, width)
+            return (image, torch.randint(0, 2, (1, 1, height, width)).float()) if len(input_names) == 2 else (image,)
+        
+        path = os.path.join(args.model_dir, f"{name}.onnx")
+        export(model, example(64, 64), input_names, output_name, path, args.opset)
+        check(model, example(96, 160), input_names, path)
+    
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
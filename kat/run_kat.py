@@ -0,0 +1,233 @@
+"""
+run_kat.py
+Known-answer tests for xoodyak_core in NIST LWC genkat format
+Contains: LWC_AEAD_KAT_128_128.txt loader/generator, checks for every registered backend
+          (one-shot, verify_only, KeyedContext), XoodyakEncryptor/XoodyakDecryptor streaming,
+          and the NumPy batch duplex (xoodyak_batch)
+
+Usage:
+    python kat/run_kat.py              # run all checks, exit code 1 on any mismatch
+    python kat/run_kat.py --generate   # regenerate the vector file from the reference backend
+
+The vectors follow the LWC layout (Count/Key/Nonce/PT/AD/CT, CT = ciphertext || tag,
+PT and AD lengths 0..32) but are generated from the reference backend of this
+repository: its Xoodoo round and Cyclist domain layout differ from the NIST
+submission, so the official Xoodyak KAT values do not apply. The generator drives
+ReferenceCyclist directly (byte-loop absorb/squeeze, block-by-block duplex), so the
+optimized XoodyakAEAD paths are never used to produce the vectors they are checked against.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from xoodyak_core import (BACKENDS, KeyedContext, ReferenceCyclist, XoodyakAEAD,
+                          XoodyakDecryptor, XoodyakEncryptor)
+
+
+KAT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'LWC_AEAD_KAT_128_128.txt')
+MAX_MESSAGE_LENGTH = 32
+MAX_ASSOCIATED_DATA_LENGTH = 32
+STREAM_SPLITS = (1, 7, 16, 33)  # chunk lengths for the streaming checks
+TAG_LENGTH = XoodyakAEAD.TAG_LENGTH
+
+
+def reference_encrypt(key, nonce, ad, plaintext):
+    """Ciphertext || tag from ReferenceCyclist alone (no XoodyakAEAD code involved)"""
+    cyclist = ReferenceCyclist()
+    cyclist.absorb(key + nonce, domain=0x03)
+    if ad:
+        cyclist.absorb(ad, domain=0x03)
+    ciphertext = bytearray(len(plaintext))
+    cyclist.duplex_into(ciphertext, plaintext)
+    return bytes(ciphertext) + cyclist.squeeze(TAG_LENGTH, domain=0x01)
+
+
+def generate_vectors():
+    """LWC genkat vectors (key/nonce/PT/AD = 00 01 02 ...) from reference_encrypt"""
+    key = bytes(range(16))
+    nonce = bytes(range(16))
+    vectors = []
+    count = 1
+    for pt_length in range(MAX_MESSAGE_LENGTH + 1):
+        for ad_length in range(MAX_ASSOCIATED_DATA_LENGTH + 1):
+            plaintext = bytes(range(pt_length))
+            ad = bytes(range(ad_length))
+            vectors.append({'count': count, 'key': key, 'nonce': nonce, 'pt': plaintext, 'ad': ad,
+                            'ct': reference_encrypt(key, nonce, ad, plaintext)})
+            count += 1
+    return vectors
+
+
+def write_vectors(vectors, path):
+    """Write vectors in LWC KAT text format"""
+    with open(path, 'w') as f:
+        for vector in vectors:
+            f.write(f"Count = {vector['count']}\n")
+            f.write(f"Key = {vector['key'].hex().upper()}\n")
+            f.write(f"Nonce = {vector['nonce'].hex().upper()}\n")
+            f.write(f"PT = {vector['pt'].hex().upper()}\n")
+            f.write(f"AD = {vector['ad'].hex().upper()}\n")
+            f.write(f"CT = {vector['ct'].hex().upper()}\n\n")
+
+
+def load_vectors(path):
+    """Parse an LWC KAT text file into a list of dicts (count, key, nonce, pt, ad, ct)"""
+    vectors = []
+    vector = {}
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                if vector:
+                    vectors.append(vector)
+                    vector = {}
+                continue
+            name, _, value = line.partition('=')
+            name = name.strip().lower()
+            value = value.strip()
+            vector[name] = int(value) if name == 'count' else bytes.fromhex(value)
+    if vector:
+        vectors.append(vector)
+    return vectors
+
+
+def split(data, size):
+    """Chunks of size bytes (at least one, possibly empty)"""
+    return [data[i:i + size] for i in range(0, len(data), size)] or [data]
+
+
+def check_backend(backend, vector, full=True):
+    """Mismatch descriptions for one vector on one backend (empty list = pass)"""
+    errors = []
+    ciphertext, tag = vector['ct'][:-TAG_LENGTH], vector['ct'][-TAG_LENGTH:]
+    
+    def aead():
+        return XoodyakAEAD(vector['key'], vector['nonce'], vector['ad'], backend=backend)
+    
+    if b''.join(aead().encrypt(vector['pt'])) != vector['ct']:
+        errors.append('encrypt')
+    plaintext, is_verified = aead().decrypt(ciphertext, tag)
+    if plaintext != vector['pt'] or not is_verified:
+        errors.append('decrypt')
+    if not full:
+        return errors
+    
+    if not aead().verify_only(ciphertext, tag):
+        errors.append('verify_only')
+    forged = bytes([tag[0] ^ 0x01]) + tag[1:]
+    if aead().verify_only(ciphertext, forged):
+        errors.append('verify_only accepted forged tag')
+    
+    context = KeyedContext(vector['key'], backend=backend)
+    if b''.join(XoodyakAEAD(context, vector['nonce'], vector['ad']).encrypt(vector['pt'])) != vector['ct']:
+        errors.append('KeyedContext encrypt')
+    
+    for size in STREAM_SPLITS:
+        encryptor = XoodyakEncryptor(vector['key'], vector['nonce'], vector['ad'], backend=backend)
+        output = b''.join(encryptor.update(chunk) for chunk in split(vector['pt'], size))
+        if output + encryptor.finalize() != vector['ct']:
+            errors.append(f"stream encrypt (chunk {size})")
+        
+        decryptor = XoodyakDecryptor(vector['key'], vector['nonce'], vector['ad'], backend=backend)
+        output = b''.join(decryptor.update(chunk) for chunk in split(ciphertext, size))
+        if output != vector['pt'] or not decryptor.finalize(tag):
+            errors.append(f"stream decrypt (chunk {size})")
+    
+    return errors
+
+
+def check_batch(vectors):
+    """
+    Run the vectors through BatchCyclist, grouped by (AD length, PT length)
+    
+    Returns:
+        {count: [mismatch descriptions]} - None if NumPy is not installed
+    """
+    try:
+        import numpy as np
+        from xoodyak_batch import BatchCyclist
+    except ImportError:
+        return None
+    
+    groups = defaultdict(list)
+    for vector in vectors:
+        groups[(len(vector['ad']), len(vector['pt']))].append(vector)
+    
+    failures = {}
+    for (ad_length, pt_length), group in groups.items():
+        batch = BatchCyclist(len(group))
+        batch.absorb([v['key'] + v['nonce'] for v in group])
+        if ad_length:
+            batch.absorb([v['ad'] for v in group])
+        
+        # Duplex: keystream = current rate, then absorb the plaintext block
+        plaintext = np.frombuffer(b''.join(v['pt'] for v in group), dtype=np.uint8).reshape(len(group), pt_length)
+        ciphertext = np.empty_like(plaintext)
+        for i in range(0, pt_length, BatchCyclist.R):
+            block = plaintext[:, i:i + BatchCyclist.R]
+            rate = batch.state[:, :4].astype('<u4').view(np.uint8)
+            ciphertext[:, i:i + block.shape[1]] = block ^ rate[:, :block.shape[1]]
+            batch.absorb(block)
+        tags = batch.squeeze(TAG_LENGTH)
+        
+        for row, vector in enumerate(group):
+            if ciphertext[row].tobytes() + tags[row].tobytes() != vector['ct']:
+                failures[vector['count']] = ['batch encrypt']
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Xoodyak known-answer tests')
+    parser.add_argument('--generate', action='store_true', help='Tulis ulang file KAT dari backend reference')
+    parser.add_argument('--file', default=KAT_FILE, help='File KAT (format LWC)')
+    parser.add_argument('--backend', action='append', choices=sorted(BACKENDS),
+                        help='Backend yang dicek (bisa berulang, default: semua)')
+    parser.add_argument('--full-reference', action='store_true',
+                        help='Jalankan semua cek juga untuk backend reference (lambat)')
+    args = parser.parse_args()
+    
+    if args.generate:
+        vectors = generate_vectors()
+        write_vectors(vectors, args.file)
+        print(f"{len(vectors)} vectors -> {args.file}")
+        return 0
+    
+    vectors = load_vectors(args.file)
+    failed = False
+    
+    for backend in args.backend or list(BACKENDS):
+        # Vector dibuat dari backend reference: cukup encrypt/decrypt kecuali diminta
+        full = backend != 'reference' or args.full_reference
+        start = time.perf_counter()
+        failures = {}
+        for vector in vectors:
+            errors = check_backend(backend, vector, full)
+            if errors:
+                failures[vector['count']] = errors
+        elapsed = time.perf_counter() - start
+        print(f"{backend:<10} {len(vectors) - len(failures)}/{len(vectors)} passed ({elapsed:.2f}s)")
+        for count, errors in failures.items():
+            print(f"  Count = {count}: {', '.join(errors)}")
+        failed = failed or bool(failures)
+    
+    start = time.perf_counter()
+    failures = check_batch(vectors)
+    if failures is None:
+        print("batch      skipped (numpy tidak terinstall)")
+    else:
+        elapsed = time.perf_counter() - start
+        print(f"{'batch':<10} {len(vectors) - len(failures)}/{len(vectors)} passed ({elapsed:.2f}s)")
+        for count, errors in failures.items():
+            print(f"  Count = {count}: {', '.join(errors)}")
+        failed = failed or bool(failures)
+    
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
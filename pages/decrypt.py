@@ -9,7 +9,7 @@ from PIL import Image
 import io
 import time
 from xoodyak_utils import decrypt_file, calculate_hash
-from stego_models_pytorch import reveal_encrypted_data
+from stego_engine import reveal_encrypted_data
 
 
 def get_mime_type(extension: str) -> str:
@@ -278,16 +278,13 @@ def render():
                                 st.warning(f"⚠️ Autentikasi gagal, mencoba extract...")
                                 
                                 from xoodyak_core import XoodyakAEAD
-                                from xoodyak_utils import derive_key
+                                from xoodyak_utils import derive_key, parse_package
                                 
-                                version = extracted_data[0:1]
-                                nonce = extracted_data[1:17]
-                                tag = extracted_data[17:33]
-                                ciphertext = extracted_data[33:]
+                                package = parse_package(extracted_data)
                                 
-                                key = derive_key(password.strip())
-                                aead = XoodyakAEAD(key, nonce, b'')
-                                plaintext, is_verified = aead.decrypt(ciphertext, tag)
+                                key = derive_key(password.strip(), package['kdf'])
+                                aead = XoodyakAEAD(key, package['nonce'], b'')
+                                plaintext, is_verified = aead.decrypt(package['ciphertext'], package['tag'])
                                 
                                 file_data = plaintext
                                 error_msg = f"Data extracted (no verification)"
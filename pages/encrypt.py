@@ -10,8 +10,8 @@ SPESIFIKASI DATA:
 """
 
 import streamlit as st
-from xoodyak_utils import encrypt_file, calculate_hash
-from stego_models_pytorch import hide_encrypted_data
+from xoodyak_utils import encrypt_file_with_digests
+from stego_engine import hide_encrypted_data
 from PIL import Image
 import io
 import time
@@ -248,7 +248,6 @@ def render():
                                 st.info(f"📊 {word_count} kata | {file_size_kb:.1f} KB | Format: DOCX")
                     
                     if data_to_process:
-                        file_hash = calculate_hash(data_to_process)
                         st.markdown(f"""
                         <div class="success-status">
                         ✓ {filename}<br>
@@ -257,11 +256,8 @@ def render():
                         </div>
                         """, unsafe_allow_html=True)
                         
-                        st.markdown(f"""
-                        <div class="hash-label">Hash MD5 (Original)</div>
-                        <div class="hash-box">{file_hash}</div>
-                        """, unsafe_allow_html=True)
-                        st.session_state['pre_hash'] = file_hash
+                        # Hash MD5 dihitung saat enkripsi (satu pass dengan cipher)
+                        st.session_state['pre_hash'] = None
                         st.session_state['file_extension'] = file_extension
                         st.session_state['temp_data'] = data_to_process
                         st.session_state['temp_filename'] = filename
@@ -293,12 +289,8 @@ def render():
                         filename = "encrypted_text.txt"
                         file_extension = 'txt'
                         
-                        text_hash = calculate_hash(data_to_process)
-                        st.markdown(f"""
-                        <div class="hash-label">Hash MD5 (Original)</div>
-                        <div class="hash-box">{text_hash}</div>
-                        """, unsafe_allow_html=True)
-                        st.session_state['pre_hash'] = text_hash
+                        # Hash MD5 dihitung saat enkripsi (satu pass dengan cipher)
+                        st.session_state['pre_hash'] = None
                         st.session_state['file_extension'] = file_extension
                         st.session_state['temp_data'] = data_to_process
                         st.session_state['temp_filename'] = filename
@@ -362,7 +354,9 @@ def render():
                     try:
                         with st.spinner("⚙️ Mengenkripsi data dengan Xoodyak..."):
                             start_time = time.time()
-                            encrypted_data = encrypt_file(temp_data, password, st.session_state.get('temp_filename', 'data'))
+                            encrypted_data, pre_hash, encrypt_hash = encrypt_file_with_digests(
+                                temp_data, password, st.session_state.get('temp_filename', 'data')
+                            )
                             encrypt_time = time.time() - start_time
                             
                             perf_metrics = {
@@ -374,7 +368,8 @@ def render():
                             
                             st.session_state['encrypt_result'] = encrypted_data
                             st.session_state['encrypt_filename'] = st.session_state.get('temp_filename', 'data')
-                            st.session_state['encrypt_hash'] = calculate_hash(encrypted_data)
+                            st.session_state['pre_hash'] = pre_hash
+                            st.session_state['encrypt_hash'] = encrypt_hash
                             st.session_state['perf_metrics'] = perf_metrics
                             st.session_state['current_stage'] = 1.5
                             
@@ -407,6 +402,11 @@ def render():
         with col_before:
             st.markdown("<p style='text-align: center; color: #64b5f6; font-weight: bold; font-size: 1.2rem;'>🔓 SEBELUM ENKRIPSI</p>", unsafe_allow_html=True)
             st.markdown(f"**Ukuran:** {format_bytes(perf_metrics.get('data_original_size', 0))}")
+            if st.session_state.get('pre_hash'):
+                st.markdown(f"""
+                <div class="hash-label">Hash MD5 (Original)</div>
+                <div class="hash-box">{st.session_state['pre_hash']}</div>
+                """, unsafe_allow_html=True)
             
             # Tampilkan preview teks original dengan expander
             try:
@@ -426,6 +426,11 @@ def render():
         with col_after:
             st.markdown("<p style='text-align: center; color: #81c784; font-weight: bold; font-size: 1.2rem;'>🔒 SESUDAH ENKRIPSI</p>", unsafe_allow_html=True)
             st.markdown(f"**Ukuran:** {format_bytes(perf_metrics.get('data_encrypted_size', 0))}")
+            if st.session_state.get('encrypt_hash'):
+                st.markdown(f"""
+                <div class="hash-label">Hash MD5 (Ciphertext)</div>
+                <div class="hash-box">{st.session_state['encrypt_hash']}</div>
+                """, unsafe_allow_html=True)
             
             # Tampilkan preview encrypted data dalam hex dengan expander
             encrypted_hex = encrypted_data.hex().upper()
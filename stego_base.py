@@ -0,0 +1,487 @@
+"""
+stego_base.py
+Alur steganography yang sama untuk semua backend (PyTorch, ONNX Runtime) - tanpa torch
+Contains: BaseSteganographyEngine (preprocess/postprocess numpy/PIL, SIZE HEADER, metrics,
+          tiled inference, hide/reveal dan batch API)
+
+Backend cukup mengisi _run_encoder/_run_decoder dan, jika tensor-nya bukan array
+numpy, hook konversi (_from_numpy, _to_numpy, _concat, _empty_like, _no_grad).
+"""
+
+import contextlib
+import io
+import os
+import struct
+from typing import Tuple, Dict, List, Optional
+
+import numpy as np
+from PIL import Image
+
+
+# Batas memori aktivasi per batch untuk hide_batch/reveal_batch (bytes)
+MAX_BATCH_MEMORY = int(os.environ.get('STEGO_MAX_BATCH_MEMORY', 512 * 1024 * 1024))
+
+# Tiled inference: gambar lebih besar dari TILE_SIZE diproses per tile (0 = selalu full frame)
+TILE_SIZE = int(os.environ.get('STEGO_TILE_SIZE', 512))
+# Encoder/decoder = 4 conv 3x3 berurutan -> receptive radius 4 px; halo >= 4 memberi hasil identik
+TILE_HALO = 4
+
+
+class BaseSteganographyEngine:
+    """Hide/reveal dengan SIZE HEADER di atas encoder/decoder (N, C, H, W) dari backend"""
+    
+    def __init__(self):
+        self.encoder = None
+        self.decoder = None
+        self.models_loaded = False
+        self.data_depth = 1
+        self.hidden_size = 32
+        self.max_batch_memory = MAX_BATCH_MEMORY
+        self.tile_size = TILE_SIZE
+        self.tile_halo = TILE_HALO
+    
+    # ========================================================================
+    # BACKEND HOOKS
+    # ========================================================================
+    
+    def _run_encoder(self, cover_tensor, secret_tensor):
+        """Jalankan encoder backend pada (N, 3, H, W) dan (N, 1, H, W)"""
+        raise NotImplementedError
+    
+    def _run_decoder(self, stego_tensor):
+        """Jalankan decoder backend pada (N, 3, H, W)"""
+        raise NotImplementedError
+    
+    def _no_grad(self):
+        """Context manager untuk inference (mis. torch.no_grad)"""
+        return contextlib.nullcontext()
+    
+    def _from_numpy(self, array: np.ndarray):
+        """Array numpy float32 -> tensor backend"""
+        return array
+    
+    def _to_numpy(self, tensor) -> np.ndarray:
+        """Tensor backend -> array numpy"""
+        return np.asarray(tensor)
+    
+    def _concat(self, tensors: list):
+        """Gabungkan tensor (1, C, H, W) menjadi satu batch (N, C, H, W)"""
+        return np.concatenate(tensors)
+    
+    def _empty_like(self, tensor, channels: int):
+        """Tensor kosong dengan batch/H/W (dan dtype/device) seperti tensor, dengan channels channel"""
+        batch_size, _, height, width = tensor.shape
+        return np.empty((batch_size, channels, height, width), dtype=tensor.dtype)
+    
+    # ========================================================================
+    # PREPROCESS / POSTPROCESS
+    # ========================================================================
+    
+    def _pad_to_multiple(self, size: int, multiple: int = 32) -> int:
+        """Pad size ke multiple terdekat"""
+        return ((size + multiple - 1) // multiple) * multiple
+    
+    def preprocess_image(self, image_data: bytes, target_size: int = None) -> Tuple[object, Tuple[int, int], Tuple[int, int]]:
+        """Convert image bytes ke tensor (1, 3, H, W) dengan padding putih"""
+        try:
+            img = Image.open(io.BytesIO(image_data)).convert('RGB')
+            original_size = img.size
+            
+            if target_size is not None:
+                img = img.resize((target_size, target_size), Image.Resampling.LANCZOS)
+            
+            width, height = img.size
+            
+            padded_width = self._pad_to_multiple(width, multiple=32)
+            padded_height = self._pad_to_multiple(height, multiple=32)
+            
+            if padded_width != width or padded_height != height:
+                padded_img = Image.new('RGB', (padded_width, padded_height), (255, 255, 255))
+                padded_img.paste(img, (0, 0))
+                img = padded_img
+            
+            img_array = np.array(img, dtype=np.float32)
+            img_array = img_array / 255.0
+            img_array = np.ascontiguousarray(img_array.transpose(2, 0, 1)[np.newaxis])
+            
+            actual_size = (padded_width, padded_height)
+            
+            return self._from_numpy(img_array), original_size, actual_size
+        
+        except Exception as e:
+            raise RuntimeError(f"Error preprocessing image: {str(e)}")
+    
+    def preprocess_secret(self, secret_data: bytes, image_height: int, image_width: int) -> Tuple[object, int]:
+        """Convert secret data ke tensor (bit MSB-first, sisa kapasitas diisi 0)"""
+        try:
+            total_available_bits = image_height * image_width * 1
+            
+            # Unpack bit langsung ke array yang sudah dialokasikan (tanpa string per bit)
+            secret_array = np.zeros((1, 1, image_height, image_width), dtype=np.float32)
+            bits = np.unpackbits(np.frombuffer(secret_data, dtype=np.uint8))[:total_available_bits]
+            secret_array.reshape(-1)[:len(bits)] = bits
+            
+            return self._from_numpy(secret_array), total_available_bits
+        
+        except Exception as e:
+            raise RuntimeError(f"Error preprocessing secret: {str(e)}")
+    
+    def postprocess_image(self, output_tensor) -> bytes:
+        """Convert output tensor (1, 3, H, W) kembali ke image bytes"""
+        try:
+            output_array = self._to_numpy(output_tensor)[0].transpose(1, 2, 0) * 255.0
+            output_array = np.clip(output_array, 0, 255).astype(np.uint8)
+            
+            output_image = Image.fromarray(output_array, 'RGB')
+            
+            output_bytes = io.BytesIO()
+            output_image.save(output_bytes, format='PNG')
+            
+            return output_bytes.getvalue()
+        
+        except Exception as e:
+            raise RuntimeError(f"Error postprocessing image: {str(e)}")
+    
+    def postprocess_secret(self, output_tensor, bit_length: int) -> bytes:
+        """Convert output tensor kembali ke bytes (hanya byte yang lengkap 8 bit)"""
+        try:
+            # Threshold di backend, transfer hanya bit (bool) ke numpy
+            binary_array = self._to_numpy(output_tensor > 0.5).reshape(-1).astype(np.uint8)
+            
+            # Byte terakhir yang terpotong bit_length tetap dibaca jika 8 bitnya tersedia
+            byte_count = min(-(-min(bit_length, len(binary_array)) // 8), len(binary_array) // 8)
+            
+            return np.packbits(binary_array[:byte_count * 8]).tobytes()
+        
+        except Exception as e:
+            raise RuntimeError(f"Error postprocessing secret: {str(e)}")
+    
+    def calculate_psnr(self, original, stego) -> float:
+        """Hitung PSNR antara original dan stego image"""
+        try:
+            original = np.clip(self._to_numpy(original), 0, 1)
+            stego = np.clip(self._to_numpy(stego), 0, 1)
+            
+            mse = np.mean((original - stego) ** 2)
+            
+            if mse == 0:
+                return float('inf')
+            
+            return float(10.0 * np.log10(1.0 / mse))
+        
+        except Exception as e:
+            print(f"⚠️ Error calculating PSNR: {e}")
+            return 0.0
+    
+    # ========================================================================
+    # INFERENCE
+    # ========================================================================
+    
+    def _run_tiled(self, model, inputs: list, out_channels: int):
+        """
+        Jalankan model fully convolutional per tile dengan halo lalu gabungkan
+        
+        Setiap tile dipotong bersama halo tile_halo px di sisi yang bukan tepi
+        gambar; karena receptive radius model 4 px, bagian tengah tile identik
+        dengan hasil full frame (di tepi gambar zero padding-nya juga sama).
+        Memori aktivasi dibatasi ukuran tile, bukan ukuran gambar.
+        """
+        _, _, height, width = inputs[0].shape
+        tile, halo = self.tile_size, self.tile_halo
+        output = self._empty_like(inputs[0], out_channels)
+        
+        for y in range(0, height, tile):
+            for x in range(0, width, tile):
+                y0, y1 = max(y - halo, 0), min(y + tile + halo, height)
+                x0, x1 = max(x - halo, 0), min(x + tile + halo, width)
+                tile_height, tile_width = min(tile, height - y), min(tile, width - x)
+                
+                result = model(*[t[:, :, y0:y1, x0:x1] for t in inputs])
+                output[:, :, y:y + tile_height, x:x + tile_width] = \
+                    result[:, :, y - y0:y - y0 + tile_height, x - x0:x - x0 + tile_width]
+        
+        return output
+    
+    def _use_tiles(self, tensor) -> bool:
+        """True jika gambar lebih besar dari tile_size (tile_size 0/None = full frame)"""
+        return bool(self.tile_size) and max(tensor.shape[2:]) > self.tile_size
+    
+    def encode(self, cover_tensor, secret_tensor):
+        """Encoder full frame atau tiled (hasil sama) - input (N, 3, H, W) dan (N, 1, H, W)"""
+        if self._use_tiles(cover_tensor):
+            return self._run_tiled(self._run_encoder, [cover_tensor, secret_tensor], 3)
+        return self._run_encoder(cover_tensor, secret_tensor)
+    
+    def decode(self, stego_tensor):
+        """Decoder full frame atau tiled (hasil sama) - input (N, 3, H, W)"""
+        if self._use_tiles(stego_tensor):
+            return self._run_tiled(self._run_decoder, [stego_tensor], self.data_depth)
+        return self._run_decoder(stego_tensor)
+    
+    # ========================================================================
+    # HIDE / REVEAL
+    # ========================================================================
+    
+    def hide_encrypted_data(self, cover_image_data: bytes,
+                           encrypted_data: bytes,
+                           max_resolution: int = None) -> Tuple[bytes, Dict]:
+        """
+        Sembunyikan data dengan SIZE HEADER (FIX)
+        Format: [4 bytes: SIZE] [N bytes: DATA]
+        """
+        if not self.models_loaded:
+            raise RuntimeError("❌ Models belum di-load!")
+        
+        try:
+            with self._no_grad():
+                # ===== NEW: Buat SIZE HEADER =====
+                data_size = len(encrypted_data)
+                size_header = struct.pack('>I', data_size)
+                payload = size_header + encrypted_data
+                
+                print(f"📝 Original data: {data_size} bytes")
+                print(f"📦 Payload (with header): {len(payload)} bytes")
+                
+                cover_tensor, original_size, actual_size = self.preprocess_image(
+                    cover_image_data,
+                    target_size=max_resolution
+                )
+                
+                batch_size, channels, height, width = cover_tensor.shape
+                
+                print(f"📐 Original input: {original_size[0]}x{original_size[1]}")
+                print(f"🔧 Padded to: {width}x{height}")
+                print(f"📦 Payload size: {len(payload)} bytes")
+                print(f"💾 Capacity: {(width * height) // 8} bytes")
+                
+                secret_tensor, bit_length = self.preprocess_secret(
+                    payload,
+                    image_height=height,
+                    image_width=width
+                )
+                
+                stego_tensor = self.encode(cover_tensor, secret_tensor)
+                
+                return self._finish_embedding(cover_tensor, stego_tensor, len(encrypted_data))
+        
+        except Exception as e:
+            print(f"❌ Error saat embedding: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            raise RuntimeError(f"❌ Error: {str(e)}")
+    
+    def _finish_embedding(self, cover_tensor, stego_tensor, data_size: int) -> Tuple[bytes, Dict]:
+        """Stego image bytes dan metrics untuk satu item (tensor shape (1, 3, H, W))"""
+        height, width = cover_tensor.shape[2:]
+        
+        psnr = self.calculate_psnr(cover_tensor, stego_tensor)
+        mse = np.mean((self._to_numpy(cover_tensor) - self._to_numpy(stego_tensor)) ** 2)
+        
+        stego_image_bytes = self.postprocess_image(stego_tensor)
+        
+        metrics = {
+            'psnr': float(psnr),
+            'mse': float(mse),
+            'quality': 'Excellent' if psnr > 40 else 'Good' if psnr > 30 else 'Fair',
+            'image_size': len(stego_image_bytes),
+            'data_size': data_size,
+            'payload_size': data_size + 4,
+            'resolution': f'{width}x{height}',
+            'has_size_header': True,
+        }
+        
+        return stego_image_bytes, metrics
+    
+    def reveal_encrypted_data(self, stego_image_data: bytes) -> bytes:
+        """
+        Ekstrak data dengan membaca SIZE HEADER (FIX)
+        """
+        if not self.models_loaded:
+            raise RuntimeError("❌ Models belum di-load!")
+        
+        try:
+            with self._no_grad():
+                stego_tensor, original_size, actual_size = self.preprocess_image(stego_image_data)
+                
+                batch_size, channels, height, width = stego_tensor.shape
+                
+                print(f"📐 Extracted from: {width}x{height}")
+                
+                secret_tensor = self.decode(stego_tensor)
+                
+                full_bit_length = width * height
+                
+                full_extracted = self.postprocess_secret(
+                    secret_tensor,
+                    full_bit_length
+                )
+                
+                print(f"📥 Full extraction: {len(full_extracted)} bytes")
+                
+                return self._read_size_header(full_extracted)
+        
+        except Exception as e:
+            print(f"❌ Error saat extraction: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            raise RuntimeError(f"❌ Error: {str(e)}")
+    
+    def _read_size_header(self, full_extracted: bytes) -> bytes:
+        """Potong data hasil ekstraksi sesuai SIZE HEADER (data utuh jika header tidak valid)"""
+        # ===== NEW: Baca SIZE HEADER =====
+        if len(full_extracted) < 4:
+            print("⚠️ Data terlalu pendek!")
+            return full_extracted
+        
+        size_bytes = full_extracted[0:4]
+        try:
+            data_size = struct.unpack('>I', size_bytes)[0]
+            print(f"📋 Size header: {data_size} bytes")
+        except:
+            print("⚠️ Gagal membaca size header")
+            return full_extracted
+        
+        if data_size < 1 or data_size > 1000000:
+            print(f"⚠️ Size invalid: {data_size}")
+            return full_extracted
+        
+        encrypted_data = full_extracted[4:4+data_size]
+        
+        if len(encrypted_data) != data_size:
+            print(f"⚠️ Incomplete: expected {data_size}, got {len(encrypted_data)}")
+        else:
+            print(f"✅ Extracted: {len(encrypted_data)} bytes (sesuai size header)")
+        
+        return encrypted_data
+    
+    # ========================================================================
+    # BATCH API
+    # ========================================================================
+    
+    def _padded_size(self, image_data: bytes, target_size: int = None) -> Tuple[int, int]:
+        """(width, height) setelah resize/padding seperti preprocess_image - hanya baca header gambar"""
+        if target_size is not None:
+            width = height = target_size
+        else:
+            width, height = Image.open(io.BytesIO(image_data)).size
+        return self._pad_to_multiple(width, multiple=32), self._pad_to_multiple(height, multiple=32)
+    
+    def _estimate_item_memory(self, height: int, width: int) -> int:
+        """Perkiraan memori float32 encoder untuk satu gambar (bytes), memperhitungkan tiling"""
+        h, d = self.hidden_size, self.data_depth
+        
+        # Aktivasi: 3 ConvBlock + 3 hasil concat - hanya seukuran tile jika tiled
+        if self.tile_size and max(height, width) > self.tile_size:
+            span = self.tile_size + 2 * self.tile_halo
+            activation_pixels = min(height, span) * min(width, span)
+        else:
+            activation_pixels = height * width
+        activation = activation_pixels * (3 * h + (h + d) + (2 * h + d) + (3 * h + d))
+        
+        # Full frame: cover, payload, delta/stego
+        return (activation + height * width * ((3 + d) + 6)) * 4
+    
+    def _plan_batches(self, images: List[bytes], target_size: int = None,
+                      max_batch_memory: Optional[int] = None) -> List[List[int]]:
+        """Kelompokkan index gambar per resolusi padded, dipecah sesuai max_batch_memory"""
+        max_batch_memory = max_batch_memory or self.max_batch_memory
+        
+        groups = {}
+        for index, image_data in enumerate(images):
+            groups.setdefault(self._padded_size(image_data, target_size), []).append(index)
+        
+        batches = []
+        for (width, height), indices in groups.items():
+            batch_size = max(1, max_batch_memory // self._estimate_item_memory(height, width))
+            for start in range(0, len(indices), batch_size):
+                batches.append(indices[start:start + batch_size])
+        return batches
+    
+    def hide_batch(self, covers: List[bytes], payloads: List[bytes],
+                   max_resolution: int = None,
+                   max_batch_memory: Optional[int] = None) -> List[Tuple[bytes, Dict]]:
+        """
+        Sembunyikan banyak payload sekaligus - encoder dijalankan sekali per batch
+        
+        Cover dengan resolusi padded yang sama digabung menjadi satu tensor
+        (N, 3, H, W); batch dipecah agar perkiraan memori aktivasi tidak
+        melebihi max_batch_memory. Hasil per item identik dengan
+        hide_encrypted_data (BatchNorm dalam mode eval tidak bergantung batch).
+        
+        Args:
+            covers: List cover image (bytes)
+            payloads: List data terenkripsi (bytes), pasangan covers
+            max_resolution: Resize cover ke ukuran ini (opsional, sama seperti hide_encrypted_data)
+            max_batch_memory: Batas memori per batch dalam bytes (default: self.max_batch_memory)
+        
+        Returns:
+            List (stego_image_bytes, metrics) dengan urutan sama seperti input
+        """
+        if not self.models_loaded:
+            raise RuntimeError("❌ Models belum di-load!")
+        if len(covers) != len(payloads):
+            raise ValueError(f"Jumlah cover ({len(covers)}) dan payload ({len(payloads)}) harus sama")
+        
+        try:
+            results = [None] * len(covers)
+            with self._no_grad():
+                for batch in self._plan_batches(covers, max_resolution, max_batch_memory):
+                    cover_tensor = self._concat([
+                        self.preprocess_image(covers[i], target_size=max_resolution)[0] for i in batch
+                    ])
+                    height, width = cover_tensor.shape[2:]
+                    secret_tensor = self._concat([
+                        self.preprocess_secret(struct.pack('>I', len(payloads[i])) + payloads[i], height, width)[0]
+                        for i in batch
+                    ])
+                    
+                    stego_tensor = self.encode(cover_tensor, secret_tensor)
+                    print(f"📦 Batch: {len(batch)} gambar {width}x{height}")
+                    
+                    for row, i in enumerate(batch):
+                        results[i] = self._finish_embedding(
+                            cover_tensor[row:row + 1], stego_tensor[row:row + 1], len(payloads[i])
+                        )
+            return results
+        
+        except Exception as e:
+            print(f"❌ Error saat batch embedding: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            raise RuntimeError(f"❌ Error: {str(e)}")
+    
+    def reveal_batch(self, stegos: List[bytes],
+                     max_batch_memory: Optional[int] = None) -> List[bytes]:
+        """
+        Ekstrak data dari banyak stego image - decoder dijalankan sekali per batch
+        
+        Args:
+            stegos: List stego image (bytes)
+            max_batch_memory: Batas memori per batch dalam bytes (default: self.max_batch_memory)
+        
+        Returns:
+            List data terenkripsi dengan urutan sama seperti input
+        """
+        if not self.models_loaded:
+            raise RuntimeError("❌ Models belum di-load!")
+        
+        try:
+            results = [None] * len(stegos)
+            with self._no_grad():
+                for batch in self._plan_batches(stegos, None, max_batch_memory):
+                    stego_tensor = self._concat([self.preprocess_image(stegos[i])[0] for i in batch])
+                    height, width = stego_tensor.shape[2:]
+                    
+                    secret_tensor = self.decode(stego_tensor)
+                    print(f"📦 Batch: {len(batch)} gambar {width}x{height}")
+                    
+                    for row, i in enumerate(batch):
+                        full_extracted = self.postprocess_secret(secret_tensor[row], width * height)
+                        results[i] = self._read_size_header(full_extracted)
+            return results
+        
+        except Exception as e:
+            print(f"❌ Error saat batch extraction: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            raise RuntimeError(f"❌ Error: {str(e)}")
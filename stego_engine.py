@@ -0,0 +1,64 @@
+"""
+stego_engine.py
+Pemilihan backend steganography lewat konfigurasi (env STEGO_BACKEND)
+Contains: create_engine, model_files, fungsi Streamlit hide_encrypted_data / reveal_encrypted_data
+
+Backend:
+    pytorch      - SteganographyEngine (stego_models_pytorch, models/*.pth)
+    onnxruntime  - OnnxSteganographyEngine (stego_models_onnx, models/*.onnx, tanpa PyTorch)
+Modul backend di-import saat dipakai, jadi backend onnxruntime tidak butuh torch terinstall.
+"""
+
+import os
+from typing import Dict, Tuple
+
+import streamlit as st
+
+
+STEGO_BACKEND = os.environ.get('STEGO_BACKEND', 'pytorch')
+
+BACKEND_MODEL_FILES = {
+    'pytorch': ['enhanced_encoder.pth', 'enhanced_decoder.pth'],
+    'onnxruntime': ['enhanced_encoder.onnx', 'enhanced_decoder.onnx'],
+}
+
+
+def _backend_name(backend: str = None) -> str:
+    """Nama backend tervalidasi (default: STEGO_BACKEND)"""
+    backend = backend or STEGO_BACKEND
+    if backend not in BACKEND_MODEL_FILES:
+        raise ValueError(f"Backend steganography tidak dikenal: {backend} (pilihan: {', '.join(BACKEND_MODEL_FILES)})")
+    return backend
+
+
+def model_files(backend: str = None) -> list:
+    """File model (di folder models/) yang dibutuhkan backend"""
+    return BACKEND_MODEL_FILES[_backend_name(backend)]
+
+
+def create_engine(backend: str = None):
+    """Engine steganography (belum di-load) untuk backend yang dipilih"""
+    if _backend_name(backend) == 'onnxruntime':
+        from stego_models_onnx import OnnxSteganographyEngine
+        return OnnxSteganographyEngine()
+    
+    from stego_models_pytorch import SteganographyEngine
+    return SteganographyEngine()
+
+
+def hide_encrypted_data(cover_image_data: bytes, encrypted_data: bytes, max_resolution: int = None) -> Tuple[bytes, Dict]:
+    """Public function untuk sembunyikan data"""
+    if 'stego_engine' not in st.session_state:
+        raise RuntimeError("❌ Steganography engine tidak tersedia")
+    
+    engine = st.session_state.stego_engine
+    return engine.hide_encrypted_data(cover_image_data, encrypted_data, max_resolution=max_resolution)
+
+
+def reveal_encrypted_data(stego_image_data: bytes) -> bytes:
+    """Public function untuk ekstrak data"""
+    if 'stego_engine' not in st.session_state:
+        raise RuntimeError("❌ Steganography engine tidak tersedia")
+    
+    engine = st.session_state.stego_engine
+    return engine.reveal_encrypted_data(stego_image_data)
@@ -0,0 +1,81 @@
+"""
+stego_models_onnx.py
+Steganography engine dengan ONNX Runtime (CPUExecutionProvider) - tanpa PyTorch
+Contains: OnnxSteganographyEngine - hide/reveal, tiling dan batch API dari BaseSteganographyEngine
+
+Model: models/enhanced_encoder.onnx dan models/enhanced_decoder.onnx (buat dengan
+python export_onnx.py). Hanya butuh numpy, pillow dan onnxruntime (requirements-worker.txt).
+"""
+
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+from stego_base import BaseSteganographyEngine
+
+
+# Thread pool ONNX Runtime (0 = default ORT, satu thread per core fisik)
+ORT_INTRA_OP_THREADS = int(os.environ.get('STEGO_ORT_THREADS', 0))
+
+
+class OnnxSteganographyEngine(BaseSteganographyEngine):
+    """Jalankan DenseEncoder/DenseDecoder hasil export ONNX dengan onnxruntime di CPU"""
+    
+    def __init__(self, model_dir: str = "models"):
+        super().__init__()
+        # Atribut device mengikuti SteganographyEngine (dipakai UI untuk status CPU/GPU)
+        self.device = SimpleNamespace(type="cpu")
+        self.model_dir = model_dir
+        self.intra_op_threads = ORT_INTRA_OP_THREADS
+    
+    def _create_session(self, path: str):
+        """InferenceSession CPU dengan semua graph optimization (fusion, constant folding)"""
+        import onnxruntime as ort
+        
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        if self.intra_op_threads:
+            options.intra_op_num_threads = self.intra_op_threads
+        return ort.InferenceSession(path, sess_options=options, providers=['CPUExecutionProvider'])
+    
+    def load_models(self) -> bool:
+        """Load model ONNX dari models/*.onnx"""
+        try:
+            encoder_path = os.path.join(self.model_dir, "enhanced_encoder.onnx")
+            decoder_path = os.path.join(self.model_dir, "enhanced_decoder.onnx")
+            
+            for path in (encoder_path, decoder_path):
+                if not os.path.exists(path):
+                    print(f"❌ Model ONNX tidak ditemukan: {path} (jalankan python export_onnx.py)")
+                    return False
+            
+            print(f"📂 Model directory: {os.path.abspath(self.model_dir)}")
+            
+            print(f"📥 Loading encoder (onnxruntime)...")
+            self.encoder = self._create_session(encoder_path)
+            print("✅ Encoder loaded successfully!")
+            
+            print(f"📥 Loading decoder (onnxruntime)...")
+            self.decoder = self._create_session(decoder_path)
+            print("✅ Decoder loaded successfully!")
+            
+            self.models_loaded = True
+            print("\n✅ All models loaded!")
+            
+            return True
+        
+        except Exception as e:
+            print(f"❌ Error loading models: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+    
+    def _run_encoder(self, cover_tensor: np.ndarray, secret_tensor: np.ndarray) -> np.ndarray:
+        # Tile adalah slice (non-contiguous) - ORT butuh buffer contiguous
+        feeds = {'image': np.ascontiguousarray(cover_tensor), 'payload': np.ascontiguousarray(secret_tensor)}
+        return self.encoder.run(None, feeds)[0]
+    
+    def _run_decoder(self, stego_tensor: np.ndarray) -> np.ndarray:
+        return self.decoder.run(None, {'stego': np.ascontiguousarray(stego_tensor)})[0]
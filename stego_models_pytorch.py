@@ -4,15 +4,15 @@ Steganography with PyTorch Models (.pth) - FIXED dengan Size Header
 Support untuk enhanced_encoder.pth dan enhanced_decoder.pth
 """
 
-import streamlit as st
 import torch
 import torch.nn as nn
 import numpy as np
-from PIL import Image
-import io
+import copy
+import hashlib
 import os
-import struct
-from typing import Tuple, Dict
+from typing import List
+
+from stego_base import BaseSteganographyEngine, MAX_BATCH_MEMORY, TILE_SIZE, TILE_HALO
 
 
 # ============================================================================
@@ -107,20 +107,60 @@ class DenseDecoder(nn.Module):
         return x
 
 
+class FusedConvBlock(nn.Module):
+    """
+    ConvBlock (mode eval) dengan BatchNorm yang di-fold ke conv
+
+    BN setelah LeakyReLU: y = s * LeakyReLU(conv(x)) + t. LeakyReLU homogen
+    positif, jadi |s| bisa masuk ke bobot conv: y = sign(s) * LeakyReLU(conv'(x)) + t.
+    Hasil sama dengan ConvBlock.eval() tanpa operasi BN terpisah.
+    """
+    def __init__(self, block: ConvBlock):
+        super(FusedConvBlock, self).__init__()
+        conv, bn = block.conv, block.bn
+
+        weight = bn.weight if bn.weight is not None else torch.ones_like(bn.running_var)
+        bias = bn.bias if bn.bias is not None else torch.zeros_like(bn.running_var)
+        scale = weight / torch.sqrt(bn.running_var + bn.eps)
+        magnitude = scale.abs()
+
+        self.conv = nn.Conv2d(conv.in_channels, conv.out_channels, conv.kernel_size, padding=conv.padding)
+        with torch.no_grad():
+            self.conv.weight.copy_(conv.weight * magnitude.view(-1, 1, 1, 1))
+            self.conv.bias.copy_(conv.bias * magnitude)
+        self.activation = nn.LeakyReLU(block.activation.negative_slope, inplace=True)
+        self.register_buffer('sign', torch.sign(scale).detach().view(1, -1, 1, 1))
+        self.register_buffer('shift', (bias - bn.running_mean * scale).detach().view(1, -1, 1, 1))
+
+    def forward(self, x):
+        x = self.activation(self.conv(x))
+        return x * self.sign + self.shift
+
+
+def fold_batchnorm(model: nn.Module) -> nn.Module:
+    """Salinan model (eval) dengan setiap ConvBlock diganti FusedConvBlock"""
+    fused = copy.deepcopy(model).eval()
+    for name, child in fused.named_children():
+        if isinstance(child, ConvBlock):
+            setattr(fused, name, FusedConvBlock(child))
+    return fused.eval()
+
+
 # ============================================================================
 # STEGANOGRAPHY ENGINE
 # ============================================================================
 
-class SteganographyEngine:
-    """Main class untuk load dan gunakan model PyTorch"""
+# Inference lewat TorchScript (BN di-fold, model di-freeze), artifact di-cache di samping .pth
+COMPILED_INFERENCE = os.environ.get('STEGO_COMPILED', '0') == '1'
+COMPILED_SUFFIX = '.torchscript.pt'
+
+class SteganographyEngine(BaseSteganographyEngine):
+    """Main class untuk load dan gunakan model PyTorch (alur hide/reveal di BaseSteganographyEngine)"""
     
     def __init__(self):
+        super().__init__()
         self.device = torch.device("cpu")
-        self.encoder = None
-        self.decoder = None
-        self.models_loaded = False
-        self.data_depth = 1
-        self.hidden_size = 32
+        self.compiled = COMPILED_INFERENCE
         
     def load_models(self) -> bool:
         """Load model PyTorch dari file .pth"""
@@ -163,6 +203,10 @@ class SteganographyEngine:
             self.decoder.eval()
             print("✅ Decoder loaded successfully!")
             
+            if self.compiled:
+                self.encoder = self._compile_model(self.encoder, encoder_path)
+                self.decoder = self._compile_model(self.decoder, decoder_path)
+            
             self.models_loaded = True
             print("\n✅ All models loaded!")
             
@@ -174,271 +218,61 @@ class SteganographyEngine:
             traceback.print_exc()
             return False
     
-    def _pad_to_multiple(self, size: int, multiple: int = 32) -> int:
-        """Pad size ke multiple terdekat"""
-        return ((size + multiple - 1) // multiple) * multiple
-
-    def preprocess_image(self, image_data: bytes, target_size: int = None) -> Tuple[torch.Tensor, Tuple[int, int], Tuple[int, int]]:
-        """Convert image bytes ke tensor dengan padding"""
-        try:
-            img = Image.open(io.BytesIO(image_data)).convert('RGB')
-            original_size = img.size
-            
-            if target_size is not None:
-                img = img.resize((target_size, target_size), Image.Resampling.LANCZOS)
-            
-            width, height = img.size
-            
-            padded_width = self._pad_to_multiple(width, multiple=32)
-            padded_height = self._pad_to_multiple(height, multiple=32)
-            
-            if padded_width != width or padded_height != height:
-                padded_img = Image.new('RGB', (padded_width, padded_height), (255, 255, 255))
-                padded_img.paste(img, (0, 0))
-                img = padded_img
-            
-            img_array = np.array(img, dtype=np.float32)
-            img_array = img_array / 255.0
-            
-            img_tensor = torch.from_numpy(img_array).permute(2, 0, 1)
-            img_tensor = img_tensor.unsqueeze(0).to(self.device)
-            
-            actual_size = (padded_width, padded_height)
-            
-            return img_tensor, original_size, actual_size
-        
-        except Exception as e:
-            raise RuntimeError(f"Error preprocessing image: {str(e)}")
-    
-    def preprocess_secret(self, secret_data: bytes, image_height: int, image_width: int) -> Tuple[torch.Tensor, int]:
-        """Convert secret data ke tensor"""
-        try:
-            binary_str = ''.join(format(byte, '08b') for byte in secret_data)
-            
-            total_available_bits = image_height * image_width * 1
-            
-            if len(binary_str) < total_available_bits:
-                binary_str = binary_str + '0' * (total_available_bits - len(binary_str))
-            else:
-                binary_str = binary_str[:total_available_bits]
-            
-            secret_array = np.array([float(bit) for bit in binary_str], dtype=np.float32)
-            secret_array = secret_array.reshape(1, 1, image_height, image_width)
-            
-            secret_tensor = torch.from_numpy(secret_array).to(self.device)
-            
-            return secret_tensor, len(binary_str)
+    def _compile_model(self, model: nn.Module, source_path: str) -> nn.Module:
+        """
+        TorchScript model dengan BN di-fold dan di-freeze, di-cache di samping file .pth
         
-        except Exception as e:
-            raise RuntimeError(f"Error preprocessing secret: {str(e)}")
-    
-    def postprocess_image(self, output_tensor: torch.Tensor) -> bytes:
-        """Convert output tensor kembali ke image bytes"""
-        try:
-            output_tensor = output_tensor.detach().cpu()
-            output_tensor = output_tensor.squeeze(0)
-            
-            output_array = (output_tensor.permute(1, 2, 0).numpy() * 255.0)
-            output_array = np.clip(output_array, 0, 255).astype(np.uint8)
-            
-            output_image = Image.fromarray(output_array, 'RGB')
-            
-            output_bytes = io.BytesIO()
-            output_image.save(output_bytes, format='PNG')
-            output_bytes.seek(0)
-            
-            return output_bytes.getvalue()
+        Cache berlaku selama checksum .pth dan versi torch sama; jika kompilasi
+        gagal model eager dipakai, jika hanya penyimpanan cache gagal model
+        compiled tetap dipakai.
+        """
+        artifact_path = os.path.splitext(source_path)[0] + COMPILED_SUFFIX
+        with open(source_path, 'rb') as f:
+            checksum = f"{hashlib.sha256(f.read()).hexdigest()}:{torch.__version__}"
         
-        except Exception as e:
-            raise RuntimeError(f"Error postprocessing image: {str(e)}")
-    
-    def postprocess_secret(self, output_tensor: torch.Tensor, bit_length: int) -> bytes:
-        """Convert output tensor kembali ke bytes"""
-        try:
-            output_array = output_tensor.detach().cpu().numpy().flatten()
-            binary_array = (output_array > 0.5).astype(int)
-            
-            recovered_bytes = bytearray()
-            for i in range(0, min(bit_length, len(binary_array)), 8):
-                byte_bits = ''.join(str(int(b)) for b in binary_array[i:i+8])
-                if len(byte_bits) == 8:
-                    recovered_bytes.append(int(byte_bits, 2))
-            
-            return bytes(recovered_bytes)
+        if os.path.exists(artifact_path):
+            extra_files = {'source_checksum': ''}
+            try:
+                compiled = torch.jit.load(artifact_path, map_location=self.device, _extra_files=extra_files)
+                if extra_files['source_checksum'].decode() == checksum:
+                    print(f"⚡ Compiled model dari cache: {artifact_path}")
+                    return compiled
+            except Exception as e:
+                print(f"⚠️ Cache compiled model tidak valid: {e}")
         
-        except Exception as e:
-            raise RuntimeError(f"Error postprocessing secret: {str(e)}")
-    
-    def calculate_psnr(self, original: torch.Tensor, stego: torch.Tensor) -> float:
-        """Hitung PSNR antara original dan stego image"""
         try:
-            with torch.no_grad():
-                original = torch.clamp(original, 0, 1)
-                stego = torch.clamp(stego, 0, 1)
-                
-                mse = torch.mean((original - stego) ** 2)
-                
-                if mse == 0:
-                    return float('inf')
-                
-                psnr = 10.0 * torch.log10(1.0 / mse)
-                
-                return psnr.item()
-        
+            print(f"⚙️ Compiling {type(model).__name__} (TorchScript)...")
+            compiled = torch.jit.freeze(torch.jit.script(fold_batchnorm(model)))
         except Exception as e:
-            print(f"⚠️ Error calculating PSNR: {e}")
-            return 0.0
-    
-    def hide_encrypted_data(self, cover_image_data: bytes, 
-                           encrypted_data: bytes, 
-                           max_resolution: int = None) -> Tuple[bytes, Dict]:
-        """
-        Sembunyikan data dengan SIZE HEADER (FIX)
-        Format: [4 bytes: SIZE] [N bytes: DATA]
-        """
-        if not self.models_loaded:
-            raise RuntimeError("❌ Models belum di-load!")
+            print(f"⚠️ Kompilasi gagal, memakai model eager: {e}")
+            return model
         
+        # Cache opsional: models/ bisa read-only (container), model compiled tetap dipakai
         try:
-            with torch.no_grad():
-                # ===== NEW: Buat SIZE HEADER =====
-                data_size = len(encrypted_data)
-                size_header = struct.pack('>I', data_size)
-                payload = size_header + encrypted_data
-                
-                print(f"📝 Original data: {data_size} bytes")
-                print(f"📦 Payload (with header): {len(payload)} bytes")
-                
-                cover_tensor, original_size, actual_size = self.preprocess_image(
-                    cover_image_data, 
-                    target_size=max_resolution
-                )
-                
-                batch_size, channels, height, width = cover_tensor.shape
-                
-                print(f"📐 Original input: {original_size[0]}x{original_size[1]}")
-                print(f"🔧 Padded to: {width}x{height}")
-                print(f"📦 Payload size: {len(payload)} bytes")
-                print(f"💾 Capacity: {(width * height) // 8} bytes")
-                
-                secret_tensor, bit_length = self.preprocess_secret(
-                    payload,
-                    image_height=height,
-                    image_width=width
-                )
-                
-                stego_tensor = self.encoder(cover_tensor, secret_tensor)
-                
-                psnr = self.calculate_psnr(cover_tensor, stego_tensor)
-                mse = torch.mean((cover_tensor - stego_tensor) ** 2).item()
-                
-                stego_image_bytes = self.postprocess_image(stego_tensor)
-                
-                metrics = {
-                    'psnr': float(psnr),
-                    'mse': float(mse),
-                    'quality': 'Excellent' if psnr > 40 else 'Good' if psnr > 30 else 'Fair',
-                    'image_size': len(stego_image_bytes),
-                    'data_size': len(encrypted_data),
-                    'payload_size': len(payload),
-                    'resolution': f'{width}x{height}',
-                    'has_size_header': True,
-                }
-                
-                return stego_image_bytes, metrics
-        
+            torch.jit.save(compiled, artifact_path, _extra_files={'source_checksum': checksum})
+            print(f"✅ Compiled model disimpan: {artifact_path}")
         except Exception as e:
-            print(f"❌ Error saat embedding: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            raise RuntimeError(f"❌ Error: {str(e)}")
+            print(f"⚠️ Gagal menyimpan cache compiled model: {e}")
+        return compiled
     
-    def reveal_encrypted_data(self, stego_image_data: bytes) -> bytes:
-        """
-        Ekstrak data dengan membaca SIZE HEADER (FIX)
-        """
-        if not self.models_loaded:
-            raise RuntimeError("❌ Models belum di-load!")
-        
-        try:
-            with torch.no_grad():
-                stego_tensor, original_size, actual_size = self.preprocess_image(stego_image_data)
-                
-                batch_size, channels, height, width = stego_tensor.shape
-                
-                print(f"📐 Extracted from: {width}x{height}")
-                
-                secret_tensor = self.decoder(stego_tensor)
-                
-                full_bit_length = width * height
-                
-                full_extracted = self.postprocess_secret(
-                    secret_tensor.squeeze(), 
-                    full_bit_length
-                )
-                
-                print(f"📥 Full extraction: {len(full_extracted)} bytes")
-                
-                # ===== NEW: Baca SIZE HEADER =====
-                if len(full_extracted) < 4:
-                    print("⚠️ Data terlalu pendek!")
-                    return full_extracted
-                
-                size_bytes = full_extracted[0:4]
-                try:
-                    data_size = struct.unpack('>I', size_bytes)[0]
-                    print(f"📋 Size header: {data_size} bytes")
-                except:
-                    print("⚠️ Gagal membaca size header")
-                    return full_extracted
-                
-                if data_size < 1 or data_size > 1000000:
-                    print(f"⚠️ Size invalid: {data_size}")
-                    return full_extracted
-                
-                encrypted_data = full_extracted[4:4+data_size]
-                
-                if len(encrypted_data) != data_size:
-                    print(f"⚠️ Incomplete: expected {data_size}, got {len(encrypted_data)}")
-                else:
-                    print(f"✅ Extracted: {len(encrypted_data)} bytes (sesuai size header)")
-                
-                return encrypted_data
-        
-        except Exception as e:
-            print(f"❌ Error saat extraction: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            raise RuntimeError(f"❌ Error: {str(e)}")
-
-
-# ============================================================================
-# STREAMLIT FUNCTIONS
-# ============================================================================
-
-@st.cache_resource(show_spinner=False)
-def load_stego_models() -> Tuple[SteganographyEngine, bool]:
-    """Load dan cache model steganography"""
-    st.write("🔄 Loading steganography models...")
-    engine = SteganographyEngine()
-    success = engine.load_models()
-    return engine, success
-
-
-def hide_encrypted_data(cover_image_data: bytes, encrypted_data: bytes, max_resolution: int = None) -> Tuple[bytes, Dict]:
-    """Public function untuk sembunyikan data"""
-    if 'stego_engine' not in st.session_state:
-        raise RuntimeError("❌ Steganography engine tidak tersedia")
+    def _run_encoder(self, cover_tensor: torch.Tensor, secret_tensor: torch.Tensor) -> torch.Tensor:
+        return self.encoder(cover_tensor, secret_tensor)
     
-    engine = st.session_state.stego_engine
-    return engine.hide_encrypted_data(cover_image_data, encrypted_data, max_resolution=max_resolution)
-
-
-def reveal_encrypted_data(stego_image_data: bytes) -> bytes:
-    """Public function untuk ekstrak data"""
-    if 'stego_engine' not in st.session_state:
-        raise RuntimeError("❌ Steganography engine tidak tersedia")
+    def _run_decoder(self, stego_tensor: torch.Tensor) -> torch.Tensor:
+        return self.decoder(stego_tensor)
     
-    engine = st.session_state.stego_engine
-
-    return engine.reveal_encrypted_data(stego_image_data)
+    def _no_grad(self):
+        return torch.no_grad()
+    
+    def _from_numpy(self, array: np.ndarray) -> torch.Tensor:
+        return torch.from_numpy(array).to(self.device)
+    
+    def _to_numpy(self, tensor: torch.Tensor) -> np.ndarray:
+        return tensor.detach().cpu().numpy()
+    
+    def _concat(self, tensors: List[torch.Tensor]) -> torch.Tensor:
+        return torch.cat(tensors)
+    
+    def _empty_like(self, tensor: torch.Tensor, channels: int) -> torch.Tensor:
+        batch_size, _, height, width = tensor.shape
+        return torch.empty((batch_size, channels, height, width), dtype=tensor.dtype, device=tensor.device)
@@ -0,0 +1,153 @@
+"""
+test_aead_stream.py
+Incremental XoodyakEncryptor/XoodyakDecryptor against one-shot XoodyakAEAD
+for every registered backend, with fixed and random chunk splits
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from xoodyak_core import BACKENDS, KeyedContext, XoodyakAEAD, XoodyakDecryptor, XoodyakEncryptor
+
+
+KEY = bytes(range(16))
+NONCE = bytes(range(16, 32))
+AD = b'associated data'
+SIZES = [0, 1, 15, 16, 17, 31, 32, 33, 100, 257]
+RANDOM_SPLITS = 8
+
+
+@pytest.fixture(params=sorted(BACKENDS))
+def backend(request):
+    return request.param
+
+
+def chunks(data, sizes):
+    """Split data at the given chunk sizes (cycled), always at least one chunk"""
+    parts = []
+    offset = 0
+    index = 0
+    while offset < len(data):
+        size = sizes[index % len(sizes)]
+        parts.append(data[offset:offset + size])
+        offset += size
+        index += 1
+    return parts or [data]
+
+
+def random_sizes(rng, length):
+    """Random non-empty chunk sizes covering length bytes"""
+    sizes = []
+    while sum(sizes) < length:
+        sizes.append(rng.randrange(0, 40))
+    return [size for size in sizes if size] or [1]
+
+
+def stream_encrypt(parts, backend):
+    encryptor = XoodyakEncryptor(KEY, NONCE, AD, backend=backend)
+    ciphertext = b''.join(encryptor.update(part) for part in parts)
+    return ciphertext, encryptor.finalize()
+
+
+def stream_decrypt(parts, tag, backend):
+    decryptor = XoodyakDecryptor(KEY, NONCE, AD, backend=backend)
+    plaintext = b''.join(decryptor.update(part) for part in parts)
+    return plaintext, decryptor.finalize(tag)
+
+
+@pytest.mark.parametrize('split', [1, 7, 16, 33])
+def test_fixed_splits_match_one_shot(backend, split):
+    for size in SIZES:
+        plaintext = os.urandom(size)
+        expected_ciphertext, expected_tag = XoodyakAEAD(KEY, NONCE, AD, backend=backend).encrypt(plaintext)
+        
+        assert stream_encrypt(chunks(plaintext, [split]), backend) == (expected_ciphertext, expected_tag)
+        assert stream_decrypt(chunks(expected_ciphertext, [split]), expected_tag, backend) == (plaintext, True)
+
+
+def test_random_splits_match_one_shot(backend):
+    rng = random.Random(6)
+    for size in SIZES:
+        plaintext = bytes(rng.getrandbits(8) for _ in range(size))
+        expected_ciphertext, expected_tag = XoodyakAEAD(KEY, NONCE, AD, backend=backend).encrypt(plaintext)
+        
+        for _ in range(RANDOM_SPLITS):
+            parts = chunks(plaintext, random_sizes(rng, size))
+            assert stream_encrypt(parts, backend) == (expected_ciphertext, expected_tag)
+            
+            parts = chunks(expected_ciphertext, random_sizes(rng, size))
+            assert stream_decrypt(parts, expected_tag, backend) == (plaintext, True)
+
+
+def test_empty_updates_are_no_ops(backend):
+    plaintext = os.urandom(40)
+    expected = XoodyakAEAD(KEY, NONCE, AD, backend=backend).encrypt(plaintext)
+    assert stream_encrypt([b'', plaintext[:5], b'', plaintext[5:], b''], backend) == expected
+
+
+def test_update_into_in_place(backend):
+    plaintext = os.urandom(100)
+    expected_ciphertext, expected_tag = XoodyakAEAD(KEY, NONCE, AD, backend=backend).encrypt(plaintext)
+    
+    buffer = bytearray(plaintext)
+    encryptor = XoodyakEncryptor(KEY, NONCE, AD, backend=backend)
+    view = memoryview(buffer)
+    for start, end in ((0, 3), (3, 40), (40, 100)):
+        encryptor.update_into(view[start:end], view[start:end])
+    assert bytes(buffer) == expected_ciphertext
+    assert encryptor.finalize() == expected_tag
+    
+    decryptor = XoodyakDecryptor(KEY, NONCE, AD, backend=backend)
+    for start, end in ((0, 50), (50, 51), (51, 100)):
+        decryptor.update_into(view[start:end], view[start:end])
+    assert bytes(buffer) == plaintext
+    assert decryptor.finalize(expected_tag)
+
+
+def test_keyed_context_matches_key(backend):
+    plaintext = os.urandom(70)
+    context = KeyedContext(KEY, backend=backend)
+    encryptor = XoodyakEncryptor(context, NONCE, AD)
+    ciphertext = b''.join(encryptor.update(part) for part in chunks(plaintext, [5, 20]))
+    assert (ciphertext, encryptor.finalize()) == XoodyakAEAD(KEY, NONCE, AD, backend=backend).encrypt(plaintext)
+
+
+def test_tampering_detected(backend):
+    plaintext = os.urandom(50)
+    ciphertext, tag = XoodyakAEAD(KEY, NONCE, AD, backend=backend).encrypt(plaintext)
+    tampered = bytes([ciphertext[0] ^ 0x01]) + ciphertext[1:]
+    assert stream_decrypt(chunks(tampered, [7]), tag, backend)[1] is False
+    assert stream_decrypt(chunks(ciphertext, [7]), bytes(16), backend)[1] is False
+
+
+def test_finalized_stream_rejects_further_use():
+    encryptor = XoodyakEncryptor(KEY, NONCE, AD)
+    encryptor.update(b'data')
+    tag = encryptor.finalize()
+    with pytest.raises(ValueError):
+        encryptor.update(b'more')
+    with pytest.raises(ValueError):
+        encryptor.finalize()
+    
+    decryptor = XoodyakDecryptor(KEY, NONCE, AD)
+    decryptor.finalize(tag)
+    with pytest.raises(ValueError):
+        decryptor.update(b'more')
+    with pytest.raises(ValueError):
+        decryptor.finalize(tag)
+
+
+def test_stream_classes_do_not_expose_one_shot_api():
+    encryptor = XoodyakEncryptor(KEY, NONCE, AD)
+    decryptor = XoodyakDecryptor(KEY, NONCE, AD)
+    assert not isinstance(decryptor, XoodyakEncryptor)
+    assert not isinstance(encryptor, XoodyakAEAD)
+    assert not isinstance(decryptor, XoodyakAEAD)
+    for stream in (encryptor, decryptor):
+        for name in ('encrypt', 'decrypt', 'encrypt_into', 'decrypt_into', 'verify_only'):
+            assert not hasattr(stream, name)
@@ -0,0 +1,129 @@
+"""
+test_backends.py
+Conformance of every registered xoodyak_core backend against the reference
+Xoodoo permutation and ReferenceCyclist, and of the NumPy batch duplex
+(xoodyak_batch) against N scalar Cyclist runs, on random states and messages
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from xoodyak_core import BACKENDS, Cyclist, ReferenceCyclist, Xoodoo
+
+
+SAMPLES = 64
+LANES = 13
+
+
+@pytest.fixture(params=sorted(BACKENDS))
+def cyclist_class(request):
+    return BACKENDS[request.param]
+
+
+def test_permutation_matches_reference(cyclist_class):
+    rng = random.Random(0)
+    reference = Xoodoo()
+    for _ in range(SAMPLES):
+        state = [rng.getrandbits(32) for _ in range(12)]
+        expected = list(state)
+        reference.permute(expected)
+        
+        candidate = cyclist_class()
+        candidate.state = list(state)
+        candidate.xoodoo.permute(candidate.state)
+        assert candidate.state == expected
+
+
+def test_absorb_squeeze_matches_reference(cyclist_class):
+    rng = random.Random(1)
+    for _ in range(SAMPLES):
+        # Lengths around the 16-byte rate: empty, partial and multi-block messages
+        message = bytes(rng.getrandbits(8) for _ in range(rng.randrange(0, 80)))
+        squeeze_length = rng.randrange(0, 48)
+        
+        expected = ReferenceCyclist()
+        candidate = cyclist_class()
+        expected.absorb(message)
+        candidate.absorb(message)
+        assert candidate.squeeze(squeeze_length) == expected.squeeze(squeeze_length)
+        assert candidate.state == expected.state
+
+
+def test_permute_batch_matches_xoodoo():
+    np = pytest.importorskip('numpy')
+    from xoodyak_batch import permute_batch
+    
+    rng = random.Random(2)
+    rows = [[rng.getrandbits(32) for _ in range(12)] for _ in range(SAMPLES)]
+    states = np.array(rows, dtype=np.uint32)
+    permute_batch(states)
+    
+    reference = Xoodoo()
+    for row, permuted in zip(rows, states):
+        reference.permute(row)
+        assert [int(word) for word in permuted] == row
+
+
+def test_batch_cyclist_matches_scalar_cyclists():
+    np = pytest.importorskip('numpy')
+    from xoodyak_batch import BatchCyclist
+    
+    rng = random.Random(3)
+    for _ in range(SAMPLES // 4):
+        batch = BatchCyclist(LANES)
+        scalars = [Cyclist() for _ in range(LANES)]
+        
+        # Interleaved absorb/squeeze with lengths around the rate and both input forms
+        for step in range(6):
+            if step % 3 == 2:
+                length = rng.randrange(0, 48)
+                domain = rng.choice((0x01, 0x40))
+                squeezed = batch.squeeze(length, domain=domain)
+                assert squeezed.shape == (LANES, length)
+                for row, cyclist in zip(squeezed, scalars):
+                    assert row.tobytes() == cyclist.squeeze(length, domain=domain)
+            else:
+                length = rng.randrange(0, 80)
+                domain = rng.choice((0x03, 0x02, 0x80))
+                messages = [bytes(rng.getrandbits(8) for _ in range(length)) for _ in range(LANES)]
+                if step % 2:
+                    batch.absorb(np.frombuffer(b''.join(messages), dtype=np.uint8).reshape(LANES, length), domain=domain)
+                else:
+                    batch.absorb(messages, domain=domain)
+                for message, cyclist in zip(messages, scalars):
+                    cyclist.absorb(message, domain=domain)
+            
+            for index, cyclist in enumerate(scalars):
+                assert [int(word) for word in batch.state[index]] == cyclist.state
+                assert batch.cyclist(index).state == cyclist.state
+
+
+@pytest.mark.parametrize('dtype', ['uint16', 'int64', 'float32', 'bool'])
+def test_batch_cyclist_rejects_non_uint8_arrays(dtype):
+    np = pytest.importorskip('numpy')
+    from xoodyak_batch import BatchCyclist
+    
+    # 300 would silently become 44 if converted to uint8
+    batch = BatchCyclist(2)
+    data = np.full((2, 16), True if dtype == 'bool' else 300, dtype=dtype)
+    with pytest.raises(ValueError):
+        batch.absorb(data)
+    assert not batch.state.any()
+
+
+def test_batch_cyclist_rejects_mismatched_input():
+    np = pytest.importorskip('numpy')
+    from xoodyak_batch import BatchCyclist
+    
+    batch = BatchCyclist(3)
+    with pytest.raises(ValueError):
+        batch.absorb([b'a', b'b'])
+    with pytest.raises(ValueError):
+        batch.absorb([b'a', b'bb', b'c'])
+    with pytest.raises(ValueError):
+        batch.absorb(np.zeros((2, 16), dtype=np.uint8))
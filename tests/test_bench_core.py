@@ -0,0 +1,122 @@
+"""
+test_bench_core.py
+benchmarks/bench_core.py: pytest-benchmark timings when the plugin is installed,
+otherwise only the cheap smoke tests (JSON schema, --compare regression exit code)
+"""
+
+import copy
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_CORE = os.path.join(ROOT, 'benchmarks', 'bench_core.py')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from bench_core import KEY, NONCE, find_regressions
+from xoodyak_core import BACKENDS, XoodyakAEAD
+
+
+HAS_BENCHMARK = importlib.util.find_spec('pytest_benchmark') is not None
+requires_benchmark = pytest.mark.skipif(not HAS_BENCHMARK, reason='pytest-benchmark tidak terinstall')
+
+# Cheapest settings that still go through every benchmark once
+SMOKE_ARGS = ['--backend', 'python', '--sizes', '16', '256', '--seconds', '0.001']
+
+
+def run_bench(tmp_path, name, *args):
+    """Run bench_core.py as a script, return (exit code, parsed JSON output)"""
+    output = tmp_path / name
+    process = subprocess.run([sys.executable, BENCH_CORE, *SMOKE_ARGS, '--output', str(output), *args],
+                             capture_output=True, text=True)
+    assert output.exists(), process.stderr
+    return process.returncode, json.loads(output.read_text())
+
+
+def check_schema(results):
+    """Assert the layout documented in bench_core.run_suite"""
+    assert set(results['meta']) >= {'python', 'implementation', 'machine', 'timestamp', 'seconds'}
+    assert list(results['backends']) == ['python']
+    
+    entry = results['backends']['python']
+    for key in ('permutations_per_sec', 'absorb_bytes_per_sec', 'squeeze_bytes_per_sec'):
+        assert isinstance(entry[key], float) and entry[key] > 0
+    
+    assert [measurement['size'] for measurement in entry['aead']] == [16, 256]
+    for measurement in entry['aead']:
+        assert measurement['encrypt_bytes_per_sec'] > 0
+        assert measurement['decrypt_bytes_per_sec'] > 0
+        assert set(measurement['encrypt_allocations']) == {'blocks', 'peak_bytes'}
+
+
+def test_output_schema(tmp_path):
+    exit_code, results = run_bench(tmp_path, 'results.json')
+    assert exit_code == 0
+    check_schema(results)
+    assert 'regressions' not in results
+
+
+def test_compare_without_regression(tmp_path):
+    _, baseline = run_bench(tmp_path, 'baseline.json')
+    
+    # Threshold 1.0: only a drop to zero throughput counts as a regression
+    exit_code, results = run_bench(tmp_path, 'current.json', '--compare', str(tmp_path / 'baseline.json'),
+                                   '--threshold', '1.0')
+    assert exit_code == 0
+    check_schema(results)
+    assert results['regressions'] == []
+
+
+def test_compare_reports_regression(tmp_path):
+    _, results = run_bench(tmp_path, 'results.json')
+    
+    # Baseline 10x faster than anything measured: every throughput regressed
+    baseline = copy.deepcopy(results)
+    entry = baseline['backends']['python']
+    for key in ('permutations_per_sec', 'absorb_bytes_per_sec', 'squeeze_bytes_per_sec'):
+        entry[key] *= 10
+    for measurement in entry['aead']:
+        measurement['encrypt_bytes_per_sec'] *= 10
+    (tmp_path / 'baseline.json').write_text(json.dumps(baseline))
+    
+    exit_code, results = run_bench(tmp_path, 'current.json', '--compare', str(tmp_path / 'baseline.json'))
+    assert exit_code == 1
+    metrics = {regression['metric'] for regression in results['regressions']}
+    assert 'python.permutations_per_sec' in metrics
+    assert 'python.aead[256].encrypt_bytes_per_sec' in metrics
+    assert 'python.aead[256].decrypt_bytes_per_sec' not in metrics
+
+
+def test_find_regressions_threshold():
+    baseline = {'backends': {'python': {'permutations_per_sec': 100.0, 'aead': [{'size': 16, 'encrypt_bytes_per_sec': 100.0}]}}}
+    current = copy.deepcopy(baseline)
+    current['backends']['python']['permutations_per_sec'] = 85.0
+    current['backends']['python']['aead'][0]['encrypt_bytes_per_sec'] = 75.0
+    
+    regressions = find_regressions(baseline, current, 0.2)
+    assert [regression['metric'] for regression in regressions] == ['python.aead[16].encrypt_bytes_per_sec']
+    assert regressions[0]['change'] == pytest.approx(-0.25)
+
+
+@requires_benchmark
+@pytest.mark.parametrize('backend', sorted(BACKENDS))
+def test_benchmark_permutation(backend, request):
+    benchmark = request.getfixturevalue('benchmark')
+    xoodoo = BACKENDS[backend]().xoodoo
+    state = list(range(12))
+    benchmark(xoodoo.permute, state)
+
+
+@requires_benchmark
+@pytest.mark.parametrize('size', [16, 4 * 1024, 64 * 1024])
+@pytest.mark.parametrize('backend', sorted(BACKENDS))
+def test_benchmark_encrypt(backend, size, request):
+    benchmark = request.getfixturevalue('benchmark')
+    plaintext = os.urandom(size)
+    ciphertext, tag = benchmark(lambda: XoodyakAEAD(KEY, NONCE, backend=backend).encrypt(plaintext))
+    assert XoodyakAEAD(KEY, NONCE, backend=backend).decrypt(ciphertext, tag) == (plaintext, True)
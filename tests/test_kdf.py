@@ -0,0 +1,175 @@
+"""
+test_kdf.py
+KDF descriptor in package headers (version 3/4): encode/decode round-trip,
+bounds checks on untrusted parameters, and decryption of legacy version 1/2
+packages keyed with LEGACY_KDF
+"""
+
+import hashlib
+import io
+import os
+import struct
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import xoodyak_utils as utils
+from xoodyak_core import KeyedContext, XoodyakAEAD
+
+
+PASSWORD = 'correct horse battery staple'
+SALT = bytes(range(16))
+PBKDF2 = utils.KDF_ALGORITHMS['pbkdf2-sha256']
+SCRYPT = utils.KDF_ALGORITHMS['scrypt']
+
+
+def descriptor(algorithm_id, param1, param2=0, param3=0, salt=SALT):
+    return utils.KDF_DESCRIPTOR_FORMAT.pack(algorithm_id, param1, param2, param3, salt)
+
+
+@pytest.mark.parametrize('profile', sorted(utils.KDF_PROFILES))
+def test_descriptor_round_trip(profile):
+    kdf = utils.new_kdf(profile)
+    encoded = utils.encode_kdf_descriptor(kdf)
+    assert len(encoded) == utils.KDF_DESCRIPTOR_SIZE
+    assert utils.decode_kdf_descriptor(encoded) == kdf
+
+
+def test_descriptor_round_trip_at_bounds():
+    for kdf in (
+        {'algorithm': 'pbkdf2-sha256', 'iterations': 1, 'salt': SALT},
+        {'algorithm': 'pbkdf2-sha256', 'iterations': utils.KDF_MAX_PBKDF2_ITERATIONS, 'salt': SALT},
+        {'algorithm': 'scrypt', 'n': 2, 'r': 1, 'p': 1, 'salt': SALT},
+        {'algorithm': 'scrypt', 'n': 2 ** 18, 'r': 8, 'p': 1, 'salt': SALT},  # 256 MiB
+    ):
+        assert utils.decode_kdf_descriptor(utils.encode_kdf_descriptor(kdf)) == kdf
+
+
+def test_new_kdf_uses_random_salt():
+    assert utils.new_kdf()['salt'] != utils.new_kdf()['salt']
+    with pytest.raises(ValueError):
+        utils.new_kdf('no-such-profile')
+
+
+@pytest.mark.parametrize('data', [
+    descriptor(PBKDF2, 0),
+    descriptor(PBKDF2, utils.KDF_MAX_PBKDF2_ITERATIONS + 1),
+    descriptor(SCRYPT, 0, 8, 1),
+    descriptor(SCRYPT, 1, 8, 1),
+    descriptor(SCRYPT, 3 * 2 ** 10, 8, 1),    # n not a power of 2
+    descriptor(SCRYPT, 2 ** 14, 0, 1),
+    descriptor(SCRYPT, 2 ** 14, 8, 0),
+    descriptor(SCRYPT, 2 ** 19, 8, 1),        # 512 MiB > KDF_MAX_SCRYPT_MEMORY
+    descriptor(SCRYPT, 2 ** 14, 8, 2 ** 15),  # memory bound via p
+    descriptor(0x00, 100000),
+    descriptor(0x7F, 100000),
+], ids=['pbkdf2-zero', 'pbkdf2-too-many', 'scrypt-n0', 'scrypt-n1', 'scrypt-n-not-pow2', 'scrypt-r0',
+        'scrypt-p0', 'scrypt-n-memory', 'scrypt-p-memory', 'alg-0', 'alg-unknown'])
+def test_out_of_range_descriptor_rejected(data):
+    with pytest.raises(ValueError):
+        utils.decode_kdf_descriptor(data)
+
+
+@pytest.mark.parametrize('length', [0, utils.KDF_DESCRIPTOR_SIZE - 1, utils.KDF_DESCRIPTOR_SIZE + 1])
+def test_descriptor_length_rejected(length):
+    with pytest.raises(ValueError):
+        utils.decode_kdf_descriptor(bytes(length))
+
+
+def test_encode_unknown_algorithm_rejected():
+    with pytest.raises(ValueError):
+        utils.encode_kdf_descriptor({'algorithm': 'argon2id', 'salt': SALT})
+
+
+@pytest.mark.parametrize('version', [utils.PACKAGE_VERSION_KDF, utils.PACKAGE_VERSION_STREAM_KDF])
+def test_package_with_bad_descriptor_rejected_before_kdf(version):
+    # Header validation fails in check_package, before derive_key runs
+    bad = descriptor(PBKDF2, utils.KDF_MAX_PBKDF2_ITERATIONS + 1)
+    package = version + bad + os.urandom(16) + struct.pack('>I', 64) + os.urandom(64)
+    with pytest.raises(ValueError):
+        utils.check_package(package)
+    with pytest.raises(ValueError):
+        utils.decrypt_file(package, PASSWORD)
+    with pytest.raises(ValueError):
+        utils.decrypt_stream(io.BytesIO(package), io.BytesIO(), PASSWORD)
+
+
+def test_derive_key_follows_descriptor():
+    kdf = {'algorithm': 'pbkdf2-sha256', 'iterations': 1000, 'salt': SALT}
+    expected = hashlib.pbkdf2_hmac('sha256', PASSWORD.encode('utf-8'), SALT, 1000)[:16]
+    assert utils.derive_key(PASSWORD, kdf) == expected
+    assert utils.derive_key(f"  {PASSWORD}\n", kdf) == expected
+    assert utils.derive_key(PASSWORD, dict(kdf, salt=bytes(16))) != expected
+    assert utils.derive_key(PASSWORD, dict(kdf, iterations=1001)) != expected
+    
+    scrypt = {'algorithm': 'scrypt', 'n': 2 ** 10, 'r': 8, 'p': 1, 'salt': SALT}
+    expected = hashlib.scrypt(PASSWORD.encode('utf-8'), salt=SALT, n=2 ** 10, r=8, p=1, dklen=16)
+    assert utils.derive_key(PASSWORD, scrypt) == expected
+
+
+def test_legacy_kdf_is_unchanged():
+    # Old version 1/2 packages are keyed with PBKDF2-SHA256, 100000 iterations, constant salt
+    expected = hashlib.pbkdf2_hmac('sha256', PASSWORD.encode('utf-8'), b'xoodyak_salt_key', 100000)[:16]
+    assert utils.derive_key(PASSWORD) == expected
+    assert utils.derive_key(PASSWORD, utils.LEGACY_KDF) == expected
+
+
+@pytest.mark.parametrize('profile', sorted(utils.KDF_PROFILES))
+def test_version_3_package_carries_profile(profile):
+    data = os.urandom(100)
+    package = utils.encrypt_file(data, PASSWORD, kdf_profile=profile)
+    assert package[0:1] == utils.PACKAGE_VERSION_KDF
+    
+    kdf = utils.parse_package(package)['kdf']
+    assert {key: value for key, value in kdf.items() if key != 'salt'} == utils.KDF_PROFILES[profile]
+    assert utils.decrypt_file(package, PASSWORD)[0] == data
+
+
+def legacy_v1_package(data):
+    """Version 1 package exactly as the original encrypt_file built it"""
+    key = utils.derive_key(PASSWORD, utils.LEGACY_KDF)
+    nonce = os.urandom(16)
+    ciphertext, tag = XoodyakAEAD(key, nonce, b'').encrypt(data)
+    return utils.PACKAGE_VERSION_1 + nonce + tag + ciphertext
+
+
+def legacy_v2_package(data, chunk_size=64):
+    """Version 2 chunked package (no KDF descriptor) keyed with LEGACY_KDF"""
+    context = KeyedContext(utils.derive_key(PASSWORD, utils.LEGACY_KDF))
+    nonce = os.urandom(16)
+    chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)] or [b'']
+    records = []
+    for index, chunk in enumerate(chunks):
+        ciphertext, tag = utils._chunk_aead(context, nonce, index, index == len(chunks) - 1).encrypt(chunk)
+        records.append(ciphertext + tag)
+    return utils.PACKAGE_VERSION_STREAM + nonce + struct.pack('>I', chunk_size) + b''.join(records)
+
+
+@pytest.mark.parametrize('build', [legacy_v1_package, legacy_v2_package], ids=['v1', 'v2'])
+def test_legacy_package_still_decrypts(build, tmp_path):
+    data = os.urandom(150)
+    package = build(data)
+    
+    plaintext, info, is_verified = utils.decrypt_file(package, PASSWORD)
+    assert plaintext == data and is_verified
+    
+    output = io.BytesIO()
+    utils.decrypt_stream(io.BytesIO(package), output, PASSWORD)
+    assert output.getvalue() == data
+    
+    assert utils.verify_package(package, PASSWORD)
+    assert not utils.verify_package(package, 'wrong password')
+    with pytest.raises(ValueError):
+        utils.decrypt_file(package, 'wrong password')
+    
+    source, target = tmp_path / 'package', tmp_path / 'plain'
+    source.write_bytes(package)
+    utils.decrypt_path(str(source), str(target), PASSWORD)
+    assert target.read_bytes() == data
+
+
+def test_legacy_v1_info_reports_legacy_kdf():
+    _, info, _ = utils.decrypt_file(legacy_v1_package(b'legacy'), PASSWORD)
+    assert info['kdf'] == utils.LEGACY_KDF['algorithm']
@@ -0,0 +1,150 @@
+"""
+test_stream.py
+Chunked package (version 2/4) from xoodyak_utils.encrypt_stream: round-trip at
+chunk boundaries and rejection of truncated, reordered, dropped or re-flagged chunks
+"""
+
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import xoodyak_utils as utils
+from xoodyak_core import KeyedContext
+
+
+PASSWORD = 'correct horse battery staple'
+CHUNK = 64
+RECORD = CHUNK + utils.TAG_SIZE
+KDF_PROFILE = 'bulk'  # cheapest KDF: every decryption runs derive_key
+
+
+def encrypt(data, chunk_size=CHUNK):
+    dst = io.BytesIO()
+    written = utils.encrypt_stream(io.BytesIO(data), dst, PASSWORD, chunk_size=chunk_size, kdf_profile=KDF_PROFILE)
+    assert written == len(dst.getvalue())
+    return dst.getvalue()
+
+
+def split(package):
+    """(header, [CIPHERTEXT_CHUNK + TAG, ...]) of a version 4 package"""
+    header = package[:utils.STREAM_KDF_HEADER_SIZE]
+    body = package[utils.STREAM_KDF_HEADER_SIZE:]
+    return header, [body[i:i + RECORD] for i in range(0, len(body), RECORD)]
+
+
+def forge(data, flags):
+    """Version 4 package with the given is_last flag per chunk (sealed with the right key)"""
+    kdf = utils.new_kdf(KDF_PROFILE)
+    context = KeyedContext(utils.derive_key(PASSWORD, kdf))
+    nonce = os.urandom(16)
+    chunks = [data[i:i + CHUNK] for i in range(0, len(data), CHUNK)] or [b'']
+    assert len(chunks) == len(flags)
+    
+    records = []
+    for index, (chunk, is_last) in enumerate(zip(chunks, flags)):
+        ciphertext, tag = utils._chunk_aead(context, nonce, index, is_last).encrypt(chunk)
+        records.append(ciphertext + tag)
+    return utils._stream_header(kdf, nonce, CHUNK) + b''.join(records)
+
+
+def decrypt(package):
+    dst = io.BytesIO()
+    info = utils.decrypt_stream(io.BytesIO(package), dst, PASSWORD)
+    return dst.getvalue(), info
+
+
+def assert_rejected(package):
+    with pytest.raises(ValueError):
+        decrypt(package)
+    with pytest.raises(ValueError):
+        utils.decrypt_file(package, PASSWORD)
+    try:
+        assert not utils.verify_package(package, PASSWORD)
+    except ValueError:
+        pass
+
+
+@pytest.mark.parametrize('size', [0, 1, CHUNK - 1, CHUNK, CHUNK + 1, 3 * CHUNK, 3 * CHUNK + 5])
+def test_round_trip_at_chunk_boundaries(size):
+    data = os.urandom(size)
+    package = encrypt(data)
+    chunk_count = max(1, -(-size // CHUNK))
+    
+    assert package[0:1] == utils.PACKAGE_VERSION_STREAM_KDF
+    assert len(package) == utils.STREAM_KDF_HEADER_SIZE + size + chunk_count * utils.TAG_SIZE
+    
+    plaintext, info = decrypt(package)
+    assert plaintext == data
+    assert info['file_size'] == size
+    assert info['chunk_count'] == chunk_count
+    assert info['chunk_size'] == CHUNK
+    
+    assert utils.decrypt_file(package, PASSWORD)[0] == data
+    assert utils.verify_package(package, PASSWORD)
+
+
+def test_wrong_password_rejected():
+    package = encrypt(os.urandom(2 * CHUNK))
+    with pytest.raises(ValueError):
+        utils.decrypt_stream(io.BytesIO(package), io.BytesIO(), 'wrong password')
+    assert not utils.verify_package(package, 'wrong password')
+
+
+@pytest.mark.parametrize('cut', [1, utils.TAG_SIZE, utils.TAG_SIZE + 1, RECORD - 1])
+def test_truncated_package_rejected(cut):
+    package = encrypt(os.urandom(3 * CHUNK))
+    assert_rejected(package[:-cut])
+
+
+def test_truncated_header_rejected():
+    package = encrypt(os.urandom(CHUNK))
+    assert_rejected(package[:utils.STREAM_KDF_HEADER_SIZE - 1])
+    assert_rejected(package[:utils.STREAM_KDF_HEADER_SIZE])
+
+
+def test_reordered_chunks_rejected():
+    header, records = split(encrypt(os.urandom(3 * CHUNK + 5)))
+    assert_rejected(header + records[1] + records[0] + records[2] + records[3])
+    assert_rejected(header + records[0] + records[2] + records[1] + records[3])
+
+
+@pytest.mark.parametrize('dropped', [0, 1, 3])
+def test_dropped_chunk_rejected(dropped):
+    header, records = split(encrypt(os.urandom(3 * CHUNK + 5)))
+    del records[dropped]
+    assert_rejected(header + b''.join(records))
+
+
+def test_dropped_final_chunk_at_boundary_rejected():
+    # Package ends exactly on a record boundary, but only chunk 2 carries the final flag
+    header, records = split(encrypt(os.urandom(2 * CHUNK + 1)))
+    assert_rejected(header + records[0] + records[1])
+
+
+def test_forged_package_with_correct_flags_accepted():
+    data = os.urandom(2 * CHUNK + 1)
+    assert decrypt(forge(data, [False, False, True]))[0] == data
+
+
+def test_final_chunk_flag_cleared_rejected():
+    assert_rejected(forge(os.urandom(2 * CHUNK + 1), [False, False, False]))
+    assert_rejected(forge(b'', [False]))
+
+
+def test_final_chunk_flag_set_early_rejected():
+    assert_rejected(forge(os.urandom(2 * CHUNK + 1), [True, False, True]))
+
+
+def test_chunk_nonce_and_ad_are_unique_per_chunk():
+    nonce = os.urandom(16)
+    nonces = {utils._chunk_nonce(nonce, index) for index in range(1000)}
+    assert len(nonces) == 1000
+    assert utils._chunk_nonce(nonce, 0) == nonce
+    assert all(len(chunk_nonce) == 16 for chunk_nonce in nonces)
+    
+    assert utils._chunk_ad(5, False) != utils._chunk_ad(5, True)
+    assert utils._chunk_ad(5, True) != utils._chunk_ad(6, True)
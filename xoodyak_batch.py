@@ -0,0 +1,155 @@
+"""
+xoodyak_batch.py
+NumPy-vectorized Xoodoo[12] permutation and Cyclist duplex over N independent states
+Contains: permute_batch, BatchCyclist
+"""
+
+import numpy as np
+
+from xoodyak_core import Xoodoo, Cyclist
+
+
+_RC = np.array(Xoodoo.RC, dtype=np.uint32)
+
+
+def _rotl(x, n):
+    """Rotate left every 32-bit lane of a uint32 array"""
+    return (x << np.uint32(n)) | (x >> np.uint32(32 - n))
+
+
+def permute_batch(states):
+    """
+    Apply Xoodoo[12] to every row of an (N, 12) uint32 array
+
+    The rows are permuted in place (like Xoodoo.permute on a list) and the
+    array is also returned for convenience.
+
+    Args:
+        states: (N, 12) numpy array of dtype uint32
+
+    Returns:
+        The same array, permuted
+    """
+    if states.dtype != np.uint32 or states.ndim != 2 or states.shape[1] != 12:
+        raise ValueError("states harus berupa array uint32 dengan shape (N, 12)")
+
+    a0 = states[:, 0:4].copy()
+    a1 = states[:, 4:8].copy()
+    a2 = states[:, 8:12].copy()
+
+    for rc in _RC:
+        # Theta: E[x] = P[x-1] <<< 5 ^ P[x-1] <<< 14
+        p = np.roll(a0 ^ a1 ^ a2, 1, axis=1)
+        e = _rotl(p, 5) ^ _rotl(p, 14)
+
+        # Rho-west (fused with theta)
+        a0 ^= e
+        a1 = np.roll(a1 ^ e, 1, axis=1)
+        a2 = _rotl(a2 ^ e, 11)
+
+        # Iota
+        a0[:, 0] ^= rc
+
+        # Chi (same non-linear layer as Xoodoo.chi)
+        b0 = a1 & a2
+        b1 = a2 & a0
+        b2 = a0 & a1
+        a0 ^= b0
+        a1 ^= b1
+        a2 ^= b2
+
+        # Rho-east
+        a1 = _rotl(a1, 1)
+        a2 = _rotl(np.roll(a2, 2, axis=1), 8)
+
+    states[:, 0:4] = a0
+    states[:, 4:8] = a1
+    states[:, 8:12] = a2
+    return states
+
+
+class BatchCyclist:
+    """Cyclist mode over N independent states - same absorb/squeeze semantics as Cyclist"""
+
+    R = Cyclist.R
+    C = Cyclist.C
+
+    def __init__(self, n):
+        self.n = n
+        self.state = np.zeros((n, 12), dtype=np.uint32)
+
+    def _as_matrix(self, data):
+        """Convert N equal-length byte strings (or an (N, L) array) to an (N, L) uint8 array"""
+        if isinstance(data, np.ndarray):
+            # Tanpa konversi: astype ke uint8 akan memotong nilai > 255 tanpa error
+            if data.dtype != np.uint8:
+                raise ValueError(f"Data batch harus berupa array uint8, bukan {data.dtype}")
+            matrix = data
+        else:
+            rows = [bytes(row) for row in data]
+            if len(rows) != self.n:
+                raise ValueError(f"Jumlah data ({len(rows)}) tidak sama dengan jumlah state ({self.n})")
+            length = len(rows[0]) if rows else 0
+            if any(len(row) != length for row in rows):
+                raise ValueError("Semua data dalam batch harus memiliki panjang yang sama")
+            matrix = np.frombuffer(b''.join(rows), dtype=np.uint8).reshape(self.n, length)
+
+        if matrix.ndim != 2 or matrix.shape[0] != self.n:
+            raise ValueError(f"Data batch harus ber-shape ({self.n}, L)")
+        return matrix
+
+    def absorb(self, data, domain=0x03):
+        """Absorb one equal-length message per state"""
+        matrix = self._as_matrix(data)
+        length = matrix.shape[1]
+        domain_word = np.uint32(domain << 24)
+
+        if length == 0:
+            self.state[:, 3] ^= domain_word
+            permute_batch(self.state)
+            return
+
+        block = np.zeros((self.n, self.R), dtype=np.uint8)
+        for i in range(0, length, self.R):
+            block_size = min(self.R, length - i)
+            block[:] = 0
+            block[:, :block_size] = matrix[:, i:i + block_size]
+
+            # Padding for a partial final block
+            if block_size < self.R:
+                block[:, block_size] = 0x01
+
+            # XOR block into state (4 little-endian words per row)
+            self.state[:, :4] ^= block.view('<u4').astype(np.uint32)
+            self.state[:, 3] ^= domain_word
+
+            permute_batch(self.state)
+
+    def squeeze(self, length, domain=0x01):
+        """
+        Squeeze length bytes from every state
+
+        Returns:
+            (N, length) uint8 array, one row per state
+        """
+        output = np.empty((self.n, length), dtype=np.uint8)
+        domain_word = np.uint32(domain << 24)
+
+        offset = 0
+        while offset < length:
+            rate_bytes = self.state[:, :4].astype('<u4').view(np.uint8)
+            take = min(self.R, length - offset)
+            output[:, offset:offset + take] = rate_bytes[:, :take]
+            offset += take
+
+            if offset < length:
+                self.state[:, 3] ^= domain_word
+                permute_batch(self.state)
+
+        return output
+
+    def cyclist(self, index):
+        """Return a scalar Cyclist carrying a copy of one row's state"""
+        single = Cyclist()
+        single.state = [int(word) for word in self.state[index]]
+        return single
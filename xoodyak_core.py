@@ -1,9 +1,20 @@
 """
 xoodyak_core.py
 Core implementation of Xoodyak AEAD (NIST Lightweight Cryptography)
-Contains: Xoodoo[12] Permutation, Cyclist Mode, XoodyakAEAD
+Contains: Xoodoo[12] Permutation (reference + fused + plane-per-int), Cyclist Mode, XoodyakAEAD,
+          incremental XoodyakEncryptor / XoodyakDecryptor, KeyedContext,
+          XoodyakHash (unkeyed hash mode),
+          backend registry (python / reference / plane / optional native C extension)
 """
 
+import hmac
+import struct
+
+try:
+    import _xoodyak_native
+except ImportError:
+    _xoodyak_native = None
+
 class Xoodoo:
     """Xoodoo[12] permutation - 384-bit state"""
     
@@ -117,18 +128,221 @@ class Xoodoo:
             self.rho_east(state)
 
 
+class FastXoodoo(Xoodoo):
+    """Xoodoo[12] permutation - fused rounds on local lanes (bit-exact with Xoodoo)"""
+    
+    def permute(self, state):
+        """Execute full Xoodoo[12] permutation with all steps inlined"""
+        M = 0xFFFFFFFF
+        a0, a1, a2, a3, a4, a5, a6, a7, a8, a9, a10, a11 = state
+        
+        for rc in self.RC:
+            # Theta: E[x] = P[x-1] <<< 5 ^ P[x-1] <<< 14
+            p0 = a0 ^ a4 ^ a8
+            p1 = a1 ^ a5 ^ a9
+            p2 = a2 ^ a6 ^ a10
+            p3 = a3 ^ a7 ^ a11
+            e0 = (((p3 << 5) | (p3 >> 27)) ^ ((p3 << 14) | (p3 >> 18))) & M
+            e1 = (((p0 << 5) | (p0 >> 27)) ^ ((p0 << 14) | (p0 >> 18))) & M
+            e2 = (((p1 << 5) | (p1 >> 27)) ^ ((p1 << 14) | (p1 >> 18))) & M
+            e3 = (((p2 << 5) | (p2 >> 27)) ^ ((p2 << 14) | (p2 >> 18))) & M
+            a0 ^= e0
+            a1 ^= e1
+            a2 ^= e2
+            a3 ^= e3
+            
+            # Rho-west (fused with theta): A1 shifted by one lane, A2 rotated by 11
+            a4, a5, a6, a7 = a7 ^ e3, a4 ^ e0, a5 ^ e1, a6 ^ e2
+            a8 ^= e0
+            a9 ^= e1
+            a10 ^= e2
+            a11 ^= e3
+            a8 = ((a8 << 11) | (a8 >> 21)) & M
+            a9 = ((a9 << 11) | (a9 >> 21)) & M
+            a10 = ((a10 << 11) | (a10 >> 21)) & M
+            a11 = ((a11 << 11) | (a11 >> 21)) & M
+            
+            # Iota
+            a0 ^= rc
+            
+            # Chi (same non-linear layer as Xoodoo.chi)
+            a0, a4, a8 = a0 ^ (a4 & a8), a4 ^ (a8 & a0), a8 ^ (a0 & a4)
+            a1, a5, a9 = a1 ^ (a5 & a9), a5 ^ (a9 & a1), a9 ^ (a1 & a5)
+            a2, a6, a10 = a2 ^ (a6 & a10), a6 ^ (a10 & a2), a10 ^ (a2 & a6)
+            a3, a7, a11 = a3 ^ (a7 & a11), a7 ^ (a11 & a3), a11 ^ (a3 & a7)
+            
+            # Rho-east: A1 rotated by 1, A2 shifted by two lanes and rotated by 8
+            a4 = ((a4 << 1) | (a4 >> 31)) & M
+            a5 = ((a5 << 1) | (a5 >> 31)) & M
+            a6 = ((a6 << 1) | (a6 >> 31)) & M
+            a7 = ((a7 << 1) | (a7 >> 31)) & M
+            a8, a9, a10, a11 = (
+                ((a10 << 8) | (a10 >> 24)) & M,
+                ((a11 << 8) | (a11 >> 24)) & M,
+                ((a8 << 8) | (a8 >> 24)) & M,
+                ((a9 << 8) | (a9 >> 24)) & M,
+            )
+        
+        state[:] = (a0, a1, a2, a3, a4, a5, a6, a7, a8, a9, a10, a11)
+
+
+def _lane_masks(n):
+    """Masks selecting bits [n, 32) and [0, n) of every 32-bit lane in a 128-bit plane"""
+    high = ((0xFFFFFFFF << n) & 0xFFFFFFFF) * 0x00000001000000010000000100000001
+    low = ((1 << n) - 1) * 0x00000001000000010000000100000001
+    return high, low
+
+
+class PlaneXoodoo(Xoodoo):
+    """
+    Xoodoo[12] permutation - one 128-bit int per plane (bit-exact with Xoodoo)
+    
+    Lane x of a plane sits at bits [32x, 32x + 32). Theta, chi and the plane
+    shifts are a few big-int operations per plane; lane rotations use masks
+    so bits never cross lane boundaries.
+    """
+    
+    PLANE = (1 << 128) - 1
+    ROTATE_MASKS = {n: _lane_masks(n) for n in (1, 5, 8, 11, 14)}
+    
+    def permute(self, state):
+        """Execute full Xoodoo[12] permutation on three plane integers"""
+        F = self.PLANE
+        h1, l1 = self.ROTATE_MASKS[1]
+        h5, l5 = self.ROTATE_MASKS[5]
+        h8, l8 = self.ROTATE_MASKS[8]
+        h11, l11 = self.ROTATE_MASKS[11]
+        h14, l14 = self.ROTATE_MASKS[14]
+        
+        A0 = state[0] | (state[1] << 32) | (state[2] << 64) | (state[3] << 96)
+        A1 = state[4] | (state[5] << 32) | (state[6] << 64) | (state[7] << 96)
+        A2 = state[8] | (state[9] << 32) | (state[10] << 64) | (state[11] << 96)
+        
+        for rc in self.RC:
+            # Theta: P shifted by one lane, E = P <<< 5 ^ P <<< 14 per lane
+            P = A0 ^ A1 ^ A2
+            P = ((P << 32) | (P >> 96)) & F
+            E = (((P << 5) & h5) | ((P >> 27) & l5)) ^ (((P << 14) & h14) | ((P >> 18) & l14))
+            A0 ^= E
+            
+            # Rho-west: A1 shifted by one lane, A2 rotated by 11
+            A1 ^= E
+            A1 = ((A1 << 32) | (A1 >> 96)) & F
+            A2 ^= E
+            A2 = ((A2 << 11) & h11) | ((A2 >> 21) & l11)
+            
+            # Iota
+            A0 ^= rc
+            
+            # Chi (same non-linear layer as Xoodoo.chi)
+            A0, A1, A2 = A0 ^ (A1 & A2), A1 ^ (A2 & A0), A2 ^ (A0 & A1)
+            
+            # Rho-east: A1 rotated by 1, A2 shifted by two lanes and rotated by 8
+            A1 = ((A1 << 1) & h1) | ((A1 >> 31) & l1)
+            A2 = ((A2 << 64) | (A2 >> 64)) & F
+            A2 = ((A2 << 8) & h8) | ((A2 >> 24) & l8)
+        
+        M = 0xFFFFFFFF
+        state[:] = (
+            A0 & M, (A0 >> 32) & M, (A0 >> 64) & M, A0 >> 96,
+            A1 & M, (A1 >> 32) & M, (A1 >> 64) & M, A1 >> 96,
+            A2 & M, (A2 >> 32) & M, (A2 >> 64) & M, A2 >> 96,
+        )
+
+
+_RATE_WORDS = struct.Struct('<4I')  # one 16-byte rate block as 4 little-endian words
+
+
+def _as_byte_view(data):
+    """Return a flat byte memoryview over bytes/bytearray/memoryview data (no copy)"""
+    # A byte memoryview is used as is, so releasing it in the caller also releases this view
+    view = data if isinstance(data, memoryview) else memoryview(data)
+    if view.ndim != 1 or view.format != 'B':
+        view = view.cast('B')
+    return view
+
+
 class Cyclist:
     """Cyclist mode - Xoodyak duplex construction"""
     
     R = 16  # Rate (bytes)
     C = 32  # Capacity (bytes)
+    PERMUTATION = FastXoodoo
     
     def __init__(self):
-        self.xoodoo = Xoodoo()
+        self.xoodoo = self.PERMUTATION()
         self.state = [0] * 12  # 12 words of 32-bit = 384 bits
     
+    def absorb(self, data, domain=0x03):
+        """Absorb data into the state"""
+        state = self.state
+        permute = self.xoodoo.permute
+        domain_word = domain << 24
+        
+        view = _as_byte_view(data)
+        length = len(view)
+        if length == 0:
+            state[3] ^= domain_word
+            permute(state)
+            return
+        
+        # Full rate blocks: unpack four little-endian words straight from the input
+        full = length - length % self.R
+        unpack_from = _RATE_WORDS.unpack_from
+        for i in range(0, full, self.R):
+            w0, w1, w2, w3 = unpack_from(view, i)
+            state[0] ^= w0
+            state[1] ^= w1
+            state[2] ^= w2
+            state[3] ^= w3 ^ domain_word
+            permute(state)
+        
+        # Partial last block with padding and domain separation
+        if full < length:
+            block = bytearray(self.R)
+            block[:length - full] = view[full:]
+            block[length - full] = 0x01
+            w0, w1, w2, w3 = _RATE_WORDS.unpack(block)
+            state[0] ^= w0
+            state[1] ^= w1
+            state[2] ^= w2
+            state[3] ^= w3 ^ domain_word
+            permute(state)
+    
+    def squeeze_into(self, buffer, domain=0x01):
+        """Squeeze len(buffer) bytes directly into a writable buffer"""
+        state = self.state
+        out = _as_byte_view(buffer)
+        length = len(out)
+        
+        offset = 0
+        while offset < length:
+            if length - offset >= self.R:
+                _RATE_WORDS.pack_into(out, offset, state[0], state[1], state[2], state[3])
+                offset += self.R
+            else:
+                out[offset:] = _RATE_WORDS.pack(state[0], state[1], state[2], state[3])[:length - offset]
+                offset = length
+            
+            # If need more bytes, apply permutation
+            if offset < length:
+                state[3] ^= (domain << 24)
+                self.xoodoo.permute(state)
+    
+    def squeeze(self, length, domain=0x01):
+        """Squeeze data from the state"""
+        output = bytearray(length)
+        self.squeeze_into(output, domain)
+        return bytes(output)
+
+
+class ReferenceCyclist(Cyclist):
+    """Cyclist mode on the step-by-step reference Xoodoo permutation and byte loops"""
+    
+    PERMUTATION = Xoodoo
+    
     def _bytes_to_words(self, data):
-        """Convert bytes to 32-bit words (little-endian)"""
+        """Convert bytes to 32-bit words (little-endian), byte by byte"""
         words = []
         for i in range(0, len(data), 4):
             word = 0
@@ -189,6 +403,141 @@ class Cyclist:
                 self.xoodoo.permute(self.state)
         
         return bytes(output[:length])
+    
+    def squeeze_into(self, buffer, domain=0x01):
+        """Squeeze len(buffer) bytes into a writable buffer through the byte-loop squeeze"""
+        out = _as_byte_view(buffer)
+        out[:] = self.squeeze(len(out), domain)
+    
+    def duplex_into(self, out, data, decrypting=False):
+        """
+        AEAD duplex block by block: squeeze the keystream, XOR, absorb the plaintext
+        
+        Same steps as the original XoodyakAEAD.encrypt/decrypt loops, independent of
+        the word-level fast path in XoodyakAEAD._crypt_into (the KAT vectors come from here).
+        """
+        data = bytes(data)
+        target = _as_byte_view(out)
+        if len(target) < len(data):
+            raise ValueError(f"Output buffer terlalu kecil: {len(target)} < {len(data)} bytes")
+        
+        for i in range(0, len(data), self.R):
+            block = data[i:i + self.R]
+            keystream = self.squeeze(len(block), domain=0x01)
+            result = bytes([b ^ k for b, k in zip(block, keystream)])
+            target[i:i + len(block)] = result
+            
+            # Absorb plaintext (NOT ciphertext)
+            self.absorb(result if decrypting else block, domain=0x03)
+
+
+class PlaneCyclist(Cyclist):
+    """Cyclist mode on the plane-per-int permutation (PlaneXoodoo)"""
+    
+    PERMUTATION = PlaneXoodoo
+
+
+class NativeXoodoo(Xoodoo):
+    """Xoodoo[12] permutation - native C extension (_xoodyak_native)"""
+    
+    def permute(self, state):
+        """Execute full Xoodoo[12] permutation in C"""
+        _xoodyak_native.permute(state)
+
+
+class NativeCyclist(Cyclist):
+    """Cyclist mode with absorb/squeeze loops in the native C extension"""
+    
+    PERMUTATION = NativeXoodoo
+    
+    def absorb(self, data, domain=0x03):
+        """Absorb data into the state"""
+        _xoodyak_native.absorb(self.state, data, domain)
+    
+    def squeeze(self, length, domain=0x01):
+        """Squeeze data from the state"""
+        return _xoodyak_native.squeeze(self.state, length, domain)
+
+
+# ============================================================================
+# BACKEND REGISTRY
+# ============================================================================
+
+BACKENDS = {}
+DEFAULT_BACKEND = None
+
+
+def register_backend(name, cyclist_class):
+    """Register a Cyclist implementation under a backend name"""
+    BACKENDS[name] = cyclist_class
+
+
+def available_backends():
+    """Names of all registered backends"""
+    return list(BACKENDS)
+
+
+def set_default_backend(name):
+    """Select the backend used when XoodyakAEAD is created without one"""
+    global DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown Xoodyak backend: {name}")
+    DEFAULT_BACKEND = name
+
+
+def get_backend(name=None):
+    """Return the Cyclist class of a backend (default backend if name is None)"""
+    name = name or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown Xoodyak backend: {name}")
+    return BACKENDS[name]
+
+
+register_backend('python', Cyclist)
+register_backend('reference', ReferenceCyclist)
+register_backend('plane', PlaneCyclist)
+if _xoodyak_native is not None:
+    register_backend('native', NativeCyclist)
+
+set_default_backend('native' if _xoodyak_native is not None else 'plane')
+
+
+class KeyedContext:
+    """
+    Cyclist state after absorbing a 128-bit key, reusable across nonces
+    
+    XoodyakAEAD absorbs key || nonce as two full rate blocks, so the state
+    after the first permutation depends only on the key. The context keeps
+    that 12-word state and XoodyakAEAD(context, nonce) starts from a copy
+    of it, skipping one permutation per message.
+    """
+    
+    KEY_LENGTH = 16
+    
+    def __init__(self, key, backend=None):
+        """
+        Args:
+            key: 128-bit key (16 bytes)
+            backend: Backend name from BACKENDS (optional, default backend if None)
+        """
+        key = bytes(key)
+        if len(key) != self.KEY_LENGTH:
+            raise ValueError(f"KeyedContext requires a {self.KEY_LENGTH}-byte key")
+        
+        self.backend = backend or DEFAULT_BACKEND
+        cyclist = get_backend(self.backend)()
+        cyclist.absorb(key, domain=0x03)
+        self.state = tuple(cyclist.state)
+    
+    def cyclist(self):
+        """New Cyclist of the context backend holding a copy of the keyed state"""
+        cyclist = get_backend(self.backend)()
+        cyclist.state = list(self.state)
+        return cyclist
+    
+    def aead(self, nonce, ad=b''):
+        """XoodyakAEAD for one message under this key"""
+        return XoodyakAEAD(self, nonce, ad)
 
 
 class XoodyakAEAD:
@@ -196,53 +545,186 @@ class XoodyakAEAD:
     
     TAG_LENGTH = 16  # 128-bit tag
     
-    def __init__(self, key, nonce, ad=b''):
+    def __init__(self, key, nonce, ad=b'', backend=None):
         """
         Initialize Xoodyak AEAD
         
         Args:
-            key: 128-bit key (16 bytes)
+            key: 128-bit key (16 bytes) or a KeyedContext
             nonce: 128-bit nonce (16 bytes)
             ad: Associated data (optional)
+            backend: Backend name from BACKENDS (optional, default backend if None;
+                     a KeyedContext uses its own backend)
         """
-        self.cyclist = Cyclist()
-        
-        # Key setup: absorb key || nonce
-        combined = key + nonce
-        self.cyclist.absorb(combined, domain=0x03)
+        if isinstance(key, KeyedContext):
+            if len(nonce) != key.KEY_LENGTH:
+                raise ValueError(f"KeyedContext requires a {key.KEY_LENGTH}-byte nonce")
+            
+            # Key block already absorbed: continue with the nonce block
+            self.cyclist = key.cyclist()
+            self.cyclist.absorb(nonce, domain=0x03)
+        else:
+            self.cyclist = get_backend(backend)()
+            
+            # Key setup: absorb key || nonce
+            combined = bytes(key) + bytes(nonce)
+            self.cyclist.absorb(combined, domain=0x03)
         
         # Absorb associated data
         if ad:
             self.cyclist.absorb(ad, domain=0x03)
     
-    def encrypt(self, plaintext):
+    def _crypt_into(self, out, data, decrypting):
         """
-        Encrypt plaintext
+        Duplex data into out block by block (out may be the same buffer as data)
+        
+        For every block the keystream is the current rate, and absorbing the
+        plaintext sets the rate to the ciphertext block, so the state is
+        updated directly from the ciphertext words in both directions.
+        """
+        cyclist = self.cyclist
+        if isinstance(cyclist, ReferenceCyclist):
+            cyclist.duplex_into(out, data, decrypting)
+            return
+        
+        state = cyclist.state
+        permute = cyclist.xoodoo.permute
+        source = _as_byte_view(data)
+        target = _as_byte_view(out)
+        length = len(source)
+        
+        if len(target) < length:
+            raise ValueError(f"Output buffer terlalu kecil: {len(target)} < {length} bytes")
+        
+        domain_word = 0x03 << 24
+        full = length - length % cyclist.R
+        unpack_from = _RATE_WORDS.unpack_from
+        pack_into = _RATE_WORDS.pack_into
+        
+        for i in range(0, full, cyclist.R):
+            w0, w1, w2, w3 = unpack_from(source, i)
+            o0 = w0 ^ state[0]
+            o1 = w1 ^ state[1]
+            o2 = w2 ^ state[2]
+            o3 = w3 ^ state[3]
+            pack_into(target, i, o0, o1, o2, o3)
+            
+            # Absorb plaintext (NOT ciphertext): rate ^ plaintext == ciphertext
+            if decrypting:
+                state[0], state[1], state[2], state[3] = w0, w1, w2, w3 ^ domain_word
+            else:
+                state[0], state[1], state[2], state[3] = o0, o1, o2, o3 ^ domain_word
+            permute(state)
+        
+        # Partial last block as one 128-bit little-endian integer
+        remainder = length - full
+        if remainder:
+            M = 0xFFFFFFFF
+            rate = state[0] | (state[1] << 32) | (state[2] << 64) | (state[3] << 96)
+            value = int.from_bytes(source[full:], 'little')
+            result = (value ^ rate) & ((1 << (8 * remainder)) - 1)
+            target[full:length] = result.to_bytes(remainder, 'little')
+            
+            # Absorb plaintext with padding and domain separation
+            rate ^= (result if decrypting else value) ^ (0x01 << (8 * remainder))
+            state[0] = rate & M
+            state[1] = (rate >> 32) & M
+            state[2] = (rate >> 64) & M
+            state[3] = ((rate >> 96) & M) ^ domain_word
+            permute(state)
+    
+    def encrypt_into(self, out, plaintext):
+        """
+        Encrypt plaintext into a preallocated buffer
         
         Args:
-            plaintext: Data to encrypt (bytes)
+            out: Writable buffer with at least len(plaintext) bytes (may be plaintext itself)
+            plaintext: Data to encrypt (bytes-like)
             
         Returns:
-            (ciphertext, tag): Tuple of ciphertext and authentication tag
+            tag: Authentication tag (16 bytes)
+        """
+        self._crypt_into(out, plaintext, decrypting=False)
+        return self.cyclist.squeeze(self.TAG_LENGTH, domain=0x01)
+    
+    def decrypt_into(self, out, ciphertext, tag):
         """
-        ciphertext = bytearray()
+        Decrypt ciphertext into a preallocated buffer and verify tag
         
-        # Encrypt each block
-        for i in range(0, len(plaintext), self.cyclist.R):
-            block_size = min(self.cyclist.R, len(plaintext) - i)
-            plaintext_block = plaintext[i:i + block_size]
+        Args:
+            out: Writable buffer with at least len(ciphertext) bytes (may be ciphertext itself)
+            ciphertext: Data to decrypt (bytes-like)
+            tag: Authentication tag (16 bytes)
             
-            # Generate keystream and XOR with plaintext
-            keystream = self.cyclist.squeeze(block_size, domain=0x01)
-            ciphertext_block = bytes([p ^ k for p, k in zip(plaintext_block, keystream)])
-            ciphertext.extend(ciphertext_block)
+        Returns:
+            is_verified: Verification status
+        """
+        self._crypt_into(out, ciphertext, decrypting=True)
+        computed_tag = self.cyclist.squeeze(self.TAG_LENGTH, domain=0x01)
+        return hmac.compare_digest(computed_tag, bytes(tag))
+    
+    def verify_only(self, ciphertext, tag):
+        """
+        Verify tag without producing plaintext
+        
+        Decryption absorbs the plaintext, which leaves the rate equal to the
+        ciphertext block, so the duplex can be driven from the ciphertext
+        alone: no keystream XOR and no output buffer.
+        
+        Args:
+            ciphertext: Data to authenticate (bytes-like)
+            tag: Authentication tag (16 bytes)
             
-            # Absorb plaintext (NOT ciphertext)
-            self.cyclist.absorb(plaintext_block, domain=0x03)
+        Returns:
+            is_verified: Verification status (constant-time tag comparison)
+        """
+        cyclist = self.cyclist
+        if isinstance(cyclist, ReferenceCyclist):
+            return self.decrypt(ciphertext, tag)[1]
+        
+        state = cyclist.state
+        permute = cyclist.xoodoo.permute
+        source = _as_byte_view(ciphertext)
+        length = len(source)
+        
+        domain_word = 0x03 << 24
+        full = length - length % cyclist.R
+        unpack_from = _RATE_WORDS.unpack_from
+        
+        for i in range(0, full, cyclist.R):
+            w0, w1, w2, w3 = unpack_from(source, i)
+            state[0], state[1], state[2], state[3] = w0, w1, w2, w3 ^ domain_word
+            permute(state)
         
-        # Generate authentication tag
-        tag = self.cyclist.squeeze(self.TAG_LENGTH, domain=0x01)
+        # Partial last block: ciphertext bytes replace the low rate bytes
+        remainder = length - full
+        if remainder:
+            M = 0xFFFFFFFF
+            rate = state[0] | (state[1] << 32) | (state[2] << 64) | (state[3] << 96)
+            mask = (1 << (8 * remainder)) - 1
+            rate = (rate & ~mask) | int.from_bytes(source[full:], 'little')
+            rate ^= 0x01 << (8 * remainder)
+            state[0] = rate & M
+            state[1] = (rate >> 32) & M
+            state[2] = (rate >> 64) & M
+            state[3] = ((rate >> 96) & M) ^ domain_word
+            permute(state)
+        
+        computed_tag = cyclist.squeeze(self.TAG_LENGTH, domain=0x01)
+        return hmac.compare_digest(computed_tag, bytes(tag))
+    
+    def encrypt(self, plaintext):
+        """
+        Encrypt plaintext
         
+        Args:
+            plaintext: Data to encrypt (bytes)
+            
+        Returns:
+            (ciphertext, tag): Tuple of ciphertext and authentication tag
+        """
+        ciphertext = bytearray(len(plaintext))
+        tag = self.encrypt_into(ciphertext, plaintext)
         return bytes(ciphertext), tag
     
     def decrypt(self, ciphertext, tag):
@@ -256,23 +738,246 @@ class XoodyakAEAD:
         Returns:
             (plaintext, is_verified): Tuple of plaintext and verification status
         """
-        plaintext = bytearray()
+        plaintext = bytearray(len(ciphertext))
+        is_verified = self.decrypt_into(plaintext, ciphertext, tag)
+        return bytes(plaintext), is_verified
+
+
+class _XoodyakStream:
+    """
+    Incremental duplex shared by XoodyakEncryptor and XoodyakDecryptor
+    
+    Holds an XoodyakAEAD instead of inheriting from it: the one-shot
+    encrypt/decrypt/verify_only methods are not exposed on a stream, so they
+    cannot run on its cyclist state in the middle of a message.
+    """
+    
+    DECRYPTING = False
+    TAG_LENGTH = XoodyakAEAD.TAG_LENGTH
+    
+    def __init__(self, key, nonce, ad=b'', backend=None):
+        """
+        Args:
+            key: 128-bit key (16 bytes) or a KeyedContext
+            nonce: 128-bit nonce (16 bytes)
+            ad: Associated data (optional)
+            backend: Backend name from BACKENDS (optional, see XoodyakAEAD)
+        """
+        self._aead = XoodyakAEAD(key, nonce, ad, backend=backend)
+        self.cyclist = self._aead.cyclist
+        self._pending = bytearray()  # plaintext of the current incomplete block
+        self._finalized = False
+    
+    def _crypt_partial(self, target, source):
+        """XOR bytes of the current incomplete block with the rate, absorbing once it is full"""
+        state = self.cyclist.state
+        offset = len(self._pending)
+        length = len(source)
         
-        # Decrypt each block
-        for i in range(0, len(ciphertext), self.cyclist.R):
-            block_size = min(self.cyclist.R, len(ciphertext) - i)
-            ciphertext_block = ciphertext[i:i + block_size]
-            
-            # Generate keystream and XOR with ciphertext
-            keystream = self.cyclist.squeeze(block_size, domain=0x01)
-            plaintext_block = bytes([c ^ k for c, k in zip(ciphertext_block, keystream)])
-            plaintext.extend(plaintext_block)
+        rate = state[0] | (state[1] << 32) | (state[2] << 64) | (state[3] << 96)
+        keystream = (rate >> (8 * offset)) & ((1 << (8 * length)) - 1)
+        value = int.from_bytes(source, 'little')
+        result = value ^ keystream
+        target[:length] = result.to_bytes(length, 'little')
+        self._pending += (result if self.DECRYPTING else value).to_bytes(length, 'little')
+        
+        if len(self._pending) == self.cyclist.R:
+            self._absorb_pending()
+    
+    def _absorb_pending(self):
+        """Absorb the buffered plaintext block (padded when incomplete)"""
+        state = self.cyclist.state
+        block = self._pending
+        if len(block) < self.cyclist.R:
+            block = block + b'\x01' + bytes(self.cyclist.R - len(block) - 1)
+        w0, w1, w2, w3 = _RATE_WORDS.unpack(block)
+        state[0] ^= w0
+        state[1] ^= w1
+        state[2] ^= w2
+        state[3] ^= w3 ^ (0x03 << 24)
+        self.cyclist.xoodoo.permute(state)
+        self._pending.clear()
+    
+    def update(self, chunk):
+        """
+        Process the next chunk (any length, block boundaries are carried over)
+        
+        Returns:
+            Output chunk of the same length as chunk
+        """
+        output = bytearray(len(_as_byte_view(chunk)))
+        self.update_into(output, chunk)
+        return bytes(output)
+    
+    def update_into(self, out, chunk):
+        """
+        Process the next chunk into a preallocated buffer
+        
+        Args:
+            out: Writable buffer with at least len(chunk) bytes (may be chunk itself)
+            chunk: Next input chunk (bytes-like, any length)
+        """
+        if self._finalized:
+            raise ValueError("Stream sudah di-finalize")
+        
+        source = _as_byte_view(chunk)
+        length = len(source)
+        target = _as_byte_view(out)
+        if len(target) < length:
+            raise ValueError(f"Output buffer terlalu kecil: {len(target)} < {length} bytes")
+        
+        # Complete a block left over from the previous chunk
+        offset = 0
+        if self._pending:
+            offset = min(self.cyclist.R - len(self._pending), length)
+            self._crypt_partial(target[:offset], source[:offset])
+        
+        # Whole blocks through the one-shot duplex path
+        full = (length - offset) - (length - offset) % self.cyclist.R
+        if full:
+            self._aead._crypt_into(target[offset:offset + full], source[offset:offset + full], self.DECRYPTING)
+            offset += full
+        
+        # Keep the tail as the start of the next block
+        if offset < length:
+            self._crypt_partial(target[offset:length], source[offset:])
+    
+    def _finish(self):
+        """Absorb the last incomplete block and squeeze the tag"""
+        if self._finalized:
+            raise ValueError("Stream sudah di-finalize")
+        self._finalized = True
+        if self._pending:
+            self._absorb_pending()
+        return self.cyclist.squeeze(self.TAG_LENGTH, domain=0x01)
+    
+
+class XoodyakEncryptor(_XoodyakStream):
+    """Incremental Xoodyak AEAD encryption - update(chunk) -> ciphertext, finalize() -> tag"""
+    
+    def finalize(self):
+        """
+        Finish encryption
+        
+        Returns:
+            tag: Authentication tag (16 bytes)
+        """
+        return self._finish()
+
+
+class XoodyakDecryptor(_XoodyakStream):
+    """Incremental Xoodyak AEAD decryption - update(chunk) -> plaintext, finalize(tag) -> verified"""
+    
+    DECRYPTING = True
+    
+    def finalize(self, tag):
+        """
+        Finish decryption and verify tag
+        
+        Args:
+            tag: Authentication tag (16 bytes)
             
-            # Absorb plaintext (NOT ciphertext)
-            self.cyclist.absorb(plaintext_block, domain=0x03)
+        Returns:
+            is_verified: Verification status
+        """
+        return hmac.compare_digest(self._finish(), bytes(tag))
+
+
+class XoodyakHash:
+    """
+    Xoodyak-Hash - unkeyed Cyclist hash mode with a hashlib-style API
+    
+    Follows the hash mode of the Xoodyak specification (R_hash = 16 bytes,
+    every block padded with 0x01, Cd = 0x03 only on the first block, Cu
+    ignored, two squeeze blocks for the 256-bit digest) on top of the
+    permutation of the selected backend, so digests match across backends.
+    """
+    
+    R = 16
+    DIGEST_SIZE = 32
+    name = 'xoodyak-hash'
+    digest_size = DIGEST_SIZE
+    block_size = R
+    
+    def __init__(self, data=b'', backend=None):
+        """
+        Args:
+            data: Initial data (optional, same as calling update)
+            backend: Backend name from BACKENDS (optional, default backend if None)
+        """
+        self.backend = backend or DEFAULT_BACKEND
+        self.xoodoo = get_backend(self.backend).PERMUTATION()
+        self.state = [0] * 12
+        self._pending = bytearray()  # current incomplete block
+        self._blocks = 0  # number of blocks already XORed into the state
+        if data:
+            self.update(data)
+    
+    def _down(self, w0, w1, w2, w3, length=16):
+        """Up (except before the first block) then Down one block of length bytes plus padding"""
+        state = self.state
+        if self._blocks:
+            self.xoodoo.permute(state)
+        state[0] ^= w0
+        state[1] ^= w1
+        state[2] ^= w2
+        state[3] ^= w3
+        state[length >> 2] ^= 0x01 << (8 * (length & 3))
+        if not self._blocks:
+            state[11] ^= 0x01 << 24  # Cd = 0x03 & 0x01 on the first block
+        self._blocks += 1
+    
+    def update(self, data):
+        """Absorb more data (any length, block boundaries are carried over)"""
+        source = _as_byte_view(data)
+        length = len(source)
+        offset = 0
         
-        # Verify authentication tag
-        computed_tag = self.cyclist.squeeze(self.TAG_LENGTH, domain=0x01)
-        is_verified = (computed_tag == tag)
+        # Complete a block left over from the previous update
+        if self._pending:
+            offset = min(self.R - len(self._pending), length)
+            self._pending += source[:offset]
+            if len(self._pending) < self.R:
+                return
+            self._down(*_RATE_WORDS.unpack(self._pending))
+            self._pending.clear()
+        
+        # Whole blocks straight from the input
+        unpack_from = _RATE_WORDS.unpack_from
+        full = offset + (length - offset) - (length - offset) % self.R
+        for i in range(offset, full, self.R):
+            self._down(*unpack_from(source, i))
         
-        return bytes(plaintext), is_verified
\ No newline at end of file
+        self._pending += source[full:]
+    
+    def copy(self):
+        """Independent copy of the current hash state"""
+        other = XoodyakHash.__new__(XoodyakHash)
+        other.backend = self.backend
+        other.xoodoo = self.xoodoo
+        other.state = list(self.state)
+        other._pending = bytearray(self._pending)
+        other._blocks = self._blocks
+        return other
+    
+    def digest(self):
+        """256-bit digest of the data so far (the object can keep absorbing)"""
+        final = self.copy()
+        
+        # Last (possibly empty) block; a full last block was already absorbed
+        if final._pending or not final._blocks:
+            block = bytes(final._pending) + bytes(self.R - len(final._pending))
+            final._down(*_RATE_WORDS.unpack(block), length=len(final._pending))
+        
+        state = final.state
+        output = bytearray()
+        while True:
+            final.xoodoo.permute(state)
+            output += _RATE_WORDS.pack(state[0], state[1], state[2], state[3])
+            if len(output) >= self.DIGEST_SIZE:
+                return bytes(output[:self.DIGEST_SIZE])
+            state[0] ^= 0x01  # Down(empty, 0x00)
+    
+    def hexdigest(self):
+        """Digest as a hex string"""
+        return self.digest().hex()
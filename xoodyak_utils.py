@@ -4,17 +4,241 @@ Helper functions untuk Xoodyak encryption/decryption dengan perbaikan
 """
 
 import hashlib
+import hmac
+import io
+import mmap
 import os
-from typing import Tuple
-from xoodyak_core import XoodyakAEAD
+import struct
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple
+from xoodyak_core import KeyedContext, XoodyakAEAD, XoodyakDecryptor, XoodyakEncryptor, XoodyakHash
 
 
-def derive_key(password: str) -> bytes:
+# Package versions
+PACKAGE_VERSION_1 = b'\x01'       # VERSION || NONCE || TAG || CIPHERTEXT
+PACKAGE_VERSION_STREAM = b'\x02'  # VERSION || NONCE || CHUNK_SIZE || (CHUNK || TAG)*
+PACKAGE_VERSION_KDF = b'\x03'     # VERSION || KDF_DESCRIPTOR || NONCE || TAG || CIPHERTEXT
+PACKAGE_VERSION_STREAM_KDF = b'\x04'  # VERSION || KDF_DESCRIPTOR || NONCE || CHUNK_SIZE || (CHUNK || TAG)*
+STREAM_VERSIONS = (PACKAGE_VERSION_STREAM, PACKAGE_VERSION_STREAM_KDF)
+
+STREAM_CHUNK_SIZE = 64 * 1024
+PARALLEL_CHUNK_SIZE = 1024 * 1024
+STREAM_MAX_CHUNK_SIZE = 16 * 1024 * 1024
+STREAM_HEADER_SIZE = 1 + 16 + 4
+TAG_SIZE = XoodyakAEAD.TAG_LENGTH
+
+AUTH_FAILED_MESSAGE = (
+    "❌ AUTENTIKASI GAGAL!\n"
+    "Kemungkinan penyebab:\n"
+    "1. Password salah\n"
+    "2. Data gambar rusak atau termodifikasi\n"
+    "3. File enkripsi tidak lengkap"
+)
+
+# KDF descriptor: ALG (1) + PARAM1 (4) + PARAM2 (2) + PARAM3 (2) + SALT (16)
+#   pbkdf2-sha256: PARAM1 = iterations
+#   scrypt:        PARAM1 = n, PARAM2 = r, PARAM3 = p
+KDF_ALGORITHMS = {'pbkdf2-sha256': 0x01, 'scrypt': 0x02}
+KDF_DESCRIPTOR_FORMAT = struct.Struct('>BIHH16s')
+KDF_DESCRIPTOR_SIZE = KDF_DESCRIPTOR_FORMAT.size
+KDF_PACKAGE_HEADER_SIZE = 1 + KDF_DESCRIPTOR_SIZE + 16 + 16
+STREAM_KDF_HEADER_SIZE = 1 + KDF_DESCRIPTOR_SIZE + 16 + 4
+
+# Batas parameter dari header (mencegah package dengan cost KDF berlebihan)
+KDF_MAX_PBKDF2_ITERATIONS = 10_000_000
+KDF_MAX_SCRYPT_MEMORY = 256 * 1024 * 1024
+
+# Profil KDF untuk encrypt_file (pilih per deployment lewat XOODYAK_KDF_PROFILE)
+KDF_PROFILES = {
+    'standard': {'algorithm': 'pbkdf2-sha256', 'iterations': 100000},
+    'interactive': {'algorithm': 'scrypt', 'n': 2 ** 14, 'r': 8, 'p': 1},
+    'bulk': {'algorithm': 'pbkdf2-sha256', 'iterations': 20000},
+}
+DEFAULT_KDF_PROFILE = os.environ.get('XOODYAK_KDF_PROFILE', 'standard')
+
+# KDF lama (package version 1/2): salt konstan - hanya untuk membaca package lama
+LEGACY_KDF = {'algorithm': 'pbkdf2-sha256', 'iterations': 100000, 'salt': b'xoodyak_salt_key'}
+
+# Key cache (opt-in, lihat enable_key_cache)
+KEY_CACHE_MAX_ENTRIES = 32
+KEY_CACHE_TTL = 15 * 60  # detik
+
+# Digest untuk tampilan integritas (md5 = sama dengan calculate_hash)
+DIGEST_ALGORITHMS = {'md5': hashlib.md5, 'xoodyak-hash': XoodyakHash}
+DEFAULT_DIGEST = 'md5'
+
+
+class _KeyCache:
+    """
+    LRU cache process-local untuk key hasil KDF
+    
+    Entry di-index dengan HMAC (secret acak per proses) atas
+    (KDF descriptor: algoritma, parameter, salt) + password, sehingga
+    password tidak disimpan.
+    Key disimpan sebagai bytearray dan di-nol-kan saat evict/expire.
+    """
+    
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._secret = os.urandom(32)
+        self._entries = OrderedDict()  # cache_key -> (expires_at, bytearray key)
+        self._lock = threading.Lock()
+    
+    def _cache_key(self, password_bytes: bytes, descriptor: bytes) -> bytes:
+        return hmac.new(self._secret, descriptor + password_bytes, hashlib.sha256).digest()
+    
+    def _evict(self, cache_key: bytes) -> None:
+        _, key = self._entries.pop(cache_key)
+        key[:] = bytes(len(key))
+        self.evictions += 1
+    
+    def _purge(self) -> None:
+        now = time.monotonic()
+        expired = [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]
+        for cache_key in expired:
+            self._evict(cache_key)
+        while len(self._entries) > self.max_entries:
+            self._evict(next(iter(self._entries)))
+    
+    def get(self, password_bytes: bytes, descriptor: bytes) -> Optional[bytes]:
+        cache_key = self._cache_key(password_bytes, descriptor)
+        with self._lock:
+            self._purge()
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return bytes(entry[1])
+    
+    def put(self, password_bytes: bytes, descriptor: bytes, key: bytes) -> None:
+        cache_key = self._cache_key(password_bytes, descriptor)
+        with self._lock:
+            if cache_key in self._entries:
+                self._evict(cache_key)
+            self._entries[cache_key] = (time.monotonic() + self.ttl, bytearray(key))
+            self._purge()
+    
+    def clear(self) -> None:
+        with self._lock:
+            for cache_key in list(self._entries):
+                self._evict(cache_key)
+    
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'enabled': True,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+_key_cache: Optional[_KeyCache] = None
+
+
+def enable_key_cache(max_entries: int = KEY_CACHE_MAX_ENTRIES, ttl: float = KEY_CACHE_TTL) -> None:
+    """
+    Aktifkan cache key hasil derive_key (opt-in, process-local)
+    
+    Aman dipanggil berulang (mis. setiap rerun Streamlit): entry yang ada
+    dipertahankan, hanya batas ukuran dan TTL yang diperbarui.
+    """
+    global _key_cache
+    if _key_cache is None:
+        _key_cache = _KeyCache(max_entries, ttl)
+    else:
+        with _key_cache._lock:
+            _key_cache.max_entries = max_entries
+            _key_cache.ttl = ttl
+            _key_cache._purge()
+
+
+def disable_key_cache() -> None:
+    """Nonaktifkan cache key dan nol-kan semua key yang tersimpan"""
+    global _key_cache
+    if _key_cache is not None:
+        _key_cache.clear()
+        _key_cache = None
+
+
+def key_cache_stats() -> dict:
+    """Statistik cache key (hits, misses, evictions, size)"""
+    if _key_cache is None:
+        return {'enabled': False, 'size': 0, 'hits': 0, 'misses': 0, 'evictions': 0}
+    return _key_cache.stats()
+
+
+def new_kdf(profile: Optional[str] = None) -> dict:
+    """
+    Buat parameter KDF dari profil dengan salt acak per file
+    
+    Args:
+        profile: Nama profil di KDF_PROFILES (default: DEFAULT_KDF_PROFILE)
+    """
+    profile = profile or DEFAULT_KDF_PROFILE
+    if profile not in KDF_PROFILES:
+        raise ValueError(f"Profil KDF tidak dikenal: {profile}")
+    kdf = dict(KDF_PROFILES[profile])
+    kdf['salt'] = os.urandom(16)
+    return kdf
+
+
+def encode_kdf_descriptor(kdf: dict) -> bytes:
+    """Serialize parameter KDF ke descriptor 25 bytes untuk header package"""
+    if kdf['algorithm'] == 'pbkdf2-sha256':
+        params = (kdf['iterations'], 0, 0)
+    elif kdf['algorithm'] == 'scrypt':
+        params = (kdf['n'], kdf['r'], kdf['p'])
+    else:
+        raise ValueError(f"Algoritma KDF tidak dikenal: {kdf['algorithm']}")
+    return KDF_DESCRIPTOR_FORMAT.pack(KDF_ALGORITHMS[kdf['algorithm']], *params, kdf['salt'])
+
+
+def decode_kdf_descriptor(data: bytes) -> dict:
+    """
+    Parse descriptor KDF dari header package dengan validasi batas parameter
+    
+    Raises:
+        ValueError: Descriptor tidak valid
+    """
+    if len(data) != KDF_DESCRIPTOR_SIZE:
+        raise ValueError("KDF descriptor invalid - data mungkin rusak")
+    
+    algorithm_id, param1, param2, param3, salt = KDF_DESCRIPTOR_FORMAT.unpack(data)
+    if algorithm_id == KDF_ALGORITHMS['pbkdf2-sha256']:
+        if not 0 < param1 <= KDF_MAX_PBKDF2_ITERATIONS:
+            raise ValueError("Parameter KDF tidak valid - data mungkin rusak")
+        return {'algorithm': 'pbkdf2-sha256', 'iterations': param1, 'salt': salt}
+    
+    if algorithm_id == KDF_ALGORITHMS['scrypt']:
+        n, r, p = param1, param2, param3
+        if n < 2 or n & (n - 1) or not r or not p or 128 * n * r * p > KDF_MAX_SCRYPT_MEMORY:
+            raise ValueError("Parameter KDF tidak valid - data mungkin rusak")
+        return {'algorithm': 'scrypt', 'n': n, 'r': r, 'p': p, 'salt': salt}
+    
+    raise ValueError("Algoritma KDF tidak dikenal - data mungkin rusak")
+
+
+def derive_key(password: str, kdf: Optional[dict] = None) -> bytes:
     """
     Derive 128-bit key dari password dengan normalisasi
     
     Args:
         password: User password (string)
+        kdf: Parameter KDF (new_kdf / decode_kdf_descriptor),
+             default LEGACY_KDF (PBKDF2-SHA256, 100000, salt konstan)
         
     Returns:
         128-bit key (16 bytes)
@@ -25,16 +249,37 @@ def derive_key(password: str) -> bytes:
     # FIX 2: Gunakan UTF-8 encoding yang konsisten
     password_bytes = password.encode('utf-8')
     
-    # FIX 3: Salt yang konsisten
-    salt = b'xoodyak_salt_key'
+    # FIX 3: Salt yang konsisten (package lama) atau salt dari header package
+    kdf = kdf or LEGACY_KDF
+    descriptor = encode_kdf_descriptor(kdf)
+    
+    cache = _key_cache
+    if cache is not None:
+        key = cache.get(password_bytes, descriptor)
+        if key is not None:
+            return key
     
     # Derive key
-    key = hashlib.pbkdf2_hmac(
-        'sha256',
-        password_bytes,
-        salt,
-        100000
-    )[:16]
+    if kdf['algorithm'] == 'scrypt':
+        key = hashlib.scrypt(
+            password_bytes,
+            salt=kdf['salt'],
+            n=kdf['n'],
+            r=kdf['r'],
+            p=kdf['p'],
+            maxmem=KDF_MAX_SCRYPT_MEMORY + 1024 * 1024,
+            dklen=16
+        )
+    else:
+        key = hashlib.pbkdf2_hmac(
+            'sha256',
+            password_bytes,
+            kdf['salt'],
+            kdf['iterations']
+        )[:16]
+    
+    if cache is not None:
+        cache.put(password_bytes, descriptor, key)
     
     return key
 
@@ -46,17 +291,20 @@ def calculate_hash(data: bytes) -> str:
     return hashlib.md5(data).hexdigest()
 
 
-def encrypt_file(file_data: bytes, password: str, filename: str = '') -> bytes:
+def encrypt_file(file_data: bytes, password: str, filename: str = '',
+                 kdf_profile: Optional[str] = None) -> bytes:
     """
     Encrypt file using Xoodyak AEAD dengan format yang konsisten
     
-    Format: VERSION (1) + NONCE (16) + TAG (16) + CIPHERTEXT
+    Format (version 3): VERSION (1) + KDF_DESCRIPTOR (25) + NONCE (16) + TAG (16) + CIPHERTEXT
+    KDF descriptor berisi algoritma, parameter dan salt acak per file.
     Associated Data: kosong (b'')
     
     Args:
         file_data: Raw file data (bytes)
         password: Encryption password
         filename: Original filename (metadata only)
+        kdf_profile: Nama profil di KDF_PROFILES (default: DEFAULT_KDF_PROFILE)
         
     Returns:
         Encrypted package (bytes)
@@ -64,36 +312,229 @@ def encrypt_file(file_data: bytes, password: str, filename: str = '') -> bytes:
     # FIX 4: Normalisasi password
     password = password.strip()
     
-    # Derive key dari password
-    key = derive_key(password)
+    # Derive key dari password dengan salt acak per file
+    kdf = new_kdf(kdf_profile)
+    key = derive_key(password, kdf)
+    
+    try:
+        return _seal_kdf_package(key, encode_kdf_descriptor(kdf), file_data)
+    
+    except Exception as e:
+        raise ValueError(f"Enkripsi gagal: {str(e)}")
+
+
+def encrypt_file_with_digests(file_data: bytes, password: str, filename: str = '',
+                              kdf_profile: Optional[str] = None,
+                              digest: str = DEFAULT_DIGEST,
+                              chunk_size: int = STREAM_CHUNK_SIZE) -> Tuple[bytes, str, str]:
+    """
+    Encrypt (package version 3) sekaligus hitung digest plaintext dan ciphertext
+    
+    Data dibaca satu kali: setiap chunk di-hash, dienkripsi langsung ke buffer
+    package, lalu chunk ciphertext di-hash - tanpa pass terpisah untuk
+    calculate_hash. Package identik formatnya dengan encrypt_file.
+    
+    Args:
+        file_data: Raw file data (bytes-like)
+        password: Encryption password
+        filename: Original filename (metadata only)
+        kdf_profile: Nama profil di KDF_PROFILES (default: DEFAULT_KDF_PROFILE)
+        digest: Nama algoritma di DIGEST_ALGORITHMS (default md5 = calculate_hash)
+        chunk_size: Ukuran chunk per pass (bytes)
+        
+    Returns:
+        (package, plaintext_digest, ciphertext_digest) - digest dalam hex;
+        ciphertext_digest dihitung atas bagian CIPHERTEXT package
+    """
+    if digest not in DIGEST_ALGORITHMS:
+        raise ValueError(f"Digest tidak dikenal: {digest}. Pilihan: {', '.join(DIGEST_ALGORITHMS)}")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size harus lebih dari 0")
+    
+    password = password.strip()
+    kdf = new_kdf(kdf_profile)
+    key = derive_key(password, kdf)
+    
+    try:
+        nonce = os.urandom(16)
+        source = memoryview(file_data).cast('B')
+        size = len(source)
+        
+        # VERSION (1) + KDF (25) + NONCE (16) + TAG (16, diisi setelah finalize) + CIPHERTEXT
+        package = bytearray(KDF_PACKAGE_HEADER_SIZE + size)
+        header = PACKAGE_VERSION_KDF + encode_kdf_descriptor(kdf) + nonce
+        package[:len(header)] = header
+        body = memoryview(package)[KDF_PACKAGE_HEADER_SIZE:]
+        
+        plaintext_hash = DIGEST_ALGORITHMS[digest]()
+        ciphertext_hash = DIGEST_ALGORITHMS[digest]()
+        encryptor = XoodyakEncryptor(key, nonce, b'')
+        for offset in range(0, size, chunk_size):
+            chunk = source[offset:offset + chunk_size]
+            out = body[offset:offset + len(chunk)]
+            plaintext_hash.update(chunk)
+            encryptor.update_into(out, chunk)
+            ciphertext_hash.update(out)
+        
+        package[len(header):KDF_PACKAGE_HEADER_SIZE] = encryptor.finalize()
+        body.release()
+        return bytes(package), plaintext_hash.hexdigest(), ciphertext_hash.hexdigest()
     
+    except Exception as e:
+        raise ValueError(f"Enkripsi gagal: {str(e)}")
+
+
+def _seal_kdf_package(key, descriptor: bytes, file_data: bytes) -> bytes:
+    """Enkripsi satu payload dengan key (bytes atau KeyedContext) -> package version 3"""
     # Generate random nonce (128-bit = 16 bytes)
     nonce = os.urandom(16)
     
     # FIX 5: Associated data HARUS kosong - JANGAN UBAH
     ad = b''
     
-    try:
-        # Encrypt using Xoodyak AEAD
-        aead = XoodyakAEAD(key, nonce, ad)
-        ciphertext, tag = aead.encrypt(file_data)
+    # Encrypt using Xoodyak AEAD
+    aead = XoodyakAEAD(key, nonce, ad)
+    ciphertext, tag = aead.encrypt(file_data)
+    
+    # FIX 6: Package format dengan version byte
+    # VERSION (1 byte) + KDF (25 bytes) + NONCE (16 bytes) + TAG (16 bytes) + CIPHERTEXT
+    return PACKAGE_VERSION_KDF + descriptor + nonce + tag + ciphertext
+
+
+def parse_package(package_data: bytes) -> dict:
+    """
+    Parse package single-shot (version 1 atau 3)
+    
+    Returns:
+        dict dengan 'version', 'kdf' (None untuk version 1 = LEGACY_KDF),
+        'nonce', 'tag', 'ciphertext'
         
-        # FIX 6: Package format dengan version byte
+    Raises:
+        ValueError: Format tidak valid
+    """
+    # FIX 8: Validasi minimum size
+    # Minimum: VERSION (1) + NONCE (16) + TAG (16) = 33 bytes
+    if len(package_data) < 33:
+        raise ValueError("Data terlalu kecil atau format rusak")
+    
+    # FIX 9: Parse package dengan benar
+    version = bytes(package_data[0:1])
+    if version == PACKAGE_VERSION_KDF:
+        if len(package_data) < KDF_PACKAGE_HEADER_SIZE:
+            raise ValueError("Data terlalu kecil atau format rusak")
+        kdf = decode_kdf_descriptor(bytes(package_data[1:1 + KDF_DESCRIPTOR_SIZE]))
+        offset = 1 + KDF_DESCRIPTOR_SIZE
+    elif version == PACKAGE_VERSION_1:
         # VERSION (1 byte) + NONCE (16 bytes) + TAG (16 bytes) + CIPHERTEXT
-        version = b'\x01'
-        encrypted_package = version + nonce + tag + ciphertext
+        kdf = None
+        offset = 1
+    else:
+        # FIX 10: Validasi version
+        raise ValueError("Format file tidak valid atau versi tidak kompatibel")
+    
+    nonce = package_data[offset:offset + 16]
+    tag = package_data[offset + 16:offset + 32]
+    
+    # FIX 11: Validasi nonce length
+    if len(nonce) != 16:
+        raise ValueError("Nonce invalid - data mungkin rusak")
+    
+    # FIX 12: Validasi tag length
+    if len(tag) != 16:
+        raise ValueError("Tag invalid - data mungkin rusak")
+    
+    return {
+        'version': version,
+        'kdf': kdf,
+        'nonce': nonce,
+        'tag': tag,
+        'ciphertext': package_data[offset + 32:],
+    }
+
+
+def check_package(package_data: bytes) -> dict:
+    """
+    Validasi cepat panjang dan version package (1, 2, 3 atau 4) tanpa KDF/permutation
+    
+    Dipanggil sebelum derive_key agar data yang jelas rusak ditolak murah
+    (verifikasi massal, brute force).
+    
+    Returns:
+        dict parse_package untuk version 1/3; untuk version 2/4 dict _stream_layout
+        ('version', 'kdf' (None = LEGACY_KDF), 'header_size', 'nonce', 'chunk_size',
+        'chunk_count', 'plaintext_size')
         
-        return encrypted_package
+    Raises:
+        ValueError: Format tidak valid
+    """
+    if len(package_data) < 33:
+        raise ValueError("Data terlalu kecil atau format rusak")
+    if package_data[0:1] not in STREAM_VERSIONS:
+        return parse_package(package_data)
     
-    except Exception as e:
-        raise ValueError(f"Enkripsi gagal: {str(e)}")
+    # Header di-copy (<= 46 bytes): tidak ada slice buffer/mmap yang tertahan saat validasi gagal
+    header = bytes(package_data[:_stream_header_size(bytes(package_data[0:1]))])
+    return _stream_layout(header, len(package_data))
+
+
+def _stream_header_size(version: bytes) -> int:
+    """Ukuran header package chunked: version 4 menyimpan KDF descriptor, version 2 tidak"""
+    return STREAM_KDF_HEADER_SIZE if version == PACKAGE_VERSION_STREAM_KDF else STREAM_HEADER_SIZE
+
+
+def _stream_header(kdf: dict, nonce: bytes, chunk_size: int) -> bytes:
+    """Header package version 4: VERSION + KDF_DESCRIPTOR + NONCE + CHUNK_SIZE"""
+    return PACKAGE_VERSION_STREAM_KDF + encode_kdf_descriptor(kdf) + nonce + struct.pack('>I', chunk_size)
+
+
+def _parse_stream_header(header: bytes) -> dict:
+    """Parse header version 2/4 -> version, kdf (None = LEGACY_KDF), header_size, nonce, chunk_size"""
+    version = bytes(header[0:1])
+    header_size = _stream_header_size(version)
+    if len(header) < header_size:
+        raise ValueError("Data terlalu kecil atau format rusak")
+    
+    kdf = None
+    if version == PACKAGE_VERSION_STREAM_KDF:
+        kdf = decode_kdf_descriptor(bytes(header[1:1 + KDF_DESCRIPTOR_SIZE]))
+    
+    chunk_size = struct.unpack('>I', header[header_size - 4:header_size])[0]
+    if not 0 < chunk_size <= STREAM_MAX_CHUNK_SIZE:
+        raise ValueError("Chunk size invalid - data mungkin rusak")
+    
+    return {
+        'version': version,
+        'kdf': kdf,
+        'header_size': header_size,
+        'nonce': bytes(header[header_size - 20:header_size - 4]),
+        'chunk_size': chunk_size,
+    }
+
+
+def _stream_layout(header: bytes, package_size: int) -> dict:
+    """Validasi header version 2/4 terhadap ukuran package -> _parse_stream_header + chunk_count, plaintext_size"""
+    layout = _parse_stream_header(header)
+    if package_size < layout['header_size'] + TAG_SIZE:
+        raise ValueError("Data terlalu kecil atau format rusak")
+    
+    # Setiap record minimal berisi TAG; record terakhir boleh lebih pendek
+    record_size = layout['chunk_size'] + TAG_SIZE
+    body_size = package_size - layout['header_size']
+    chunk_count = _stream_chunk_count(body_size, record_size)
+    if body_size - (chunk_count - 1) * record_size < TAG_SIZE:
+        raise ValueError("File enkripsi tidak lengkap")
+    
+    layout['chunk_count'] = chunk_count
+    layout['plaintext_size'] = body_size - chunk_count * TAG_SIZE
+    return layout
 
 
 def decrypt_file(package_data: bytes, password: str) -> Tuple[bytes, dict, bool]:
     """
     Decrypt file using Xoodyak AEAD dengan validasi ketat
     
-    Format: VERSION (1) + NONCE (16) + TAG (16) + CIPHERTEXT
+    Format: VERSION (1) + [KDF_DESCRIPTOR (25)] + NONCE (16) + TAG (16) + CIPHERTEXT
+    Package version 1, 2/4 (encrypt_stream) dan 3 (KDF descriptor) didukung.
     
     Args:
         package_data: Encrypted package (bytes)
@@ -112,32 +553,23 @@ def decrypt_file(package_data: bytes, password: str) -> Tuple[bytes, dict, bool]
         # FIX 7: Normalisasi password
         password = password.strip()
         
-        # Derive key dari password
-        key = derive_key(password)
-        
-        # FIX 8: Validasi minimum size
-        # Minimum: VERSION (1) + NONCE (16) + TAG (16) = 33 bytes
-        if len(package_data) < 33:
-            raise ValueError("Data terlalu kecil atau format rusak")
-        
-        # FIX 9: Parse package dengan benar
-        # VERSION (1 byte) + NONCE (16 bytes) + TAG (16 bytes) + CIPHERTEXT
-        version = package_data[0:1]
-        nonce = package_data[1:17]
-        tag = package_data[17:33]
-        ciphertext = package_data[33:]
-        
-        # FIX 10: Validasi version
-        if version != b'\x01':
-            raise ValueError("Format file tidak valid atau versi tidak kompatibel")
+        # Package streaming (version 2/4): dekripsi per chunk
+        if len(package_data) >= 33 and package_data[0:1] in STREAM_VERSIONS:
+            package = check_package(package_data)
+            output = io.BytesIO()
+            result = _decrypt_stream_body(
+                derive_key(password, package['kdf']), package,
+                io.BytesIO(package_data[package['header_size']:]), output
+            )
+            return output.getvalue(), result, True
         
-        # FIX 11: Validasi nonce length
-        if len(nonce) != 16:
-            raise ValueError("Nonce invalid - data mungkin rusak")
+        package = parse_package(package_data)
+        nonce = package['nonce']
+        tag = package['tag']
+        ciphertext = package['ciphertext']
         
-        # FIX 12: Validasi tag length
-        if len(tag) != 16:
-            raise ValueError("Tag invalid - data mungkin rusak")
+        # Derive key dari password (KDF dari header untuk version 3)
+        key = derive_key(password, package['kdf'])
         
         # FIX 13: Associated data HARUS kosong - IDENTIK dengan enkripsi
         ad = b''
@@ -148,13 +580,7 @@ def decrypt_file(package_data: bytes, password: str) -> Tuple[bytes, dict, bool]
         
         # FIX 14: Detailed authentication check
         if not is_verified:
-            raise ValueError(
-                "❌ AUTENTIKASI GAGAL!\n"
-                "Kemungkinan penyebab:\n"
-                "1. Password salah\n"
-                "2. Data gambar rusak atau termodifikasi\n"
-                "3. File enkripsi tidak lengkap"
-            )
+            raise ValueError(AUTH_FAILED_MESSAGE)
         
         # Prepare result info
         result = {
@@ -162,7 +588,8 @@ def decrypt_file(package_data: bytes, password: str) -> Tuple[bytes, dict, bool]
             'is_authenticated': is_verified,
             'algorithm': 'Xoodyak AEAD (NIST Standard)',
             'nonce_hex': nonce.hex(),
-            'tag_hex': tag.hex()
+            'tag_hex': tag.hex(),
+            'kdf': (package['kdf'] or LEGACY_KDF)['algorithm'],
         }
         
         return plaintext, result, is_verified
@@ -173,6 +600,858 @@ def decrypt_file(package_data: bytes, password: str) -> Tuple[bytes, dict, bool]
         raise ValueError(f"Dekripsi gagal: {str(e)}")
 
 
+def _verify_checked(context: KeyedContext, package_data: bytes, package: dict) -> bool:
+    """Verifikasi tag package hasil check_package (semua chunk untuk version 2/4)"""
+    if package['version'] not in STREAM_VERSIONS:
+        return XoodyakAEAD(context, package['nonce'], b'').verify_only(package['ciphertext'], package['tag'])
+    
+    body = memoryview(package_data)[package['header_size']:]
+    record_size = package['chunk_size'] + TAG_SIZE
+    chunk_count = package['chunk_count']
+    for index in range(chunk_count):
+        record = body[index * record_size:(index + 1) * record_size]
+        aead = _chunk_aead(context, package['nonce'], index, index == chunk_count - 1)
+        if not aead.verify_only(record[:-TAG_SIZE], record[-TAG_SIZE:]):
+            return False
+    return True
+
+
+def verify_package(package_data: bytes, password: str) -> bool:
+    """
+    Verifikasi password/integritas package tanpa menghasilkan plaintext
+    
+    Format dicek dulu dengan check_package (sebelum KDF), lalu tag dihitung
+    langsung dari ciphertext dan dibandingkan constant-time.
+    
+    Args:
+        package_data: Encrypted package (version 1, 2, 3 atau 4)
+        password: Decryption password
+        
+    Returns:
+        True jika semua tag valid
+        
+    Raises:
+        ValueError: Format tidak valid
+    """
+    package = check_package(package_data)
+    context = KeyedContext(derive_key(password.strip(), package['kdf']))
+    return _verify_checked(context, package_data, package)
+
+
+def _read_exact(src: BinaryIO, size: int) -> bytes:
+    """Baca tepat size bytes dari file object (kurang hanya jika EOF)"""
+    data = src.read(size)
+    if len(data) == size or not data:
+        return data
+    
+    parts = [data]
+    remaining = size - len(data)
+    while remaining:
+        part = src.read(remaining)
+        if not part:
+            break
+        parts.append(part)
+        remaining -= len(part)
+    return b''.join(parts)
+
+
+def _read_chunks(src: BinaryIO, size: int) -> Iterator[Tuple[bytes, bool]]:
+    """
+    Baca src per chunk dengan lookahead satu chunk
+    
+    Yields:
+        (chunk, is_last) - selalu minimal satu chunk (bisa kosong)
+    """
+    chunk = _read_exact(src, size)
+    while True:
+        next_chunk = _read_exact(src, size) if len(chunk) == size else b''
+        if not next_chunk:
+            yield chunk, True
+            return
+        yield chunk, False
+        chunk = next_chunk
+
+
+def _chunk_nonce(nonce: bytes, index: int) -> bytes:
+    """Nonce per chunk: 8 byte terakhir nonce utama di-XOR dengan index chunk"""
+    counter = int.from_bytes(nonce[8:16], 'big') ^ index
+    return nonce[:8] + counter.to_bytes(8, 'big')
+
+
+def _chunk_ad(index: int, is_last: bool) -> bytes:
+    """Associated data per chunk: index + flag chunk terakhir (deteksi reorder/truncation)"""
+    return struct.pack('>QB', index, 1 if is_last else 0)
+
+
+def _keyed(key) -> KeyedContext:
+    """KeyedContext dari key (bytes) - key hanya di-absorb sekali untuk banyak nonce"""
+    return key if isinstance(key, KeyedContext) else KeyedContext(key)
+
+
+def _chunk_aead(context: KeyedContext, nonce: bytes, index: int, is_last: bool) -> XoodyakAEAD:
+    """Instance XoodyakAEAD untuk satu chunk package version 2/4"""
+    return XoodyakAEAD(context, _chunk_nonce(nonce, index), _chunk_ad(index, is_last))
+
+
+def encrypt_stream(src: BinaryIO, dst: BinaryIO, password: str,
+                   chunk_size: int = STREAM_CHUNK_SIZE,
+                   kdf_profile: Optional[str] = None) -> int:
+    """
+    Encrypt file object ke file object per chunk (memori konstan)
+    
+    Format (version 4): VERSION (1) + KDF_DESCRIPTOR (25) + NONCE (16) + CHUNK_SIZE (4)
+                        + [CIPHERTEXT_CHUNK + TAG (16)]...
+    Setiap chunk dienkripsi dengan nonce turunan (nonce utama + index chunk),
+    chunk terakhir ditandai di associated data. Key di-derive dengan salt acak
+    per file seperti encrypt_file.
+    
+    Args:
+        src: File object sumber (mode binary, readable)
+        dst: File object tujuan (mode binary, writable)
+        password: Encryption password
+        chunk_size: Ukuran chunk plaintext (bytes)
+        kdf_profile: Nama profil di KDF_PROFILES (default: DEFAULT_KDF_PROFILE)
+        
+    Returns:
+        Jumlah bytes yang ditulis ke dst
+    """
+    if not 0 < chunk_size <= STREAM_MAX_CHUNK_SIZE:
+        raise ValueError(f"Chunk size tidak valid: {chunk_size}")
+    
+    kdf = new_kdf(kdf_profile)
+    context = KeyedContext(derive_key(password.strip(), kdf))
+    nonce = os.urandom(16)
+    
+    header = _stream_header(kdf, nonce, chunk_size)
+    dst.write(header)
+    written = len(header)
+    
+    buffer = bytearray(chunk_size)
+    for index, (chunk, is_last) in enumerate(_read_chunks(src, chunk_size)):
+        out = memoryview(buffer)[:len(chunk)]
+        aead = _chunk_aead(context, nonce, index, is_last)
+        tag = aead.encrypt_into(out, chunk)
+        dst.write(out)
+        dst.write(tag)
+        written += len(chunk) + TAG_SIZE
+    
+    return written
+
+
+def _decrypt_stream_body(key, header: dict, src: BinaryIO, dst: BinaryIO) -> dict:
+    """Dekripsi body package version 2/4 dari src (posisi tepat setelah header) ke dst"""
+    context = _keyed(key)
+    nonce = header['nonce']
+    chunk_size = header['chunk_size']
+    
+    total = 0
+    chunk_count = 0
+    buffer = bytearray(chunk_size)
+    for index, (record, is_last) in enumerate(_read_chunks(src, chunk_size + TAG_SIZE)):
+        if len(record) < TAG_SIZE or (not is_last and len(record) != chunk_size + TAG_SIZE):
+            raise ValueError("File enkripsi tidak lengkap")
+        
+        ciphertext = memoryview(record)[:-TAG_SIZE]
+        tag = record[-TAG_SIZE:]
+        out = memoryview(buffer)[:len(ciphertext)]
+        aead = _chunk_aead(context, nonce, index, is_last)
+        
+        # Plaintext chunk hanya ditulis setelah tag chunk terverifikasi
+        if not aead.decrypt_into(out, ciphertext, tag):
+            raise ValueError(AUTH_FAILED_MESSAGE)
+        dst.write(out)
+        total += len(ciphertext)
+        chunk_count += 1
+    
+    return {
+        'file_size': total,
+        'is_authenticated': True,
+        'algorithm': 'Xoodyak AEAD (NIST Standard)',
+        'nonce_hex': nonce.hex(),
+        'chunk_size': chunk_size,
+        'chunk_count': chunk_count,
+    }
+
+
+def decrypt_stream(src: BinaryIO, dst: BinaryIO, password: str,
+                   chunk_size: int = STREAM_CHUNK_SIZE) -> dict:
+    """
+    Decrypt file object ke file object per chunk (memori konstan)
+    
+    Mendukung package version 2/4 (encrypt_stream) dan version 1/3 (encrypt_file).
+    Version 2/4: setiap chunk diverifikasi sebelum ditulis ke dst.
+    Version 1/3: tag hanya bisa diverifikasi di akhir - jika gagal, isi dst harus dibuang.
+    
+    Args:
+        src: File object sumber (mode binary, readable)
+        dst: File object tujuan (mode binary, writable)
+        password: Decryption password
+        chunk_size: Ukuran baca untuk package version 1/3 (bytes)
+        
+    Returns:
+        info_dict: File information
+        
+    Raises:
+        ValueError: If decryption fails
+    """
+    version = src.read(1)
+    if version in STREAM_VERSIONS:
+        header = _parse_stream_header(version + _read_exact(src, _stream_header_size(version) - 1))
+        return _decrypt_stream_body(derive_key(password.strip(), header['kdf']), header, src, dst)
+    
+    if version == PACKAGE_VERSION_KDF:
+        kdf = decode_kdf_descriptor(_read_exact(src, KDF_DESCRIPTOR_SIZE))
+    elif version == PACKAGE_VERSION_1:
+        kdf = None
+    else:
+        raise ValueError("Format file tidak valid atau versi tidak kompatibel")
+    key = derive_key(password.strip(), kdf)
+    
+    header = _read_exact(src, 32)
+    if len(header) < 32:
+        raise ValueError("Data terlalu kecil atau format rusak")
+    nonce = header[:16]
+    tag = header[16:32]
+    
+    decryptor = XoodyakDecryptor(key, nonce, b'')
+    total = 0
+    while True:
+        chunk = _read_exact(src, chunk_size)
+        if not chunk:
+            break
+        dst.write(decryptor.update(chunk))
+        total += len(chunk)
+    
+    if not decryptor.finalize(tag):
+        raise ValueError(AUTH_FAILED_MESSAGE)
+    
+    return {
+        'file_size': total,
+        'is_authenticated': True,
+        'algorithm': 'Xoodyak AEAD (NIST Standard)',
+        'nonce_hex': nonce.hex(),
+        'tag_hex': tag.hex()
+    }
+
+
+def _stream_chunk_count(size: int, chunk_size: int) -> int:
+    """Jumlah chunk package version 2/4 untuk size bytes per chunk_size (minimal 1)"""
+    return max(1, -(-size // chunk_size))
+
+
+def _map_output(out_file: BinaryIO, size: int) -> mmap.mmap:
+    """Pre-size file tujuan dan map ke memori (writable)"""
+    out_file.truncate(size)
+    return mmap.mmap(out_file.fileno(), size)
+
+
+def _close_maps(*maps) -> None:
+    """Tutup mmap (nilai lain seperti None/bytes dilewati)"""
+    for mapped in maps:
+        if isinstance(mapped, mmap.mmap):
+            mapped.close()
+
+
+def _release_views(*values) -> None:
+    """Release memoryview di antara values agar mmap sumbernya bisa ditutup"""
+    for value in values:
+        if isinstance(value, memoryview):
+            value.release()
+
+
+def _encrypt_mapped(key: bytes, nonce: bytes, chunk_size: int, src: memoryview, dst: memoryview) -> None:
+    """Enkripsi src (plaintext) ke dst (body version 2/4) per chunk langsung di buffer"""
+    context = _keyed(key)
+    chunk_count = _stream_chunk_count(len(src), chunk_size)
+    for index in range(chunk_count):
+        start = index * chunk_size
+        end = min(start + chunk_size, len(src))
+        out_start = index * (chunk_size + TAG_SIZE)
+        out_end = out_start + (end - start)
+        
+        aead = _chunk_aead(context, nonce, index, index == chunk_count - 1)
+        with src[start:end] as chunk, dst[out_start:out_end] as out:
+            tag = aead.encrypt_into(out, chunk)
+        dst[out_end:out_end + TAG_SIZE] = tag
+
+
+def _decrypt_mapped(key: bytes, nonce: bytes, chunk_size: int, src: memoryview, dst: memoryview) -> int:
+    """Dekripsi src (body version 2/4) ke dst per chunk; return jumlah chunk"""
+    context = _keyed(key)
+    chunk_count = _stream_chunk_count(len(src), chunk_size + TAG_SIZE)
+    for index in range(chunk_count):
+        start = index * (chunk_size + TAG_SIZE)
+        end = min(start + chunk_size + TAG_SIZE, len(src)) - TAG_SIZE
+        out_start = index * chunk_size
+        
+        aead = _chunk_aead(context, nonce, index, index == chunk_count - 1)
+        with src[start:end] as chunk, src[end:end + TAG_SIZE] as tag:
+            with dst[out_start:out_start + (end - start)] as out:
+                is_verified = aead.decrypt_into(out, chunk, tag)
+        if not is_verified:
+            raise ValueError(AUTH_FAILED_MESSAGE)
+    return chunk_count
+
+
+def encrypt_path(in_path: str, out_path: str, password: str,
+                 chunk_size: int = STREAM_CHUNK_SIZE,
+                 kdf_profile: Optional[str] = None) -> int:
+    """
+    Encrypt file di disk ke package version 4 lewat mmap (tanpa membaca ke bytes)
+    
+    Sumber di-map read-only, tujuan di-pre-size lalu di-map dan diisi langsung
+    lewat memoryview per chunk.
+    
+    Args:
+        in_path: Path file sumber
+        out_path: Path package tujuan
+        password: Encryption password
+        chunk_size: Ukuran chunk plaintext (bytes)
+        kdf_profile: Nama profil di KDF_PROFILES (default: DEFAULT_KDF_PROFILE)
+        
+    Returns:
+        Ukuran package (bytes)
+    """
+    if not 0 < chunk_size <= STREAM_MAX_CHUNK_SIZE:
+        raise ValueError(f"Chunk size tidak valid: {chunk_size}")
+    
+    kdf = new_kdf(kdf_profile)
+    key = derive_key(password.strip(), kdf)
+    nonce = os.urandom(16)
+    header = _stream_header(kdf, nonce, chunk_size)
+    
+    with open(in_path, 'rb') as src_file:
+        size = os.fstat(src_file.fileno()).st_size
+        package_size = len(header) + size + _stream_chunk_count(size, chunk_size) * TAG_SIZE
+        
+        # mmap tidak bisa memetakan file kosong
+        src_map = mmap.mmap(src_file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        dst_map = None
+        created = completed = False
+        try:
+            with open(out_path, 'w+b') as dst_file:
+                created = True
+                dst_map = _map_output(dst_file, package_size)
+                with memoryview(src_map) as src, memoryview(dst_map) as dst, dst[len(header):] as body:
+                    dst[:len(header)] = header
+                    _encrypt_mapped(key, nonce, chunk_size, src, body)
+                dst_map.flush()
+            completed = True
+        finally:
+            # mmap ditutup dulu, baru package yang belum lengkap dihapus
+            _close_maps(src_map, dst_map)
+            if created and not completed:
+                os.remove(out_path)
+    
+    return package_size
+
+
+def _decrypt_mapped_package(password: str, src: memoryview, out_path: str) -> dict:
+    """Parse package (version 1/2/3/4) dari buffer src dan dekripsi ke out_path lewat mmap"""
+    is_chunked = bytes(src[0:1]) in STREAM_VERSIONS
+    package = check_package(src)
+    
+    if is_chunked:
+        nonce = package['nonce']
+        chunk_size = package['chunk_size']
+        body = src[package['header_size']:]
+        plaintext_size = package['plaintext_size']
+        result = {'chunk_size': chunk_size, 'chunk_count': package['chunk_count']}
+    else:
+        nonce = bytes(package['nonce'])
+        tag = bytes(package['tag'])
+        body = package['ciphertext']
+        plaintext_size = len(body)
+        result = {'tag_hex': tag.hex()}
+    
+    dst_map = None
+    created = completed = False
+    try:
+        key = derive_key(password, package['kdf'])
+        with open(out_path, 'w+b') as dst_file:
+            created = True
+            dst_map = _map_output(dst_file, plaintext_size) if plaintext_size else bytearray()
+            with memoryview(dst_map) as dst:
+                if is_chunked:
+                    _decrypt_mapped(key, nonce, chunk_size, body, dst)
+                elif not XoodyakAEAD(key, nonce, b'').decrypt_into(dst, body, tag):
+                    raise ValueError(AUTH_FAILED_MESSAGE)
+            if plaintext_size:
+                dst_map.flush()
+        completed = True
+    finally:
+        # Slice src di-release agar decrypt_path bisa menutup mmap sumber;
+        # mmap tujuan ditutup dulu, jangan tinggalkan plaintext yang tidak terverifikasi
+        _release_views(body, *package.values())
+        _close_maps(dst_map)
+        if created and not completed:
+            os.remove(out_path)
+    
+    result.update({
+        'file_size': plaintext_size,
+        'is_authenticated': True,
+        'algorithm': 'Xoodyak AEAD (NIST Standard)',
+        'nonce_hex': nonce.hex(),
+    })
+    return result
+
+
+def decrypt_path(in_path: str, out_path: str, password: str) -> dict:
+    """
+    Decrypt package di disk (version 1, 2, 3 atau 4) ke file lewat mmap
+    
+    File tujuan di-pre-size dan di-map; file dihapus jika autentikasi gagal.
+    
+    Args:
+        in_path: Path package sumber
+        out_path: Path file tujuan
+        password: Decryption password
+        
+    Returns:
+        info_dict: File information
+        
+    Raises:
+        ValueError: If decryption fails
+    """
+    with open(in_path, 'rb') as src_file:
+        if os.fstat(src_file.fileno()).st_size < 33:
+            raise ValueError("Data terlalu kecil atau format rusak")
+        
+        src_map = mmap.mmap(src_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            with memoryview(src_map) as src:
+                result = _decrypt_mapped_package(password.strip(), src, out_path)
+        finally:
+            _close_maps(src_map)
+    
+    return result
+
+
+class ChunkedPackageReader(io.RawIOBase):
+    """
+    Reader plaintext package chunked (version 2/4) dengan random access
+    
+    Package version 2/4 adalah container seekable: chunk berukuran tetap,
+    masing-masing dengan tag sendiri yang terikat ke index dan flag chunk
+    terakhir. Posisi chunk dihitung langsung dari offset, jadi read/seek
+    hanya membaca dan mengautentikasi chunk yang mencakup byte yang diminta.
+    Chunk terakhir diverifikasi saat dibuka sehingga pemotongan package
+    langsung terdeteksi.
+    
+    Usage:
+        with ChunkedPackageReader('data.xdk', password) as reader:
+            reader.seek(10 * 1024 * 1024)
+            preview = reader.read(4096)
+    """
+    
+    def __init__(self, source, password: str):
+        """
+        Args:
+            source: Package version 2/4 - bytes-like, path, atau file object binary yang seekable
+            password: Decryption password
+            
+        Raises:
+            ValueError: Format tidak valid atau chunk terakhir gagal autentikasi
+        """
+        super().__init__()
+        self._owns_source = isinstance(source, (str, os.PathLike))
+        if self._owns_source:
+            source = open(source, 'rb')
+        elif not hasattr(source, 'read'):
+            source = io.BytesIO(source)
+        self._src = source
+        
+        try:
+            start = source.tell()
+            version = _read_exact(source, 1)
+            if version not in STREAM_VERSIONS:
+                raise ValueError("Format file tidak valid atau versi tidak kompatibel")
+            header = version + _read_exact(source, _stream_header_size(version) - 1)
+            package_size = source.seek(0, io.SEEK_END) - start
+            layout = _stream_layout(header, package_size)
+            
+            # Tolak format rusak dulu, baru KDF
+            self._context = KeyedContext(derive_key(password.strip(), layout['kdf']))
+            self._base = start + layout['header_size']
+            self.nonce = layout['nonce']
+            self.chunk_size = layout['chunk_size']
+            self.chunk_count = layout['chunk_count']
+            self.size = layout['plaintext_size']
+            self._position = 0
+            self._cached_index = None
+            self._cached_chunk = b''
+            
+            self._load_chunk(self.chunk_count - 1)
+        except Exception:
+            self.close()
+            raise
+    
+    def _load_chunk(self, index: int) -> bytes:
+        """Baca, autentikasi dan dekripsi satu chunk (chunk terakhir yang dibaca di-cache)"""
+        if index == self._cached_index:
+            return self._cached_chunk
+        
+        record_size = self.chunk_size + TAG_SIZE
+        self._src.seek(self._base + index * record_size)
+        record = _read_exact(self._src, record_size)
+        
+        is_last = index == self.chunk_count - 1
+        plaintext, is_verified = _chunk_aead(self._context, self.nonce, index, is_last).decrypt(
+            record[:-TAG_SIZE], record[-TAG_SIZE:]
+        )
+        if not is_verified:
+            raise ValueError(AUTH_FAILED_MESSAGE)
+        
+        self._cached_index = index
+        self._cached_chunk = plaintext
+        return plaintext
+    
+    def read_range(self, start: int, length: int) -> bytes:
+        """
+        Plaintext [start, start + length) - hanya chunk yang mencakup range yang didekripsi
+        
+        Raises:
+            ValueError: Range di luar plaintext atau chunk gagal autentikasi
+        """
+        if start < 0 or length < 0:
+            raise ValueError("start dan length tidak boleh negatif")
+        end = min(start + length, self.size)
+        if start >= end:
+            return b''
+        
+        parts = []
+        for index in range(start // self.chunk_size, (end - 1) // self.chunk_size + 1):
+            chunk_start = index * self.chunk_size
+            chunk = self._load_chunk(index)
+            parts.append(chunk[max(start - chunk_start, 0):end - chunk_start])
+        return b''.join(parts)
+    
+    def readable(self) -> bool:
+        return True
+    
+    def seekable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        data = self.read_range(self._position, len(buffer))
+        buffer[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+    
+    def readall(self) -> bytes:
+        data = self.read_range(self._position, self.size - self._position)
+        self._position += len(data)
+        return data
+    
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        elif whence != io.SEEK_SET:
+            raise ValueError(f"whence tidak valid: {whence}")
+        if offset < 0:
+            raise ValueError("Posisi tidak boleh negatif")
+        self._position = offset
+        return offset
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def close(self) -> None:
+        if not self.closed and self._owns_source:
+            self._src.close()
+        super().close()
+
+
+def decrypt_range(package_data: bytes, password: str, start: int, length: int) -> bytes:
+    """
+    Dekripsi sebagian plaintext package version 2/4 (mis. preview) tanpa dekripsi seluruh file
+    
+    Args:
+        package_data: Package version 2/4 (bytes-like, path, atau file object)
+        password: Decryption password
+        start: Offset plaintext
+        length: Jumlah byte
+        
+    Returns:
+        Plaintext pada range tersebut (lebih pendek jika melewati akhir data)
+    """
+    with ChunkedPackageReader(package_data, password) as reader:
+        return reader.read_range(start, length)
+
+
+def _encrypt_chunk_job(job: tuple) -> bytearray:
+    """Worker: enkripsi satu chunk -> CIPHERTEXT_CHUNK + TAG"""
+    context, nonce, index, is_last, chunk = job
+    record = bytearray(len(chunk) + TAG_SIZE)
+    record[len(chunk):] = _chunk_aead(context, nonce, index, is_last).encrypt_into(
+        memoryview(record)[:len(chunk)], chunk
+    )
+    return record
+
+
+def _decrypt_chunk_job(job: tuple) -> Optional[bytes]:
+    """Worker: dekripsi satu CIPHERTEXT_CHUNK + TAG (None jika tag tidak valid)"""
+    context, nonce, index, is_last, record = job
+    plaintext, is_verified = _chunk_aead(context, nonce, index, is_last).decrypt(
+        record[:-TAG_SIZE], record[-TAG_SIZE:]
+    )
+    return plaintext if is_verified else None
+
+
+def _iter_jobs(worker, jobs: Iterable[tuple], max_workers: Optional[int],
+               use_processes: bool = True) -> Iterator:
+    """Jalankan job berurutan (max_workers == 1) atau di thread/process pool, hasil sesuai urutan"""
+    if max_workers == 1:
+        yield from map(worker, jobs)
+        return
+    
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with executor_class(max_workers=max_workers) as executor:
+        yield from executor.map(worker, jobs)
+
+
+def _run_chunk_jobs(worker, jobs: List[tuple], max_workers: Optional[int]) -> list:
+    """Jalankan job chunk di process pool (atau langsung jika hanya satu chunk/worker)"""
+    return list(_iter_jobs(worker, jobs, 1 if len(jobs) <= 1 else max_workers))
+
+
+def encrypt_parallel(file_data: bytes, password: str,
+                     chunk_size: int = PARALLEL_CHUNK_SIZE,
+                     max_workers: Optional[int] = None,
+                     kdf_profile: Optional[str] = None) -> bytes:
+    """
+    Encrypt data ke package version 4 dengan chunk yang dienkripsi paralel
+    
+    Setiap chunk adalah instance XoodyakAEAD sendiri (nonce turunan dari
+    nonce utama + index, flag chunk terakhir di associated data), sehingga
+    chunk bisa disebar ke ProcessPoolExecutor. Output identik formatnya
+    dengan encrypt_stream/encrypt_path.
+    
+    Args:
+        file_data: Raw file data (bytes)
+        password: Encryption password
+        chunk_size: Ukuran chunk plaintext (bytes)
+        max_workers: Jumlah proses (default: jumlah CPU)
+        kdf_profile: Nama profil di KDF_PROFILES (default: DEFAULT_KDF_PROFILE)
+        
+    Returns:
+        Encrypted package (bytes)
+    """
+    if not 0 < chunk_size <= STREAM_MAX_CHUNK_SIZE:
+        raise ValueError(f"Chunk size tidak valid: {chunk_size}")
+    
+    kdf = new_kdf(kdf_profile)
+    context = KeyedContext(derive_key(password.strip(), kdf))
+    nonce = os.urandom(16)
+    
+    chunk_count = _stream_chunk_count(len(file_data), chunk_size)
+    jobs = [
+        (context, nonce, index, index == chunk_count - 1,
+         bytes(file_data[index * chunk_size:(index + 1) * chunk_size]))
+        for index in range(chunk_count)
+    ]
+    records = _run_chunk_jobs(_encrypt_chunk_job, jobs, max_workers)
+    
+    header = _stream_header(kdf, nonce, chunk_size)
+    return b''.join([header] + records)
+
+
+def decrypt_parallel(package_data: bytes, password: str,
+                     max_workers: Optional[int] = None) -> Tuple[bytes, dict, bool]:
+    """
+    Decrypt package version 2/4 dengan chunk yang didekripsi paralel
+    
+    Chunk yang ditukar urutannya, dipotong, atau ditambah gagal autentikasi
+    karena index dan flag chunk terakhir terikat ke nonce/associated data.
+    
+    Args:
+        package_data: Encrypted package version 2/4 (bytes)
+        password: Decryption password
+        max_workers: Jumlah proses (default: jumlah CPU)
+        
+    Returns:
+        (plaintext, info_dict, is_verified)
+        
+    Raises:
+        ValueError: If decryption fails
+    """
+    if len(package_data) < STREAM_HEADER_SIZE + TAG_SIZE:
+        raise ValueError("Data terlalu kecil atau format rusak")
+    if package_data[0:1] not in STREAM_VERSIONS:
+        raise ValueError("Format file tidak valid atau versi tidak kompatibel")
+    
+    package = check_package(package_data)
+    nonce = package['nonce']
+    chunk_size = package['chunk_size']
+    chunk_count = package['chunk_count']
+    context = KeyedContext(derive_key(password.strip(), package['kdf']))
+    
+    body = memoryview(package_data)[package['header_size']:]
+    record_size = chunk_size + TAG_SIZE
+    
+    jobs = [
+        (context, nonce, index, index == chunk_count - 1,
+         bytes(body[index * record_size:(index + 1) * record_size]))
+        for index in range(chunk_count)
+    ]
+    body.release()
+    chunks = _run_chunk_jobs(_decrypt_chunk_job, jobs, max_workers)
+    
+    if any(chunk is None for chunk in chunks):
+        raise ValueError(AUTH_FAILED_MESSAGE)
+    
+    plaintext = b''.join(chunks)
+    result = {
+        'file_size': len(plaintext),
+        'is_authenticated': True,
+        'algorithm': 'Xoodyak AEAD (NIST Standard)',
+        'nonce_hex': nonce.hex(),
+        'chunk_size': chunk_size,
+        'chunk_count': chunk_count,
+    }
+    return plaintext, result, True
+
+
+def _encrypt_record_job(job: tuple) -> Tuple[Optional[bytes], Optional[str]]:
+    """Worker: enkripsi satu record -> (package, None) atau (None, error)"""
+    key, descriptor, payload = job
+    try:
+        return _seal_kdf_package(key, descriptor, payload), None
+    except Exception as e:
+        return None, f"Enkripsi gagal: {str(e)}"
+
+
+def _verify_record_job(job: tuple) -> Tuple[bool, Optional[str]]:
+    """Worker: verifikasi satu package -> (is_verified, None) atau (False, error)"""
+    context, package_data, error = job
+    if error is not None:
+        return False, error
+    
+    try:
+        return _verify_checked(context, package_data, check_package(package_data)), None
+    except Exception as e:
+        return False, str(e)
+
+
+def _decrypt_record_job(job: tuple) -> Tuple[Optional[bytes], Optional[str]]:
+    """Worker: dekripsi satu package -> (plaintext, None) atau (None, error)"""
+    key, package_data, error = job
+    if error is not None:
+        return None, error
+    
+    try:
+        if package_data[0:1] in STREAM_VERSIONS:
+            package = check_package(package_data)
+            output = io.BytesIO()
+            _decrypt_stream_body(key, package, io.BytesIO(package_data[package['header_size']:]), output)
+            return output.getvalue(), None
+        
+        package = parse_package(package_data)
+        plaintext, is_verified = XoodyakAEAD(key, package['nonce'], b'').decrypt(
+            package['ciphertext'], package['tag']
+        )
+        if not is_verified:
+            return None, AUTH_FAILED_MESSAGE
+        return plaintext, None
+    except Exception as e:
+        return None, str(e)
+
+
+def encrypt_many(payloads: Iterable[bytes], password: str,
+                 kdf_profile: Optional[str] = None,
+                 workers: int = 1,
+                 use_processes: bool = False) -> Iterator[Tuple[int, Optional[bytes], Optional[str]]]:
+    """
+    Encrypt banyak payload dengan satu password - KDF hanya dijalankan sekali
+    
+    Semua package (version 3) di batch memakai KDF descriptor/salt yang sama
+    (key di-absorb sekali lewat KeyedContext), setiap record mendapat nonce
+    acak sendiri. Setiap package tetap bisa
+    didekripsi sendiri dengan decrypt_file.
+    
+    Args:
+        payloads: Iterable data (bytes) yang akan dienkripsi
+        password: Encryption password
+        kdf_profile: Nama profil di KDF_PROFILES (default: DEFAULT_KDF_PROFILE)
+        workers: Jumlah worker (1 = berurutan di proses ini)
+        use_processes: True untuk ProcessPoolExecutor, False untuk ThreadPoolExecutor
+        
+    Yields:
+        (index, package, error) - error None jika berhasil, package None jika gagal
+    """
+    kdf = new_kdf(kdf_profile)
+    context = KeyedContext(derive_key(password.strip(), kdf))
+    descriptor = encode_kdf_descriptor(kdf)
+    
+    jobs = ((context, descriptor, payload) for payload in payloads)
+    for index, (package, error) in enumerate(_iter_jobs(_encrypt_record_job, jobs, workers, use_processes)):
+        yield index, package, error
+
+
+def _keyed_package_jobs(packages: Iterable[bytes], password: str) -> Iterator[tuple]:
+    """(context, package_data, error) per package; key di-derive sekali per KDF descriptor"""
+    contexts = {}
+    for package_data in packages:
+        try:
+            # Tolak format rusak sebelum KDF
+            package = check_package(package_data)
+            descriptor = bytes(package_data[1:1 + KDF_DESCRIPTOR_SIZE]) if package['kdf'] else b''
+            if descriptor not in contexts:
+                contexts[descriptor] = KeyedContext(derive_key(password, package['kdf']))
+            yield contexts[descriptor], package_data, None
+        except Exception as e:
+            # Item rusak/bukan bytes tidak menghentikan batch
+            yield None, None, str(e)
+
+
+def decrypt_many(packages: Iterable[bytes], password: str,
+                 workers: int = 1,
+                 use_processes: bool = False) -> Iterator[Tuple[int, Optional[bytes], Optional[str]]]:
+    """
+    Decrypt banyak package dengan satu password
+    
+    Key di-derive sekali per KDF descriptor yang berbeda (satu kali untuk
+    batch dari encrypt_many). Package yang gagal tidak menghentikan batch.
+    
+    Args:
+        packages: Iterable encrypted package (version 1, 2, 3 atau 4)
+        password: Decryption password
+        workers: Jumlah worker (1 = berurutan di proses ini)
+        use_processes: True untuk ProcessPoolExecutor, False untuk ThreadPoolExecutor
+        
+    Yields:
+        (index, plaintext, error) - error None jika berhasil, plaintext None jika gagal
+    """
+    jobs = _keyed_package_jobs(packages, password.strip())
+    for index, (plaintext, error) in enumerate(_iter_jobs(_decrypt_record_job, jobs, workers, use_processes)):
+        yield index, plaintext, error
+
+
+def verify_many(packages: Iterable[bytes], password: str,
+                workers: int = 1,
+                use_processes: bool = False) -> Iterator[Tuple[int, bool, Optional[str]]]:
+    """
+    Verifikasi banyak package dengan satu password tanpa menghasilkan plaintext
+    
+    Package dengan panjang/version yang salah ditolak sebelum KDF; key
+    di-derive sekali per KDF descriptor seperti decrypt_many.
+    
+    Args:
+        packages: Iterable encrypted package (version 1, 2, 3 atau 4)
+        password: Decryption password
+        workers: Jumlah worker (1 = berurutan di proses ini)
+        use_processes: True untuk ProcessPoolExecutor, False untuk ThreadPoolExecutor
+        
+    Yields:
+        (index, is_verified, error) - error berisi alasan jika format tidak valid
+    """
+    jobs = _keyed_package_jobs(packages, password.strip())
+    for index, (is_verified, error) in enumerate(_iter_jobs(_verify_record_job, jobs, workers, use_processes)):
+        yield index, is_verified, error
+
+
 def is_file_encrypted(data: bytes) -> bool:
     """
     Check if file is encrypted dengan validasi format
@@ -183,7 +1462,7 @@ def is_file_encrypted(data: bytes) -> bool:
         return False
     
     # Check version byte
-    if data[0:1] != b'\x01':
+    if data[0:1] not in (PACKAGE_VERSION_1, PACKAGE_VERSION_KDF) + STREAM_VERSIONS:
         return False
     
     # Check known plaintext signatures